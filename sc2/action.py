@@ -1,6 +1,5 @@
 from __future__ import annotations
 from typing import Any, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
-from itertools import groupby
 
 from s2clientprotocol import common_pb2 as common_pb
 from s2clientprotocol import raw_pb2 as raw_pb
@@ -9,9 +8,56 @@ from .position import Point2
 from .unit import Unit
 
 if TYPE_CHECKING:
+    from .game_data import GameData
     from .unit_command import UnitCommand
     from .ids.ability_id import AbilityId
 
+# Exact and generic ability id and target (unit tag or position) of the current order of a unit
+OrderKey = Tuple[int, int, Union[int, Tuple[float, float]]]
+
+
+def drop_repeated_orders(actions: List[UnitCommand], game_data: GameData) -> List[UnitCommand]:
+    """
+    Drops the actions that repeat the current order of their unit without queueing, same as
+    BotAI.prevent_double_actions. The current order of each unit is read once from its proto into a per-tag key,
+    without creating UnitOrder objects, so a unit that gets many actions in a frame is only checked once.
+    """
+    abilities = game_data.abilities
+    current_orders: Dict[int, Optional[OrderKey]] = {}
+    result: List[UnitCommand] = []
+    for action in actions:
+        target = action.target
+        if action.queue or target is None:
+            result.append(action)
+            continue
+
+        tag = action.unit.tag
+        if tag in current_orders:
+            current = current_orders[tag]
+        else:
+            current = None
+            orders = action.unit._proto.orders
+            if orders:
+                order = orders[0]
+                exact_id = order.ability_id
+                ability_data = abilities.get(exact_id, None)
+                generic_id = ability_data._proto.remaps_to_ability_id if ability_data is not None else 0
+                if order.HasField("target_world_space_pos"):
+                    order_target = (order.target_world_space_pos.x, order.target_world_space_pos.y)
+                else:
+                    order_target = order.target_unit_tag
+                current = (exact_id, generic_id or exact_id, order_target)
+            current_orders[tag] = current
+
+        if current is not None and action.ability.value in current[:2]:
+            if isinstance(target, Unit):
+                if current[2] == target.tag:
+                    continue
+            elif current[2] == (target.x, target.y):
+                continue
+        result.append(action)
+    return result
+
 
 def combine_actions(action_iter):
     """
@@ -22,75 +68,103 @@ def combine_actions(action_iter):
         UnitCommand(AbilityId.TRAINQUEEN_QUEEN, Unit(name='Lair', tag=4359979012), None, False),
         UnitCommand(AbilityId.TRAINQUEEN_QUEEN, Unit(name='Hatchery', tag=4359454723), None, False),
     ]
+
+    Commands are grouped by their combining tuple and by the number of earlier commands given to the same unit,
+    so identical commands are combined even when they are not adjacent in the list, while the commands of
+    each unit are still sent in the order they were given. A command that repeats the previous command of
+    the same unit without queueing is dropped.
     """
-    for key, items in groupby(action_iter, key=lambda a: a.combining_tuple):
-        ability: AbilityId
-        target: Union[None, Point2, Unit]
-        queue: bool
-        # See constants.py for combineable abilities
-        combineable: bool
-        ability, target, queue, combineable = key
-
-        if combineable:
-            # Combine actions with no target, e.g. lift, burrowup, burrowdown, siege, unsiege, uproot spines
-            if target is None:
+    groups: Dict[Tuple[int, tuple], List[UnitCommand]] = {}
+    command_counts: Dict[int, int] = {}
+    last_keys: Dict[int, tuple] = {}
+
+    for action in action_iter:
+        tag = action.unit.tag
+        key = action.combining_tuple
+        if not action.queue and last_keys.get(tag, None) == key:
+            continue
+        last_keys[tag] = key
+        index = command_counts.get(tag, 0)
+        command_counts[tag] = index + 1
+        group = groups.get((index, key), None)
+        if group is None:
+            groups[(index, key)] = [action]
+        else:
+            group.append(action)
+
+    # Stable sort keeps the groups of the same round in the order they first appeared
+    for (_, key), items in sorted(groups.items(), key=lambda group_item: group_item[0][0]):
+        yield from _combined_actions(key, items)
+
+
+def _combined_actions(key: tuple, items: List[UnitCommand]):
+    ability: AbilityId
+    target: Union[None, Point2, Unit]
+    queue: bool
+    # See constants.py for combineable abilities
+    combineable: bool
+    ability, target, queue, combineable = key
+
+    if combineable:
+        # Combine actions with no target, e.g. lift, burrowup, burrowdown, siege, unsiege, uproot spines
+        if target is None:
+            cmd = raw_pb.ActionRawUnitCommand(
+                ability_id=ability.value, unit_tags={u.unit.tag for u in items}, queue_command=queue
+            )
+        # Combine actions with target point, e.g. attack_move or move commands on a position
+        elif isinstance(target, Point2):
+            cmd = raw_pb.ActionRawUnitCommand(
+                ability_id=ability.value,
+                unit_tags={u.unit.tag for u in items},
+                queue_command=queue,
+                target_world_space_pos=common_pb.Point2D(x=target.x, y=target.y),
+            )
+        # Combine actions with target unit, e.g. attack commands directly on a unit
+        elif isinstance(target, Unit):
+            cmd = raw_pb.ActionRawUnitCommand(
+                ability_id=ability.value,
+                unit_tags={u.unit.tag for u in items},
+                queue_command=queue,
+                target_unit_tag=target.tag,
+            )
+        else:
+            raise RuntimeError(f"Must target a unit, point or None, found '{target !r}'")
+
+        yield raw_pb.ActionRaw(unit_command=cmd)
+
+    else:
+        """
+        Return one action for each unit; this is required for certain commands that would otherwise be grouped, and only executed once
+        Examples:
+        Select 3 hatcheries, build a queen with each hatch - the grouping function would group these unit tags and only issue one train command once to all 3 unit tags - resulting in one total train command
+        I imagine the same thing would happen to certain other abilities: Battlecruiser yamato on same target, queen transfuse on same target, ghost snipe on same target, all build commands with the same unit type and also all morphs (zergling to banelings)
+        However, other abilities can and should be grouped, see constants.py 'COMBINEABLE_ABILITIES'
+        """
+        u: UnitCommand
+        if target is None:
+            for u in items:
                 cmd = raw_pb.ActionRawUnitCommand(
-                    ability_id=ability.value, unit_tags={u.unit.tag for u in items}, queue_command=queue
+                    ability_id=ability.value, unit_tags={u.unit.tag}, queue_command=queue
                 )
-            # Combine actions with target point, e.g. attack_move or move commands on a position
-            elif isinstance(target, Point2):
+                yield raw_pb.ActionRaw(unit_command=cmd)
+        elif isinstance(target, Point2):
+            for u in items:
                 cmd = raw_pb.ActionRawUnitCommand(
                     ability_id=ability.value,
-                    unit_tags={u.unit.tag for u in items},
+                    unit_tags={u.unit.tag},
                     queue_command=queue,
                     target_world_space_pos=common_pb.Point2D(x=target.x, y=target.y),
                 )
-            # Combine actions with target unit, e.g. attack commands directly on a unit
-            elif isinstance(target, Unit):
+                yield raw_pb.ActionRaw(unit_command=cmd)
+
+        elif isinstance(target, Unit):
+            for u in items:
                 cmd = raw_pb.ActionRawUnitCommand(
                     ability_id=ability.value,
-                    unit_tags={u.unit.tag for u in items},
+                    unit_tags={u.unit.tag},
                     queue_command=queue,
                     target_unit_tag=target.tag,
                 )
-            else:
-                raise RuntimeError(f"Must target a unit, point or None, found '{target !r}'")
-
-            yield raw_pb.ActionRaw(unit_command=cmd)
-
+                yield raw_pb.ActionRaw(unit_command=cmd)
         else:
-            """
-            Return one action for each unit; this is required for certain commands that would otherwise be grouped, and only executed once
-            Examples:
-            Select 3 hatcheries, build a queen with each hatch - the grouping function would group these unit tags and only issue one train command once to all 3 unit tags - resulting in one total train command
-            I imagine the same thing would happen to certain other abilities: Battlecruiser yamato on same target, queen transfuse on same target, ghost snipe on same target, all build commands with the same unit type and also all morphs (zergling to banelings)
-            However, other abilities can and should be grouped, see constants.py 'COMBINEABLE_ABILITIES'
-            """
-            u: UnitCommand
-            if target is None:
-                for u in items:
-                    cmd = raw_pb.ActionRawUnitCommand(
-                        ability_id=ability.value, unit_tags={u.unit.tag}, queue_command=queue
-                    )
-                    yield raw_pb.ActionRaw(unit_command=cmd)
-            elif isinstance(target, Point2):
-                for u in items:
-                    cmd = raw_pb.ActionRawUnitCommand(
-                        ability_id=ability.value,
-                        unit_tags={u.unit.tag},
-                        queue_command=queue,
-                        target_world_space_pos=common_pb.Point2D(x=target.x, y=target.y),
-                    )
-                    yield raw_pb.ActionRaw(unit_command=cmd)
-
-            elif isinstance(target, Unit):
-                for u in items:
-                    cmd = raw_pb.ActionRawUnitCommand(
-                        ability_id=ability.value,
-                        unit_tags={u.unit.tag},
-                        queue_command=queue,
-                        target_unit_tag=target.tag,
-                    )
-                    yield raw_pb.ActionRaw(unit_command=cmd)
-            else:
-                raise RuntimeError(f"Must target a unit, point or None, found '{target !r}'")
+            raise RuntimeError(f"Must target a unit, point or None, found '{target !r}'")
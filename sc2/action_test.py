@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+
+from s2clientprotocol import common_pb2, data_pb2, raw_pb2, sc2api_pb2
+
+from .action import combine_actions, drop_repeated_orders
+from .bot_ai import BotAI
+from .client import MAX_ACTIONS_PER_REQUEST, Client
+from .game_data import GameData
+from .ids.ability_id import AbilityId
+from .position import Point2
+from .unit import Unit
+from .unit_command import UnitCommand
+
+# Exact abilities of unit orders and the generic abilities that they remap to
+ABILITIES = {
+    AbilityId.ATTACK_ATTACK: AbilityId.ATTACK,
+    AbilityId.MOVE_MOVE: AbilityId.MOVE,
+    AbilityId.COMMANDCENTERTRAIN_SCV: None,
+}
+
+
+def create_bot() -> BotAI:
+    data = sc2api_pb2.ResponseData(
+        abilities=[
+            data_pb2.AbilityData(
+                ability_id=ability.value, remaps_to_ability_id=remap.value if remap else 0, available=True
+            )
+            for ability, remap in ABILITIES.items()
+        ]
+    )
+    bot = BotAI()
+    bot._game_data = GameData(data)
+    bot.state = SimpleNamespace(game_loop=1)
+    return bot
+
+
+def create_unit(bot: BotAI, tag: int, orders=()) -> Unit:
+    return Unit(raw_pb2.Unit(tag=tag, alliance=1, orders=list(orders)), bot)
+
+
+def order(ability: AbilityId, target) -> raw_pb2.UnitOrder:
+    if isinstance(target, int):
+        return raw_pb2.UnitOrder(ability_id=ability.value, target_unit_tag=target)
+    position = common_pb2.Point(x=target[0], y=target[1])
+    return raw_pb2.UnitOrder(ability_id=ability.value, target_world_space_pos=position)
+
+
+def command_tags(raw_actions):
+    return [(action.unit_command.ability_id, sorted(action.unit_command.unit_tags)) for action in raw_actions]
+
+
+class TestCombineActions:
+    def test_identical_commands_are_combined_when_not_adjacent(self):
+        bot = create_bot()
+        units = [create_unit(bot, tag) for tag in range(1, 5)]
+        target = Point2((10, 10))
+        actions = [
+            UnitCommand(AbilityId.ATTACK, units[0], target),
+            UnitCommand(AbilityId.MOVE, units[1], target),
+            UnitCommand(AbilityId.ATTACK, units[2], target),
+            UnitCommand(AbilityId.MOVE, units[3], target),
+        ]
+
+        assert command_tags(combine_actions(actions)) == [
+            (AbilityId.ATTACK.value, [1, 3]),
+            (AbilityId.MOVE.value, [2, 4]),
+        ]
+
+    def test_commands_of_a_unit_keep_their_order(self):
+        bot = create_bot()
+        first, second = create_unit(bot, 1), create_unit(bot, 2)
+        target = Point2((10, 10))
+        actions = [
+            UnitCommand(AbilityId.MOVE, first, target),
+            UnitCommand(AbilityId.ATTACK, first, target, queue=True),
+            UnitCommand(AbilityId.ATTACK, second, target, queue=True),
+            # Repeats the previous command of the unit without queueing
+            UnitCommand(AbilityId.MOVE, second, target),
+            UnitCommand(AbilityId.MOVE, second, target),
+        ]
+
+        assert command_tags(combine_actions(actions)) == [
+            (AbilityId.MOVE.value, [1]),
+            (AbilityId.ATTACK.value, [2]),
+            (AbilityId.ATTACK.value, [1]),
+            (AbilityId.MOVE.value, [2]),
+        ]
+
+    def test_requests_are_split_at_max_actions(self):
+        bot = create_bot()
+        # Training commands are not combined, so every unit gets its own action
+        actions = [
+            UnitCommand(AbilityId.COMMANDCENTERTRAIN_SCV, create_unit(bot, tag))
+            for tag in range(1, MAX_ACTIONS_PER_REQUEST + 2)
+        ]
+
+        requests = list(Client._action_requests(actions))
+
+        assert [len(request.actions) for request in requests] == [MAX_ACTIONS_PER_REQUEST, 1]
+        assert requests[1].actions[0].action_raw.unit_command.unit_tags == [MAX_ACTIONS_PER_REQUEST + 1]
+
+
+class TestDropRepeatedOrders:
+    def test_same_result_as_prevent_double_actions(self):
+        bot = create_bot()
+        moving = create_unit(bot, 1, [order(AbilityId.MOVE_MOVE, (10, 10))])
+        attacking = create_unit(bot, 2, [order(AbilityId.ATTACK_ATTACK, 1)])
+        idle = create_unit(bot, 3)
+        position = Point2((10, 10))
+        actions = [
+            UnitCommand(AbilityId.MOVE, moving, position),
+            UnitCommand(AbilityId.MOVE_MOVE, moving, position),
+            UnitCommand(AbilityId.MOVE, moving, Point2((10, 11))),
+            UnitCommand(AbilityId.MOVE, moving, position, queue=True),
+            UnitCommand(AbilityId.ATTACK, moving, position),
+            UnitCommand(AbilityId.ATTACK, attacking, moving),
+            UnitCommand(AbilityId.ATTACK, attacking, idle),
+            UnitCommand(AbilityId.ATTACK, attacking, position),
+            UnitCommand(AbilityId.MOVE, idle, position),
+            UnitCommand(AbilityId.COMMANDCENTERTRAIN_SCV, moving),
+        ]
+
+        result = drop_repeated_orders(actions, bot._game_data)
+
+        assert result == list(filter(bot.prevent_double_actions, actions))
+        assert [actions.index(action) for action in result] == [2, 3, 4, 6, 7, 8, 9]
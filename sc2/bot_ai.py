@@ -1,5 +1,4 @@
 from __future__ import annotations
-import itertools
 import logging
 import math
 import random
@@ -8,8 +7,12 @@ import warnings
 from collections import Counter
 from typing import Any, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
 from contextlib import suppress
+
+import numpy as np
 from s2clientprotocol import sc2api_pb2 as sc_pb
 
+from .action import drop_repeated_orders
+from .building_placement import BuildingPlacement
 from .cache import property_cache_forever, property_cache_once_per_frame, property_cache_once_per_frame_no_copy
 from .constants import (
     FakeEffectID,
@@ -23,9 +26,12 @@ from .constants import (
     EQUIVALENTS_FOR_TECH_PROGRESS,
     TERRAN_STRUCTURES_REQUIRE_SCV,
     IS_PLACEHOLDER,
+    IS_STRUCTURE,
+    STRUCTURES_NOT_BLOCKING_PATHING,
 )
 from .data import ActionResult, Alert, Race, Result, Target, race_gas, race_townhalls, race_worker
 from .distances import DistanceCalculation
+from .expansion_locations import find_expansion_position, group_resources
 from .game_data import AbilityData, GameData
 
 from .dicts.unit_trained_from import UNIT_TRAINED_FROM
@@ -38,9 +44,12 @@ from .game_state import Blip, EffectData, GameState
 from .ids.ability_id import AbilityId
 from .ids.unit_typeid import UnitTypeId
 from .ids.upgrade_id import UpgradeId
+from .map_analysis_cache import MapAnalysisCache
+from .order_index import OrderIndex, creation_ability_id
 from .pixel_map import PixelMap
 from .position import Point2
 from .unit import Unit
+from .unit_columns import UnitColumns
 from .units import Units
 from .game_data import Cost
 from .unit_command import UnitCommand
@@ -69,9 +78,21 @@ class BotAI(DistanceCalculation):
         # Select distance calculation method, see distances.py: _distances_override_functions function
         if not hasattr(self, "distance_calculation_method"):
             self.distance_calculation_method: int = 2
+        # Select how the pathing grid is kept up to date, see _pathing_grid_needs_request function
+        if not hasattr(self, "pathing_grid_update_method"):
+            self.pathing_grid_update_method: int = 0
         # Select if the Unit.command should return UnitCommand objects. Set this to True if your bot uses 'self.do(unit(ability, target))'
         if not hasattr(self, "unit_command_uses_self_do"):
             self.unit_command_uses_self_do: bool = False
+        # Set this to True to send actions and debug draws without waiting for their responses and to request the
+        # observation together with the step, which saves round trips to the game in non-realtime games
+        if not hasattr(self, "pipelined_steps"):
+            self.pipelined_steps: bool = False
+        # Set this to a folder to store the static map analysis (expansions, ramps) on disk and load it in later games
+        # on the same map, see map_analysis_cache.py
+        if not hasattr(self, "map_analysis_cache_folder"):
+            self.map_analysis_cache_folder: Optional[str] = None
+        self.map_analysis_cache: Optional[MapAnalysisCache] = None
         # This value will be set to True by main.py in self._prepare_start if game is played in realtime (if true, the bot will have limited time per step)
         self.realtime: bool = False
         self.all_units: Units = Units([], self)
@@ -92,6 +113,9 @@ class BotAI(DistanceCalculation):
         self.vespene_geyser: Units = Units([], self)
         self.placeholders: Units = Units([], self)
         self.larva: Units = Units([], self)
+        # Struct-of-arrays copy of the data of all_units, see unit_columns.py
+        self.unit_columns: UnitColumns = UnitColumns(0, [], [])
+        self._structure_types: Dict[int, bool] = {}
         self.techlab_tags: Set[int] = set()
         self.reactor_tags: Set[int] = set()
         self.minerals: int = 50
@@ -115,6 +139,11 @@ class BotAI(DistanceCalculation):
         self._enemy_units_previous_map: Dict[int, Unit] = dict()
         self._enemy_structures_previous_map: Dict[int, Unit] = dict()
         self._previous_upgrades: Set[UpgradeId] = set()
+        # Pathing grid blockers seen in the previous observation, used when pathing_grid_update_method is 1 or 2
+        self._pathing_grid_structures: Dict[int, Tuple[int, float, float]] = {}
+        self._pathing_grid_neutral_tags: Set[int] = set()
+        self._pathing_grid_patches: List[Tuple[bool, int, float, float]] = []
+        self._footprint_radius_by_type: Dict[int, float] = {}
         self._expansion_positions_list: List[Point2] = []
         self._resource_location_to_expansion_position_dict: Dict[Point2, Point2] = {}
         self._time_before_step: float = None
@@ -124,6 +153,7 @@ class BotAI(DistanceCalculation):
         self._last_step_step_time: float = 0
         self._total_time_in_on_step: float = 0
         self._total_steps_iterations: int = 0
+        self._building_placement: BuildingPlacement = BuildingPlacement(self)
         # Internally used to keep track which units received an action in this frame, so that self.train() function does not give the same larva two orders - cleared every frame
         self.unit_tags_received_action: Set[int] = set()
 
@@ -304,66 +334,27 @@ class BotAI(DistanceCalculation):
 
     def _find_expansion_locations(self):
         """ Ran once at the start of the game to calculate expansion locations. """
+        if self.map_analysis_cache is not None and self._load_expansion_locations():
+            return
         # Idea: create a group for every resource, then merge these groups if
         # any resource in a group is closer than a threshold to any resource of another group
 
         # Distance we group resources by
         resource_spread_threshold: float = 8.5
-        geysers: Units = self.vespene_geyser
-        # Create a group for every resource
-        resource_groups: List[List[Unit]] = [
-            [resource]
-            for resource in self.resources
-            if resource.name != "MineralField450"  # dont use low mineral count patches
-        ]
-        # Loop the merging process as long as we change something
-        merged_group = True
-        while merged_group:
-            merged_group = False
-            # Check every combination of two groups
-            for group_a, group_b in itertools.combinations(resource_groups, 2):
-                # Check if any pair of resource of these groups is closer than threshold together
-                if any(
-                    resource_a.distance_to(resource_b) <= resource_spread_threshold
-                    for resource_a, resource_b in itertools.product(group_a, group_b)
-                ):
-                    # Remove the single groups and add the merged group
-                    resource_groups.remove(group_a)
-                    resource_groups.remove(group_b)
-                    resource_groups.append(group_a + group_b)
-                    merged_group = True
-                    break
-        # Distance offsets we apply to center of each resource group to find expansion position
-        offset_range = 7
-        offsets = [
-            (x, y)
-            for x, y in itertools.product(range(-offset_range, offset_range + 1), repeat=2)
-            if math.hypot(x, y) <= 8
-        ]
+        geyser_tags: Set[int] = {geyser.tag for geyser in self.vespene_geyser}
+        # dont use low mineral count patches
+        all_resources: List[Unit] = [resource for resource in self.resources if resource.name != "MineralField450"]
+        positions = np.array([resource.position for resource in all_resources], dtype=np.float64).reshape(-1, 2)
+        resource_groups: List[List[int]] = group_resources(positions, resource_spread_threshold)
+        placement_grid = self._game_info.placement_grid.data_numpy
         # Dict we want to return
         centers = {}
         # For every resource group:
-        for resources in resource_groups:
-            # Possible expansion points
-            amount = len(resources)
-            # Calculate center, round and add 0.5 because expansion location will have (x.5, y.5)
-            # coordinates because bases have size 5.
-            center_x = int(sum(resource.position.x for resource in resources) / amount) + 0.5
-            center_y = int(sum(resource.position.y for resource in resources) / amount) + 0.5
-            possible_points = (Point2((offset[0] + center_x, offset[1] + center_y)) for offset in offsets)
-            # Filter out points that are too near
-            possible_points = (
-                point
-                for point in possible_points
-                # Check if point can be built on
-                if self._game_info.placement_grid[point.rounded] == 1
-                # Check if all resources have enough space to point
-                and all(point.distance_to(resource) > (7 if resource in geysers else 6) for resource in resources)
-            )
+        for group in resource_groups:
+            resources = [all_resources[index] for index in group]
+            is_geyser = np.array([resource.tag in geyser_tags for resource in resources], dtype=bool)
             # Choose best fitting point
-            result: Point2 = min(
-                possible_points, key=lambda point: sum(point.distance_to(resource) for resource in resources)
-            )
+            result: Point2 = find_expansion_position(positions[group], is_geyser, placement_grid)
             centers[result] = resources
             # Put all expansion locations in a list
             self._expansion_positions_list.append(result)
@@ -371,6 +362,34 @@ class BotAI(DistanceCalculation):
             for resource in resources:
                 self._resource_location_to_expansion_position_dict[resource.position] = result
 
+        if self.map_analysis_cache is not None:
+            expansion_positions = self._expansion_positions_list
+            resource_positions = list(self._resource_location_to_expansion_position_dict.keys())
+            self.map_analysis_cache.put(
+                "expansions",
+                positions=np.array(expansion_positions, dtype=np.float64).reshape(-1, 2),
+                resources=np.array(resource_positions, dtype=np.float64).reshape(-1, 2),
+                resource_expansions=np.array(
+                    [
+                        expansion_positions.index(self._resource_location_to_expansion_position_dict[position])
+                        for position in resource_positions
+                    ],
+                    dtype=np.int32,
+                ),
+            )
+
+    def _load_expansion_locations(self) -> bool:
+        """ Loads expansion locations from the map analysis cache, returns False if they are not cached. """
+        cached = self.map_analysis_cache.get("expansions")
+        if cached is None:
+            return False
+        self._expansion_positions_list = [Point2(position) for position in cached["positions"].tolist()]
+        for position, index in zip(cached["resources"].tolist(), cached["resource_expansions"].tolist()):
+            self._resource_location_to_expansion_position_dict[Point2(position)] = self._expansion_positions_list[
+                index
+            ]
+        return True
+
     @property
     def units_created(self) -> Counter:
         """ Returns a Counter for all your units and buildings you have created so far.
@@ -900,44 +919,63 @@ class BotAI(DistanceCalculation):
         else:  # AbilityId
             building = self._game_data.abilities[building.value]
 
-        if await self.can_place(building, near) and (
-            not addon_place or await self.can_place(UnitTypeId.SUPPLYDEPOT, near.offset((2.5, -0.5)))
-        ):
-            return near
-
         if max_distance == 0:
-            return None
-
-        for distance in range(placement_step, max_distance, placement_step):
-            possible_positions = [
-                Point2(p).offset(near).to2
-                for p in (
-                    [(dx, -distance) for dx in range(-distance, distance + 1, placement_step)]
-                    + [(dx, distance) for dx in range(-distance, distance + 1, placement_step)]
-                    + [(-distance, dy) for dy in range(-distance, distance + 1, placement_step)]
-                    + [(distance, dy) for dy in range(-distance, distance + 1, placement_step)]
-                )
+            rings = [[near]]
+        else:
+            rings = [[near]] + [
+                [
+                    Point2(p).offset(near).to2
+                    for p in (
+                        [(dx, -distance) for dx in range(-distance, distance + 1, placement_step)]
+                        + [(dx, distance) for dx in range(-distance, distance + 1, placement_step)]
+                        + [(-distance, dy) for dy in range(-distance, distance + 1, placement_step)]
+                        + [(distance, dy) for dy in range(-distance, distance + 1, placement_step)]
+                    )
+                ]
+                for distance in range(placement_step, max_distance, placement_step)
             ]
-            res = await self._client.query_building_placement(building, possible_positions)
-            possible = [p for r, p in zip(res, possible_positions) if r == ActionResult.Success]
 
-            if addon_place:
-                res = await self._client.query_building_placement(
+        # Check all candidates locally in one go, the server only confirms the candidates of the closest ring that has any
+        all_positions = [p for ring in rings for p in ring]
+        fits = self._building_placement.can_place(building, all_positions)
+        if fits is not None and addon_place:
+            addon_fits = self._building_placement.can_place(
+                self._game_data.units[UnitTypeId.SUPPLYDEPOT.value].creation_ability,
+                [p.offset((2.5, -0.5)) for p in all_positions],
+            )
+            fits &= addon_fits
+
+        start = 0
+        for index, ring in enumerate(rings):
+            if fits is None:
+                possible = ring
+            else:
+                possible = [p for p, fit in zip(ring, fits[start : start + len(ring)]) if fit]
+                start += len(ring)
+            if not possible:
+                continue
+
+            res = await self._client._query_building_placement_fast(building, possible)
+            possible = [p for r, p in zip(res, possible) if r]
+
+            if addon_place and possible:
+                res = await self._client._query_building_placement_fast(
                     self._game_data.units[UnitTypeId.SUPPLYDEPOT.value].creation_ability,
                     [p.offset((2.5, -0.5)) for p in possible],
                 )
-                possible = [p for r, p in zip(res, possible) if r == ActionResult.Success]
+                possible = [p for r, p in zip(res, possible) if r]
 
             if not possible:
                 continue
 
+            if index == 0:
+                return near
             if random_alternative:
                 return random.choice(possible)
             else:
                 return min(possible, key=lambda p: p.distance_to_point2(near))
         return None
 
-    # TODO: improve using cache per frame
     def already_pending_upgrade(self, upgrade_type: UpgradeId) -> float:
         """ Check if an upgrade is being researched
 
@@ -956,33 +994,15 @@ class BotAI(DistanceCalculation):
         assert isinstance(upgrade_type, UpgradeId), f"{upgrade_type} is no UpgradeId"
         if upgrade_type in self.state.upgrades:
             return 1
-        creationAbilityID = self._game_data.upgrades[upgrade_type.value].research_ability.exact_id
-        for structure in self.structures.filter(lambda unit: unit.is_ready):
-            for order in structure.orders:
-                if order.ability.exact_id == creationAbilityID:
-                    return order.progress
-        return 0
+        research_ability_id = self._game_data.upgrades[upgrade_type.value].research_ability._proto.ability_id
+        return self.order_index.research_progress(research_ability_id)
 
     @property_cache_once_per_frame_no_copy
-    def _abilities_all_units(self) -> Tuple[Counter, Dict[UnitTypeId, float]]:
-        """ Cache for the already_pending function, includes protoss units warping in,
-        all units in production and all structures, and all morphs """
-        abilities_amount = Counter()
-        max_build_progress: Dict[UnitTypeId, float] = {}
-        for unit in self.units + self.structures:  # type: Unit
-            for order in unit.orders:
-                abilities_amount[order.ability] += 1
-            if not unit.is_ready:
-                if self.race != Race.Terran or not unit.is_structure:
-                    # If an SCV is constructing a building, already_pending would count this structure twice
-                    # (once from the SCV order, and once from "not structure.is_ready")
-                    creation_ability: AbilityData = self._game_data.units[unit.type_id.value].creation_ability
-                    abilities_amount[creation_ability] += 1
-                    max_build_progress[creation_ability] = max(
-                        max_build_progress.get(creation_ability, 0), unit.build_progress
-                    )
-
-        return abilities_amount, max_build_progress
+    def order_index(self) -> OrderIndex:
+        """ Orders of own units and structures of this frame indexed by ability.
+        Used by already_pending, already_pending_upgrade, structure_type_build_progress and worker_en_route_to_build,
+        it is built on first use in each frame. """
+        return OrderIndex(self._game_data, self.race, self.units, self.structures, self.workers)
 
     def structure_type_build_progress(self, structure_type: Union[UnitTypeId, int]) -> float:
         """
@@ -1020,14 +1040,13 @@ class BotAI(DistanceCalculation):
         else:
             structure_type_value = structure_type.value
         assert structure_type_value, f"structure_type can not be 0 or NOTAUNIT, but was: {structure_type_value}"
-        equiv_values: Set[int] = {structure_type_value} | {
-            s_type.value for s_type in EQUIVALENTS_FOR_TECH_PROGRESS.get(structure_type, set())
-        }
-        creation_ability: AbilityData = self._game_data.units[structure_type_value].creation_ability
+        index = self.order_index
         max_value = max(
-            [s.build_progress for s in self.structures if s._proto.unit_type in equiv_values]
-            + [self._abilities_all_units[1].get(creation_ability, 0)]
+            index.structure_progress(structure_type_value),
+            index.build_progress(creation_ability_id(self._game_data, structure_type_value)),
         )
+        for s_type in EQUIVALENTS_FOR_TECH_PROGRESS.get(structure_type, ()):
+            max_value = max(max_value, index.structure_progress(s_type.value))
         return max_value
 
     def tech_requirement_progress(self, structure_type: UnitTypeId) -> float:
@@ -1085,32 +1104,7 @@ class BotAI(DistanceCalculation):
         """
         if isinstance(unit_type, UpgradeId):
             return self.already_pending_upgrade(unit_type)
-        ability = self._game_data.units[unit_type.value].creation_ability
-        return self._abilities_all_units[0][ability]
-
-    @property_cache_once_per_frame_no_copy
-    def _worker_orders(self) -> Counter:
-        """ This function is used internally, do not use! It is to store all worker abilities. """
-        abilities_amount = Counter()
-        structures_in_production: Set[Union[Point2, int]] = set()
-        for structure in self.structures:
-            if structure.type_id in TERRAN_STRUCTURES_REQUIRE_SCV:
-                structures_in_production.add(structure.position)
-                structures_in_production.add(structure.tag)
-        for worker in self.workers:
-            for order in worker.orders:
-                # Skip if the SCV is constructing (not isinstance(order.target, int))
-                # or resuming construction (isinstance(order.target, int))
-                is_int = isinstance(order.target, int)
-                if (
-                    is_int
-                    and order.target in structures_in_production
-                    or not is_int
-                    and Point2.from_proto(order.target) in structures_in_production
-                ):
-                    continue
-                abilities_amount[order.ability] += 1
-        return abilities_amount
+        return self.order_index.ability_count(creation_ability_id(self._game_data, unit_type.value))
 
     def worker_en_route_to_build(self, unit_type: UnitTypeId) -> float:
         """ This function counts how many workers are on the way to start the construction a building.
@@ -1118,8 +1112,7 @@ class BotAI(DistanceCalculation):
         New function. Please report any bugs!
 
         :param unit_type: """
-        ability = self._game_data.units[unit_type.value].creation_ability
-        return self._worker_orders[ability]
+        return self.order_index.worker_count(creation_ability_id(self._game_data, unit_type.value))
 
     @property_cache_once_per_frame
     def structures_without_construction_SCVs(self) -> Units:
@@ -1505,7 +1498,10 @@ class BotAI(DistanceCalculation):
         if not actions:
             return None
         if prevent_double:
-            actions = list(filter(self.prevent_double_actions, actions))
+            actions = drop_repeated_orders(actions, self._game_data)
+        if self._client.pipelined:
+            await self._client.actions_deferred(actions)
+            return None
         result = await self._client.actions(actions)
         return result
 
@@ -1638,22 +1634,116 @@ class BotAI(DistanceCalculation):
         """First step extra preparations. Must not be called before _prepare_step."""
         if self.townhalls:
             self._game_info.player_start_location = self.townhalls.first.position
+            if self.map_analysis_cache_folder is not None:
+                self.map_analysis_cache = MapAnalysisCache(
+                    self.map_analysis_cache_folder, self._game_info, self._game_info.player_start_location
+                )
             # Calculate and cache expansion locations forever inside 'self._cache_expansion_locations', this is done to prevent a bug when this is run and cached later in the game
             _ = self._find_expansion_locations()
-        self._game_info.map_ramps, self._game_info.vision_blockers = self._game_info._find_ramps_and_vision_blockers()
+        self._game_info.map_ramps, self._game_info.vision_blockers = self._game_info._find_ramps_and_vision_blockers(
+            self.map_analysis_cache
+        )
+        if self.map_analysis_cache is not None:
+            self.map_analysis_cache.save()
         self._time_before_step: float = time.perf_counter()
 
+    def _pathing_grid_needs_request(self, state: GameState) -> bool:
+        """ Called from main.py before _prepare_step to decide if game info has to be requested to refresh the pathing grid.
+        method 0: Request game info every step
+        method 1: Request game info only when a structure, rock or mineral field appeared, died or changed its type
+        method 2: Same as method 1, but changes in structures are patched into the existing pathing grid from their footprints,
+        game info is only requested when rocks or mineral fields change
+
+        :param state: """
+        if self.pathing_grid_update_method == 0:
+            return True
+        structures: Dict[int, Tuple[int, float, float]] = {}
+        neutral_tags: Set[int] = set()
+        for unit in state.observation_raw.units:
+            if unit.is_blip or unit.display_type == IS_PLACEHOLDER or unit.unit_type in FakeEffectID:
+                continue
+            # Alliance.Neutral.value = 3
+            if unit.alliance == 3:
+                neutral_tags.add(unit.tag)
+            elif not unit.is_flying and self._blocks_pathing(unit.unit_type):
+                structures[unit.tag] = (unit.unit_type, unit.pos.x, unit.pos.y)
+
+        previous_structures = self._pathing_grid_structures
+        neutral_changed = neutral_tags != self._pathing_grid_neutral_tags
+        self._pathing_grid_structures = structures
+        self._pathing_grid_neutral_tags = neutral_tags
+        self._pathing_grid_patches.clear()
+        if neutral_changed:
+            return True
+
+        # Removed blockers first, so a structure replacing another one in the same spot stays blocked
+        for tag, blocker in previous_structures.items():
+            if structures.get(tag) != blocker:
+                self._pathing_grid_patches.append((False, *blocker))
+        for tag, blocker in structures.items():
+            if previous_structures.get(tag) != blocker:
+                self._pathing_grid_patches.append((True, *blocker))
+        if self.pathing_grid_update_method == 1:
+            return bool(self._pathing_grid_patches)
+        return False
+
+    def _blocks_pathing(self, unit_type: int) -> bool:
+        """ Returns True if a landed structure of this type shows up as blocked cells in the pathing grid.
+
+        :param unit_type: """
+        if unit_type not in self._footprint_radius_by_type:
+            self._footprint_radius_by_type[unit_type] = self._calculate_footprint_radius(unit_type)
+        return self._footprint_radius_by_type[unit_type] > 0
+
+    def _calculate_footprint_radius(self, unit_type: int, blocks_pathing_only: bool = True) -> float:
+        """ Footprint radius of a structure type, 0 for everything else.
+        Morphed structures (e.g. orbital command, lair) use the footprint of the structure they were morphed from.
+
+        :param unit_type:
+        :param blocks_pathing_only: Return 0 for structures that do not block pathing, such as lowered supply depots """
+        unit_data = self._game_data.units.get(unit_type, None)
+        if (
+            unit_data is None
+            or (blocks_pathing_only and unit_type in STRUCTURES_NOT_BLOCKING_PATHING)
+            or IS_STRUCTURE not in unit_data.attributes
+        ):
+            return 0
+        aliases: List[UnitTypeId] = (unit_data.tech_alias or []) + [unit_data.unit_alias]
+        for type_data in [unit_data] + [self._game_data.units[alias.value] for alias in aliases if alias is not None]:
+            if type_data.creation_ability is not None and type_data.footprint_radius:
+                return type_data.footprint_radius
+        return 0
+
+    def _patch_pathing_grid(self):
+        """ Applies the structure changes found in _pathing_grid_needs_request to the existing pathing grid.
+        Cells of a removed structure are restored from the placement grid, as structures can only be placed on placeable cells. """
+        pathing_grid: np.ndarray = self._game_info.pathing_grid.writable()
+        placement_grid: np.ndarray = self._game_info.placement_grid.data_numpy
+        for added, unit_type, x, y in self._pathing_grid_patches:
+            radius = self._footprint_radius_by_type[unit_type]
+            x0, x1 = max(0, round(x - radius)), round(x + radius)
+            y0, y1 = max(0, round(y - radius)), round(y + radius)
+            if added:
+                pathing_grid[y0:y1, x0:x1] = 0
+            else:
+                pathing_grid[y0:y1, x0:x1] = placement_grid[y0:y1, x0:x1]
+        self._pathing_grid_patches.clear()
+
     def _prepare_step(self, state, proto_game_info):
         """
         :param state:
-        :param proto_game_info:
+        :param proto_game_info: None if game info was not requested this step, see _pathing_grid_needs_request
         """
         # Set attributes from new state before on_step."""
         self.state: GameState = state  # See game_state.py
         # update pathing grid
-        self._game_info.pathing_grid: PixelMap = PixelMap(
-            proto_game_info.game_info.start_raw.pathing_grid, in_bits=True, mirrored=False
-        )
+        if proto_game_info is not None:
+            self._game_info.pathing_grid: PixelMap = PixelMap(
+                proto_game_info.game_info.start_raw.pathing_grid, in_bits=True, mirrored=False
+            )
+            self._pathing_grid_patches.clear()
+        elif self._pathing_grid_patches:
+            self._patch_pathing_grid()
         # Required for events, needs to be before self.units are initialized so the old units are stored
         self._units_previous_map: Dict[int:Unit] = {unit.tag: unit for unit in self.units}
         self._structures_previous_map: Dict[int:Unit] = {structure.tag: structure for structure in self.structures}
@@ -1706,6 +1796,8 @@ class BotAI(DistanceCalculation):
 
         worker_types: Set[UnitTypeId] = {UnitTypeId.DRONE, UnitTypeId.DRONEBURROWED, UnitTypeId.SCV, UnitTypeId.PROBE}
 
+        column_tags: List[int] = []
+        column_rows: List[Tuple[float, ...]] = []
         index: int = 0
         for unit in self.state.observation_raw.units:
             if unit.is_blip:
@@ -1716,8 +1808,13 @@ class BotAI(DistanceCalculation):
                 if unit_type in FakeEffectID:
                     self.state.effects.add(EffectData(unit, fake=True))
                     continue
+                is_structure = self._structure_types.get(unit_type, None)
+                if is_structure is None:
+                    is_structure = self._is_structure_type(unit_type)
                 unit_obj = Unit(unit, self, distance_calculation_index=index)
                 index += 1
+                column_tags.append(unit.tag)
+                column_rows.append(UnitColumns.row(unit, is_structure))
                 self.all_units.append(unit_obj)
                 if unit.display_type == IS_PLACEHOLDER:
                     self.placeholders.append(unit_obj)
@@ -1743,7 +1840,7 @@ class BotAI(DistanceCalculation):
                 elif alliance == 1:
                     self.all_own_units.append(unit_obj)
                     unit_id = unit_obj.type_id
-                    if unit_obj.is_structure:
+                    if is_structure:
                         self.structures.append(unit_obj)
                         if unit_id in race_townhalls[self.race]:
                             self.townhalls.append(unit_obj)
@@ -1773,17 +1870,28 @@ class BotAI(DistanceCalculation):
                 # Alliance.Enemy.value = 4
                 elif alliance == 4:
                     self.all_enemy_units.append(unit_obj)
-                    if unit_obj.is_structure:
+                    if is_structure:
                         self.enemy_structures.append(unit_obj)
                     else:
                         self.enemy_units.append(unit_obj)
 
+        self.unit_columns = UnitColumns(self.state.game_loop, column_tags, column_rows)
+
         # Force distance calculation and caching on all units using scipy pdist or cdist
         if self.distance_calculation_method == 1:
             _ = self._pdist
         elif self.distance_calculation_method in {2, 3}:
             _ = self._cdist
 
+    def _is_structure_type(self, unit_type: int) -> bool:
+        """ Looks up and caches if a raw unit type is a structure.
+
+        :param unit_type: """
+        unit_data = self._game_data.units.get(unit_type, None)
+        is_structure = unit_data is not None and IS_STRUCTURE in unit_data.attributes
+        self._structure_types[unit_type] = is_structure
+        return is_structure
+
     async def _after_step(self) -> int:
         """ Executed by main.py after each on_step function. """
         # Keep track of the bot on_step duration
@@ -1801,7 +1909,7 @@ class BotAI(DistanceCalculation):
         # Clear set of unit tags that were given an order this frame by self.do()
         self.unit_tags_received_action.clear()
         # Commit debug queries
-        await self._client._send_debug()
+        await self._client._send_debug(self.state.game_loop)
 
         return self.state.game_loop
 
@@ -1813,7 +1921,9 @@ class BotAI(DistanceCalculation):
         await self.client.step(steps)
         state = await self.client.observation()
         gs = GameState(state.observation)
-        proto_game_info = await self.client._execute(game_info=sc_pb.RequestGameInfo())
+        proto_game_info = None
+        if self._pathing_grid_needs_request(gs):
+            proto_game_info = await self.client._execute(game_info=sc_pb.RequestGameInfo())
         self._prepare_step(gs, proto_game_info)
         await self.issue_events()
         # await self.on_step(-1)
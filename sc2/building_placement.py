@@ -0,0 +1,142 @@
+from __future__ import annotations
+from math import floor
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
+
+from .data import Race, race_gas, race_townhalls
+from .ids.unit_typeid import UnitTypeId
+from .position import Point2
+
+if TYPE_CHECKING:
+    from .bot_ai import BotAI
+    from .game_data import AbilityData, UnitTypeData
+
+# Buildings that need the resource no-build zone or a geyser are left for the server to check
+SERVER_ONLY_BUILDINGS = (
+    race_townhalls[Race.Random]
+    | set(race_gas.values())
+    | {UnitTypeId.ASSIMILATORRICH, UnitTypeId.REFINERYRICH, UnitTypeId.EXTRACTORRICH}
+)
+# Buildings that can be placed without creep or power
+ZERG_WITHOUT_CREEP = {UnitTypeId.HATCHERY, UnitTypeId.EXTRACTOR, UnitTypeId.EXTRACTORRICH}
+PROTOSS_WITHOUT_POWER = {UnitTypeId.NEXUS, UnitTypeId.PYLON, UnitTypeId.ASSIMILATOR, UnitTypeId.ASSIMILATORRICH}
+
+
+def _summed_area(mask: np.ndarray) -> np.ndarray:
+    """ Summed area table of the mask, padded with a zero row and column so window sums need no bounds checks. """
+    table = np.zeros((mask.shape[0] + 1, mask.shape[1] + 1), dtype=np.int32)
+    np.cumsum(np.cumsum(mask, axis=0, dtype=np.int32), axis=1, out=table[1:, 1:])
+    return table
+
+
+def _window_sums(table: np.ndarray, x0: np.ndarray, y0: np.ndarray, size: int) -> np.ndarray:
+    """ Sums of size x size windows starting at cells (x0, y0), the windows must be inside the grid. """
+    x1 = x0 + size
+    y1 = y0 + size
+    return table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+
+
+class BuildingPlacement:
+    """
+    Local building placement check, used by BotAI.find_placement to pick candidates before the server confirms them.
+
+    A cell is free if it is placeable in the placement grid, pathable in the pathing grid (which covers mineral fields,
+    geysers and rocks) and not under the footprint of a landed structure. Zerg buildings need creep on all of their
+    cells, other buildings need cells without creep and protoss buildings need to be powered by the psionic matrix.
+    """
+
+    def __init__(self, bot: BotAI):
+        self._bot = bot
+        self._game_loop = -1
+        self._free_table: Optional[np.ndarray] = None
+        self._creep_table: Optional[np.ndarray] = None
+        self._footprint_radius_by_type: Dict[int, float] = {}
+        self._unit_data_by_ability: Optional[Dict[int, UnitTypeData]] = None
+
+    def can_place(
+        self, building: AbilityData, positions: List[Union[Point2, Tuple[float, float]]]
+    ) -> Optional[np.ndarray]:
+        """ Returns for each position if the building fits there, or None if the building can't be checked locally.
+
+        :param building: Creation ability of the building
+        :param positions: Center points of the building """
+        unit_data = self._unit_data(building)
+        if unit_data is None or unit_data.id in SERVER_ONLY_BUILDINGS:
+            return None
+        radius = building._proto.footprint_radius
+        if not radius:
+            return None
+        if not len(positions):
+            return np.zeros(0, dtype=bool)
+        self._update()
+
+        size = round(radius * 2)
+        points = np.asarray(positions, dtype=np.float64)[:, :2]
+        # Bottom left cell of the footprint
+        x0 = np.floor(points[:, 0] - radius + 0.5).astype(np.int64)
+        y0 = np.floor(points[:, 1] - radius + 0.5).astype(np.int64)
+        height, width = self._free_table.shape[0] - 1, self._free_table.shape[1] - 1
+        result = (x0 >= 0) & (y0 >= 0) & (x0 + size <= width) & (y0 + size <= height)
+        x0 = np.where(result, x0, 0)
+        y0 = np.where(result, y0, 0)
+
+        area = size * size
+        result &= _window_sums(self._free_table, x0, y0, size) == area
+        creep = _window_sums(self._creep_table, x0, y0, size)
+        race = unit_data.race
+        if race == Race.Zerg:
+            if unit_data.id not in ZERG_WITHOUT_CREEP:
+                result &= creep == area
+        else:
+            result &= creep == 0
+
+        if race == Race.Protoss and unit_data.id not in PROTOSS_WITHOUT_POWER:
+            sources = self._bot.state.psionic_matrix.sources
+            if not sources:
+                result[:] = False
+            else:
+                centers = np.array([source.position for source in sources], dtype=np.float64)
+                radii = np.array([source.radius for source in sources], dtype=np.float64)
+                distances_squared = ((points[:, np.newaxis, :] - centers[np.newaxis, :, :]) ** 2).sum(axis=2)
+                result &= (distances_squared <= radii ** 2).any(axis=1)
+        return result
+
+    def _update(self):
+        """ Builds the free cell and creep tables once per frame. """
+        game_loop = self._bot.state.game_loop
+        if game_loop == self._game_loop:
+            return
+        self._game_loop = game_loop
+
+        game_info = self._bot._game_info
+        free = (game_info.placement_grid.data_numpy != 0) & (game_info.pathing_grid.data_numpy != 0)
+        # Lowered supply depots and creep tumors are pathable but still block placement
+        for unit in self._bot.structures + self._bot.enemy_structures:
+            if unit.is_flying:
+                continue
+            radius = self._footprint_radius(unit.type_id.value)
+            if radius:
+                x0 = max(0, floor(unit.position.x - radius + 0.5))
+                y0 = max(0, floor(unit.position.y - radius + 0.5))
+                size = round(radius * 2)
+                free[y0 : y0 + size, x0 : x0 + size] = False
+
+        self._free_table = _summed_area(free)
+        self._creep_table = _summed_area(self._bot.state.creep.data_numpy != 0)
+
+    def _footprint_radius(self, unit_type: int) -> float:
+        radius = self._footprint_radius_by_type.get(unit_type, None)
+        if radius is None:
+            radius = self._bot._calculate_footprint_radius(unit_type, blocks_pathing_only=False)
+            self._footprint_radius_by_type[unit_type] = radius
+        return radius
+
+    def _unit_data(self, building: AbilityData) -> Optional[UnitTypeData]:
+        if self._unit_data_by_ability is None:
+            self._unit_data_by_ability = {}
+            for unit_data in self._bot._game_data.units.values():
+                ability = unit_data.creation_ability
+                if ability is not None:
+                    self._unit_data_by_ability.setdefault(ability._proto.ability_id, unit_data)
+        return self._unit_data_by_ability.get(building._proto.ability_id, None)
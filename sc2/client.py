@@ -1,6 +1,6 @@
 from __future__ import annotations
 import logging
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, TYPE_CHECKING
 
 from s2clientprotocol import common_pb2 as common_pb
 from s2clientprotocol import debug_pb2 as debug_pb
@@ -10,6 +10,7 @@ from s2clientprotocol import sc2api_pb2 as sc_pb
 
 from .action import combine_actions
 from .data import ActionResult, ChatChannel, Race, Result, Status
+from .debug_layers import DEBUG_DRAW_BYTE_BUDGET, DEFAULT_LAYER, DebugLayer, write_debug_recording
 from .game_data import AbilityData, GameData
 from .game_info import GameInfo
 from .ids.ability_id import AbilityId
@@ -20,8 +21,14 @@ from .renderer import Renderer
 from .unit import Unit
 from .units import Units
 
+if TYPE_CHECKING:
+    from .unit_command import UnitCommand
+
 logger = logging.getLogger(__name__)
 
+# Larger action batches are split into multiple requests
+MAX_ACTIONS_PER_REQUEST = 1000
+
 
 class Client(Protocol):
     def __init__(self, ws):
@@ -33,16 +40,25 @@ class Client(Protocol):
         self.game_step: int = 8
         self._player_id = None
         self._game_result = None
-        # Store a hash value of all the debug requests to prevent sending the same ones again if they haven't changed last frame
-        self._debug_hash_tuple_last_iteration: Tuple[int, int, int, int] = (0, 0, 0, 0)
-        self._debug_draw_last_frame = False
-        self._debug_texts = []
-        self._debug_lines = []
-        self._debug_boxes = []
-        self._debug_spheres = []
+        # Debug draws are collected into layers, see debug_layer()
+        self.debug_layers: Dict[str, DebugLayer] = {DEFAULT_LAYER: DebugLayer(DEFAULT_LAYER)}
+        self.debug_byte_budget: int = DEBUG_DRAW_BYTE_BUDGET
+        # If set, debug draws are written to this file instead of sending them to the game, see debug_layers.py
+        self.debug_record_file: Optional[str] = None
+        # Amount of times a layer was left out because it didn't fit in the byte budget
+        self.debug_layers_over_budget = 0
+        self._debug_layer: DebugLayer = self.debug_layers[DEFAULT_LAYER]
+        self._debug_frame = 0
+        self._debug_recording_started = False
+        # Layer names and versions of the last sent draws to prevent sending the same ones again
+        self._debug_sent_layers: Tuple[Tuple[str, int], ...] = ()
 
         self._renderer = None
         self.raw_affects_selection = False
+        # If True, actions and debug draws are sent without waiting for the responses and the observation is requested
+        # together with the step, see step() and BotAI.pipelined_steps
+        self.pipelined = False
+        self._prefetched_observation = None
 
     @property
     def in_game(self):
@@ -123,7 +139,10 @@ class Client(Protocol):
         logger.info(f"Saved replay to {path}")
 
     async def observation(self, game_loop=None):
-        if game_loop is not None:
+        if game_loop is None and self._prefetched_observation is not None:
+            result = self._prefetched_observation
+            self._prefetched_observation = None
+        elif game_loop is not None:
             result = await self._execute(observation=sc_pb.RequestObservation(game_loop=game_loop))
         else:
             result = await self._execute(observation=sc_pb.RequestObservation())
@@ -149,7 +168,12 @@ class Client(Protocol):
     async def step(self, step_size: int = None):
         """ EXPERIMENTAL: Change self._client.game_step during the step function to increase or decrease steps per second """
         step_size = step_size or self.game_step
-        return await self._execute(step=sc_pb.RequestStep(count=step_size))
+        if not self.pipelined:
+            return await self._execute(step=sc_pb.RequestStep(count=step_size))
+
+        # Both requests are sent before either response is read, the observation is returned by the next observation() call
+        await self._execute_deferred(step=sc_pb.RequestStep(count=step_size))
+        self._prefetched_observation = await self._execute(observation=sc_pb.RequestObservation())
 
     async def get_game_data(self) -> GameData:
         result = await self._execute(
@@ -187,17 +211,32 @@ class Client(Protocol):
         elif not isinstance(actions, list):
             actions = [actions]
 
-        # On realtime=True, might get an error here: sc2.protocol.ProtocolError: ['Not in a game']
-        try:
-            res = await self._execute(
-                action=sc_pb.RequestAction(actions=(sc_pb.Action(action_raw=a) for a in combine_actions(actions)))
-            )
-        except ProtocolError as e:
-            return []
+        results = []
+        for request in self._action_requests(actions):
+            # On realtime=True, might get an error here: sc2.protocol.ProtocolError: ['Not in a game']
+            try:
+                res = await self._execute(action=request)
+            except ProtocolError as e:
+                return []
+            results.extend(ActionResult(r) for r in res.action.result)
         if return_successes:
-            return [ActionResult(r) for r in res.action.result]
+            return results
         else:
-            return [ActionResult(r) for r in res.action.result if ActionResult(r) != ActionResult.Success]
+            return [result for result in results if result != ActionResult.Success]
+
+    async def actions_deferred(self, actions: List[UnitCommand]):
+        """ Sends the actions without waiting for the response, results of the actions are not available. """
+        if actions:
+            for request in self._action_requests(actions):
+                await self._execute_deferred(action=request)
+
+    @staticmethod
+    def _action_requests(actions: List[UnitCommand]) -> Iterator[sc_pb.RequestAction]:
+        raw_actions = list(combine_actions(actions))
+        for start in range(0, len(raw_actions), MAX_ACTIONS_PER_REQUEST):
+            yield sc_pb.RequestAction(
+                actions=(sc_pb.Action(action_raw=a) for a in raw_actions[start : start + MAX_ACTIONS_PER_REQUEST])
+            )
 
     async def query_pathing(
         self, start: Union[Unit, Point2, Point3], end: Union[Point2, Point3]
@@ -484,7 +523,9 @@ class Client(Protocol):
 
     def debug_text_simple(self, text: str):
         """ Draws a text in the top left corner of the screen (up to a max of 6 messages fit there). """
-        self._debug_texts.append(DrawItemScreenText(text=text, color=None, start_point=Point2((0, 0)), font_size=8))
+        self._debug_layer.items.append(
+            DrawItemScreenText(text=text, color=None, start_point=Point2((0, 0)), font_size=8)
+        )
 
     def debug_text_screen(
         self,
@@ -498,7 +539,7 @@ class Client(Protocol):
         assert 0 <= pos[0] <= 1
         assert 0 <= pos[1] <= 1
         pos = Point2((pos[0], pos[1]))
-        self._debug_texts.append(DrawItemScreenText(text=text, color=color, start_point=pos, font_size=size))
+        self._debug_layer.items.append(DrawItemScreenText(text=text, color=color, start_point=pos, font_size=size))
 
     def debug_text_2d(
         self,
@@ -518,7 +559,7 @@ class Client(Protocol):
         """
         if isinstance(pos, Point2) and not isinstance(pos, Point3):  # a Point3 is also a Point2
             pos = Point3((pos.x, pos.y, 0))
-        self._debug_texts.append(DrawItemWorldText(text=text, color=color, start_point=pos, font_size=size))
+        self._debug_layer.items.append(DrawItemWorldText(text=text, color=color, start_point=pos, font_size=size))
 
     def debug_text_3d(
         self, text: str, pos: Union[Unit, Point2, Point3], color: Union[tuple, list, Point3] = None, size: int = 8
@@ -529,7 +570,7 @@ class Client(Protocol):
         self, p0: Union[Unit, Point2, Point3], p1: Union[Unit, Point2, Point3], color: Union[tuple, list, Point3] = None
     ):
         """ Draws a line from p0 to p1. """
-        self._debug_lines.append(DrawItemLine(color=color, start_point=p0, end_point=p1))
+        self._debug_layer.items.append(DrawItemLine(color=color, start_point=p0, end_point=p1))
 
     def debug_box_out(
         self,
@@ -538,7 +579,7 @@ class Client(Protocol):
         color: Union[tuple, list, Point3] = None,
     ):
         """ Draws a box with p_min and p_max as corners of the box. """
-        self._debug_boxes.append(DrawItemBox(start_point=p_min, end_point=p_max, color=color))
+        self._debug_layer.items.append(DrawItemBox(start_point=p_min, end_point=p_max, color=color))
 
     def debug_box2_out(
         self,
@@ -553,62 +594,98 @@ class Client(Protocol):
             pos = Point3((pos.x, pos.y, 0))
         p0 = pos + Point3((-half_vertex_length, -half_vertex_length, -half_vertex_length))
         p1 = pos + Point3((half_vertex_length, half_vertex_length, half_vertex_length))
-        self._debug_boxes.append(DrawItemBox(start_point=p0, end_point=p1, color=color))
+        self._debug_layer.items.append(DrawItemBox(start_point=p0, end_point=p1, color=color))
 
     def debug_sphere_out(
         self, p: Union[Unit, Point2, Point3], r: Union[int, float], color: Union[tuple, list, Point3] = None
     ):
         """ Draws a sphere at point p with radius r. """
-        self._debug_spheres.append(DrawItemSphere(start_point=p, radius=r, color=color))
-
-    async def _send_debug(self):
+        self._debug_layer.items.append(DrawItemSphere(start_point=p, radius=r, color=color))
+
+    def debug_layer(self, name: str = DEFAULT_LAYER, interval: int = None, priority: int = None) -> DebugLayer:
+        """ Selects the layer that the following debug draws go to, the layer is created if it doesn't exist.
+        Layers that didn't change since the last frame are not converted again. A layer with an interval keeps
+        its draws for that many frames and draws made in between are ignored, use debug_layer_due to skip them.
+
+        :param name:
+        :param interval: Frames between refreshes of the layer, 0 refreshes every frame
+        :param priority: Layers with higher priority are kept first when the draws don't fit in debug_byte_budget """
+        layer = self.debug_layers.get(name, None)
+        if layer is None:
+            layer = DebugLayer(name)
+            self.debug_layers[name] = layer
+        if interval is not None:
+            layer.interval = interval
+        if priority is not None:
+            layer.priority = priority
+        self._debug_layer = layer
+        return layer
+
+    def keep_debug_layer(self, name: str):
+        """ Keeps the draws of the layer from its last refresh on this frame, for when the code that draws to the layer
+        was skipped. Without it, the layer would be refreshed without items and its draws would disappear.
+
+        :param name: """
+        layer = self.debug_layers.get(name, None)
+        if layer is not None:
+            layer.keep = True
+
+    def debug_layer_due(self) -> bool:
+        """ Returns False if draws to the selected layer would be ignored on this frame because of its interval. """
+        return self._debug_layer.is_due(self._debug_frame)
+
+    async def _send_debug(self, game_loop: int = 0):
         """ Sends the debug draw execution. This is run by main.py now automatically, if there is any items in the list. You do not need to run this manually any longer.
         Check examples/terran/ramp_wall.py for example drawing. Each draw request needs to be sent again in every single on_step iteration.
+
+        :param game_loop: Game loop of the frame, used when debug draws are recorded to a file
         """
-        debug_hash = (
-            sum(hash(item) for item in self._debug_texts),
-            sum(hash(item) for item in self._debug_lines),
-            sum(hash(item) for item in self._debug_boxes),
-            sum(hash(item) for item in self._debug_spheres),
-        )
-        if debug_hash != (0, 0, 0, 0):
-            if debug_hash != self._debug_hash_tuple_last_iteration:
-                # Something has changed, either more or less is to be drawn, or a position of a drawing changed (e.g. when drawing on a moving unit)
-                self._debug_hash_tuple_last_iteration = debug_hash
-                await self._execute(
-                    debug=sc_pb.RequestDebug(
-                        debug=[
-                            debug_pb.DebugCommand(
-                                draw=debug_pb.DebugDraw(
-                                    text=[text.to_proto() for text in self._debug_texts] if self._debug_texts else None,
-                                    lines=[line.to_proto() for line in self._debug_lines]
-                                    if self._debug_lines
-                                    else None,
-                                    boxes=[box.to_proto() for box in self._debug_boxes] if self._debug_boxes else None,
-                                    spheres=[sphere.to_proto() for sphere in self._debug_spheres]
-                                    if self._debug_spheres
-                                    else None,
-                                )
-                            )
-                        ]
-                    )
-                )
-            self._debug_draw_last_frame = True
-            self._debug_texts.clear()
-            self._debug_lines.clear()
-            self._debug_boxes.clear()
-            self._debug_spheres.clear()
-        elif self._debug_draw_last_frame:
-            # Clear drawing if we drew last frame but nothing to draw this frame
-            self._debug_hash_tuple_last_iteration = (0, 0, 0, 0)
-            await self._execute(
-                debug=sc_pb.RequestDebug(
-                    debug=[
-                        debug_pb.DebugCommand(draw=debug_pb.DebugDraw(text=None, lines=None, boxes=None, spheres=None))
-                    ]
-                )
-            )
-            self._debug_draw_last_frame = False
+        frame = self._debug_frame
+        self._debug_frame += 1
+        for layer in self.debug_layers.values():
+            if layer.keep:
+                layer.keep = False
+                layer.items.clear()
+            elif layer.is_due(frame):
+                layer.refresh(frame)
+            else:
+                layer.items.clear()
+        self._debug_layer = self.debug_layers[DEFAULT_LAYER]
+
+        sent_layers: List[DebugLayer] = []
+        size = 0
+        for layer in sorted(self.debug_layers.values(), key=lambda item: -item.priority):
+            if not layer.size:
+                continue
+            if size + layer.size > self.debug_byte_budget:
+                if not self.debug_layers_over_budget:
+                    logger.warning(f"Debug layer {layer.name} left out, draws are over {self.debug_byte_budget} bytes")
+                self.debug_layers_over_budget += 1
+                continue
+            size += layer.size
+            sent_layers.append(layer)
+
+        sent_key = tuple((layer.name, layer.version) for layer in sent_layers)
+        if sent_key == self._debug_sent_layers:
+            # Nothing has changed, the draws of the previous frame stay on screen
+            return
+        self._debug_sent_layers = sent_key
+        # Sending an empty draw clears the draws of the previous frame
+        draw = debug_pb.DebugDraw()
+        for layer in sent_layers:
+            draw.MergeFrom(layer.draw)
+
+        if self.debug_record_file is not None:
+            write_debug_recording(self.debug_record_file, game_loop, draw, append=self._debug_recording_started)
+            self._debug_recording_started = True
+        else:
+            await self._execute_debug(sc_pb.RequestDebug(debug=[debug_pb.DebugCommand(draw=draw)]))
+
+    async def _execute_debug(self, request):
+        if self.pipelined:
+            await self._execute_deferred(debug=request)
+        else:
+            await self._execute(debug=request)
 
     async def debug_leave(self):
         await self._execute(debug=sc_pb.RequestDebug(debug=[debug_pb.DebugCommand(end_game=debug_pb.DebugEndGame())]))
@@ -716,6 +793,9 @@ class Client(Protocol):
 
 
 class DrawItem:
+    # Repeated field of DebugDraw that the item is added to
+    draw_field = ""
+
     def to_debug_point(self, point: Union[Unit, Point2, Point3]) -> common_pb.Point:
         """ Helper function for point conversion """
         if isinstance(point, Unit):
@@ -743,6 +823,8 @@ class DrawItem:
 
 
 class DrawItemScreenText(DrawItem):
+    draw_field = "text"
+
     def __init__(self, start_point: Point2 = None, color: Point3 = None, text: str = "", font_size: int = 8):
         self._start_point: Point2 = start_point
         self._color: Point3 = color
@@ -763,6 +845,8 @@ class DrawItemScreenText(DrawItem):
 
 
 class DrawItemWorldText(DrawItem):
+    draw_field = "text"
+
     def __init__(self, start_point: Point3 = None, color: Point3 = None, text: str = "", font_size: int = 8):
         self._start_point: Point3 = start_point
         self._color: Point3 = color
@@ -783,6 +867,8 @@ class DrawItemWorldText(DrawItem):
 
 
 class DrawItemLine(DrawItem):
+    draw_field = "lines"
+
     def __init__(self, start_point: Point3 = None, end_point: Point3 = None, color: Point3 = None):
         self._start_point: Point3 = start_point
         self._end_point: Point3 = end_point
@@ -799,6 +885,8 @@ class DrawItemLine(DrawItem):
 
 
 class DrawItemBox(DrawItem):
+    draw_field = "boxes"
+
     def __init__(self, start_point: Point3 = None, end_point: Point3 = None, color: Point3 = None):
         self._start_point: Point3 = start_point
         self._end_point: Point3 = end_point
@@ -816,6 +904,8 @@ class DrawItemBox(DrawItem):
 
 
 class DrawItemSphere(DrawItem):
+    draw_field = "spheres"
+
     def __init__(self, start_point: Point3 = None, radius: float = None, color: Point3 = None):
         self._start_point: Point3 = start_point
         self._radius: float = radius
@@ -164,6 +164,14 @@ IS_BIOLOGICAL: int = Attribute.Biological.value
 IS_MECHANICAL: int = Attribute.Mechanical.value
 IS_MASSIVE: int = Attribute.Massive.value
 IS_PSIONIC: int = Attribute.Psionic.value
+# Bits of the attributes in UnitTypeTable.attributes
+IS_STRUCTURE_FLAG: int = 1 << IS_STRUCTURE
+IS_LIGHT_FLAG: int = 1 << IS_LIGHT
+IS_ARMORED_FLAG: int = 1 << IS_ARMORED
+IS_BIOLOGICAL_FLAG: int = 1 << IS_BIOLOGICAL
+IS_MECHANICAL_FLAG: int = 1 << IS_MECHANICAL
+IS_MASSIVE_FLAG: int = 1 << IS_MASSIVE
+IS_PSIONIC_FLAG: int = 1 << IS_PSIONIC
 UNIT_BATTLECRUISER: UnitTypeId = UnitTypeId.BATTLECRUISER
 UNIT_ORACLE: UnitTypeId = UnitTypeId.ORACLE
 TARGET_GROUND: Set[int] = {TargetType.Ground.value, TargetType.Any.value}
@@ -359,6 +367,13 @@ TERRAN_STRUCTURES_REQUIRE_SCV: Set[UnitTypeId] = {
     UnitTypeId.STARPORT,
     UnitTypeId.SUPPLYDEPOT,
 }
+# Structures that never show up as blocked cells in the pathing grid
+STRUCTURES_NOT_BLOCKING_PATHING: Set[int] = {
+    UnitTypeId.SUPPLYDEPOTLOWERED.value,
+    UnitTypeId.CREEPTUMOR.value,
+    UnitTypeId.CREEPTUMORBURROWED.value,
+    UnitTypeId.CREEPTUMORQUEEN.value,
+}
 
 
 def return_NOTAUNIT():
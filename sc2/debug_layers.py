@@ -0,0 +1,82 @@
+from __future__ import annotations
+import struct
+from typing import Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from s2clientprotocol import debug_pb2 as debug_pb
+
+if TYPE_CHECKING:
+    from .client import DrawItem
+
+DEFAULT_LAYER = "default"
+# Maximum size of the draw request of a single frame in bytes, layers that don't fit are left out
+DEBUG_DRAW_BYTE_BUDGET = 512 * 1024
+
+# Header of each frame in a debug draw recording: game loop and size of the serialized DebugDraw
+_RECORD_HEADER = struct.Struct("<II")
+
+
+class DebugLayer:
+    """
+    Named group of debug draws, see Client.debug_layer.
+
+    The draw items of the layer are collected during the step. When the layer is refreshed, the items are converted to
+    a DebugDraw message, unless they are the same as on the previous refresh. A layer with an interval is only refreshed
+    every interval frames and keeps its previous draws in between. A layer can also keep its previous draws for one
+    frame when the code that draws to it did not run, see Client.keep_debug_layer.
+    """
+
+    def __init__(self, name: str, interval: int = 0, priority: int = 0):
+        """
+        :param name:
+        :param interval: Frames between refreshes, 0 refreshes every frame
+        :param priority: Layers with higher priority are kept first when the draws don't fit in the byte budget
+        """
+        self.name = name
+        self.interval = interval
+        self.priority = priority
+        self.items: List[DrawItem] = []
+        # Increased every time the draw message changes
+        self.version = 0
+        self.draw: debug_pb.DebugDraw = debug_pb.DebugDraw()
+        self.size = 0
+        self.last_refresh: Optional[int] = None
+        # Keep the previous draws on the next frame instead of refreshing
+        self.keep = False
+        self._hash = 0
+        self._count = 0
+
+    def is_due(self, frame: int) -> bool:
+        return self.interval <= 0 or self.last_refresh is None or frame - self.last_refresh >= self.interval
+
+    def refresh(self, frame: int):
+        """ Converts the items of the frame to the draw message if they have changed and clears the items. """
+        self.last_refresh = frame
+        items_hash = sum(hash(item) for item in self.items)
+        if items_hash != self._hash or len(self.items) != self._count:
+            self._hash = items_hash
+            self._count = len(self.items)
+            self.draw = debug_pb.DebugDraw()
+            for item in self.items:
+                getattr(self.draw, item.draw_field).append(item.to_proto())
+            self.size = self.draw.ByteSize()
+            self.version += 1
+        self.items.clear()
+
+
+def write_debug_recording(file_name: str, game_loop: int, draw: debug_pb.DebugDraw, append: bool = True):
+    """ Appends the draws of a frame to a debug draw recording, used by Client when debug_record_file is set. """
+    data = draw.SerializeToString()
+    with open(file_name, "ab" if append else "wb") as file:
+        file.write(_RECORD_HEADER.pack(game_loop, len(data)))
+        file.write(data)
+
+
+def read_debug_recording(file_name: str) -> Iterator[Tuple[int, debug_pb.DebugDraw]]:
+    """ Yields the game loop and the draws of each frame in which the draws changed. """
+    with open(file_name, "rb") as file:
+        while True:
+            header = file.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            game_loop, size = _RECORD_HEADER.unpack(header)
+            yield game_loop, debug_pb.DebugDraw.FromString(file.read(size))
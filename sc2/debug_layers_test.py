@@ -0,0 +1,109 @@
+import pytest
+from unittest import mock
+
+from s2clientprotocol import debug_pb2 as debug_pb
+
+from .client import Client
+from .debug_layers import read_debug_recording, write_debug_recording
+from .position import Point2, Point3
+
+
+def create_client() -> Client:
+    client = Client(mock.Mock())
+    client._execute_debug = mock.AsyncMock()
+    return client
+
+
+def sent_draw(client: Client) -> debug_pb.DebugDraw:
+    request = client._execute_debug.call_args[0][0]
+    return request.debug[0].draw
+
+
+class TestDebugLayers:
+    def test_recording_round_trip(self, tmp_path):
+        file_name = str(tmp_path / "debug.bin")
+        first = debug_pb.DebugDraw(text=[debug_pb.DebugText(text="first")])
+        second = debug_pb.DebugDraw()
+
+        write_debug_recording(file_name, 16, first, append=False)
+        write_debug_recording(file_name, 24, second)
+
+        assert list(read_debug_recording(file_name)) == [(16, first), (24, second)]
+
+        # A new recording replaces the old one
+        write_debug_recording(file_name, 8, second, append=False)
+        assert list(read_debug_recording(file_name)) == [(8, second)]
+
+    @pytest.mark.asyncio
+    async def test_layer_that_is_not_due_keeps_its_draws(self):
+        client = create_client()
+
+        client.debug_layer("slow", interval=4)
+        client.debug_line_out(Point3((1, 1, 0)), Point3((2, 2, 0)))
+        await client._send_debug()
+        assert len(sent_draw(client).lines) == 1
+
+        client.debug_layer("slow")
+        assert not client.debug_layer_due()
+        client.debug_line_out(Point3((5, 5, 0)), Point3((6, 6, 0)))
+        client.debug_layer()
+        client.debug_text_simple("text")
+        await client._send_debug()
+
+        draw = sent_draw(client)
+        assert len(draw.text) == 1
+        assert len(draw.lines) == 1
+        assert draw.lines[0].line.p0.x == 1
+
+    @pytest.mark.asyncio
+    async def test_kept_layer_keeps_its_draws(self):
+        client = create_client()
+
+        client.debug_layer("manager")
+        client.debug_text_simple("text")
+        client.debug_layer()
+        await client._send_debug()
+        version = client.debug_layers["manager"].version
+
+        # The code drawing to the layer was skipped
+        client.keep_debug_layer("manager")
+        await client._send_debug()
+        assert client._execute_debug.call_count == 1
+        assert client.debug_layers["manager"].version == version
+
+        # Without keeping, the empty layer clears the draws
+        await client._send_debug()
+        assert client._execute_debug.call_count == 2
+        assert sent_draw(client) == debug_pb.DebugDraw()
+
+    @pytest.mark.asyncio
+    async def test_layer_over_budget_is_left_out(self):
+        client = create_client()
+        client.debug_byte_budget = 100
+
+        client.debug_layer("important", priority=1)
+        client.debug_text_simple("kept")
+        client.debug_layer("verbose")
+        for index in range(10):
+            client.debug_text_screen(f"left out {index}", Point2((0, index / 10)))
+        await client._send_debug()
+
+        draw = sent_draw(client)
+        assert [text.text for text in draw.text] == ["kept"]
+        assert client.debug_layers_over_budget == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_frame_clears_previous_draws(self):
+        client = create_client()
+
+        client.debug_text_simple("text")
+        await client._send_debug()
+        assert len(sent_draw(client).text) == 1
+
+        await client._send_debug()
+        assert client._execute_debug.call_count == 2
+        assert sent_draw(client) == debug_pb.DebugDraw()
+
+        # Nothing left to clear
+        await client._send_debug()
+        assert client._execute_debug.call_count == 2
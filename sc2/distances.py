@@ -46,14 +46,19 @@ class DistanceCalculation:
             return self.calculate_distances()
         return self._cached_cdist
 
-    def _calculate_distances_method1(self) -> np.ndarray:
-        self._generated_frame2 = self.state.game_loop
+    def _all_units_positions(self) -> np.ndarray:
+        """ Positions of all units as (n, 2) array, taken from the unit columns when they are available for this frame. """
+        columns = getattr(self, "unit_columns", None)
+        if columns is not None and columns.game_loop == self.state.game_loop and len(columns) == self._units_count:
+            return columns.positions
         # Converts tuple [(1, 2), (3, 4)] to flat list like [1, 2, 3, 4]
         flat_positions = (coord for unit in self.all_units for coord in unit.position_tuple)
         # Converts to numpy array, then converts the flat array back to shape (n, 2): [[1, 2], [3, 4]]
-        positions_array: np.ndarray = np.fromiter(flat_positions, dtype=np.float, count=2 * self._units_count).reshape(
-            (self._units_count, 2)
-        )
+        return np.fromiter(flat_positions, dtype=float, count=2 * self._units_count).reshape((self._units_count, 2))
+
+    def _calculate_distances_method1(self) -> np.ndarray:
+        self._generated_frame2 = self.state.game_loop
+        positions_array: np.ndarray = self._all_units_positions()
         assert len(positions_array) == self._units_count
         # See performance benchmarks
         self._cached_pdist = pdist(positions_array, "sqeuclidean")
@@ -62,12 +67,7 @@ class DistanceCalculation:
 
     def _calculate_distances_method2(self) -> np.ndarray:
         self._generated_frame2 = self.state.game_loop
-        # Converts tuple [(1, 2), (3, 4)] to flat list like [1, 2, 3, 4]
-        flat_positions = (coord for unit in self.all_units for coord in unit.position_tuple)
-        # Converts to numpy array, then converts the flat array back to shape (n, 2): [[1, 2], [3, 4]]
-        positions_array: np.ndarray = np.fromiter(flat_positions, dtype=np.float, count=2 * self._units_count).reshape(
-            (self._units_count, 2)
-        )
+        positions_array: np.ndarray = self._all_units_positions()
         assert len(positions_array) == self._units_count
         # See performance benchmarks
         self._cached_cdist = cdist(positions_array, positions_array, "sqeuclidean")
@@ -77,10 +77,7 @@ class DistanceCalculation:
     def _calculate_distances_method3(self) -> np.ndarray:
         """ Nearly same as above, but without asserts"""
         self._generated_frame2 = self.state.game_loop
-        flat_positions = (coord for unit in self.all_units for coord in unit.position_tuple)
-        positions_array: np.ndarray = np.fromiter(flat_positions, dtype=np.float, count=2 * self._units_count).reshape(
-            (-1, 2)
-        )
+        positions_array: np.ndarray = self._all_units_positions()
         # See performance benchmarks
         self._cached_cdist = cdist(positions_array, positions_array, "sqeuclidean")
 
@@ -0,0 +1,80 @@
+import itertools
+import math
+from typing import List, Set
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .position import Point2
+
+# Distance offsets applied to the center of each resource group to find the expansion position
+EXPANSION_OFFSETS = np.array(
+    [(x, y) for x, y in itertools.product(range(-7, 8), repeat=2) if math.hypot(x, y) <= 8], dtype=np.float64
+)
+
+
+def group_resources(positions: np.ndarray, threshold: float) -> List[List[int]]:
+    """ Groups resources so that a group contains all resources that are closer than threshold to another resource
+    of the group, returns lists of indexes to positions.
+
+    Groups and their members are in the same order as they were when groups were merged pair by pair with
+    itertools.combinations, which decides the order of BotAI.expansion_locations_list. Close pairs come from a k-d tree
+    and the merging is replayed on neighbor sets: the merged group is appended to the end, so groups in front of the
+    first group with a neighbor never get a neighbor and the whole replay is a single pass over the groups.
+
+    :param positions: Resource positions as an array of shape (n, 2)
+    :param threshold: """
+    count = len(positions)
+    members: List[List[int]] = [[index] for index in range(count)]
+    neighbors: List[Set[int]] = [set() for _ in range(count)]
+    if count > 1:
+        for a, b in cKDTree(positions).query_pairs(threshold, output_type="ndarray").tolist():
+            neighbors[a].add(b)
+            neighbors[b].add(a)
+    alive = [True] * count
+
+    group = 0
+    while group < len(members):
+        if neighbors[group]:
+            # First pair in itertools.combinations order
+            other = min(neighbors[group])
+            merged = len(members)
+            merged_neighbors = (neighbors[group] | neighbors[other]) - {group, other}
+            for neighbor in merged_neighbors:
+                neighbors[neighbor] -= {group, other}
+                neighbors[neighbor].add(merged)
+            members.append(members[group] + members[other])
+            neighbors.append(merged_neighbors)
+            alive.append(True)
+            neighbors[group] = neighbors[other] = set()
+            alive[group] = alive[other] = False
+        group += 1
+    return [group for group, is_alive in zip(members, alive) if is_alive]
+
+
+def find_expansion_position(positions: np.ndarray, is_geyser: np.ndarray, placement_grid: np.ndarray) -> Point2:
+    """ Returns the placeable position next to the resource group with the smallest sum of distances to the resources.
+
+    :param positions: Resource positions of the group as an array of shape (n, 2)
+    :param is_geyser: Geysers need a distance of 7 to the position, mineral fields 6
+    :param placement_grid: Placement grid as numpy array indexed by [y, x] """
+    # Expansion locations have (x.5, y.5) coordinates because bases have size 5
+    center = np.floor(positions.sum(axis=0) / len(positions)) + 0.5
+    candidates = center + EXPANSION_OFFSETS
+    cells = np.floor(candidates).astype(np.int64)
+    height, width = placement_grid.shape
+    valid = (cells[:, 0] >= 0) & (cells[:, 1] >= 0) & (cells[:, 0] < width) & (cells[:, 1] < height)
+    valid[valid] = placement_grid[cells[valid, 1], cells[valid, 0]] == 1
+
+    distances_squared = ((candidates[:, np.newaxis, :] - positions[np.newaxis, :, :]) ** 2).sum(axis=2)
+    valid &= (distances_squared > np.where(is_geyser, 49, 36)).all(axis=1)
+    sums = np.sqrt(distances_squared).sum(axis=1)
+
+    # Positions with nearly the same sum are compared with the exact sums used before, so ties resolve the same way
+    if valid.any():
+        valid &= sums <= sums[valid].min() + 1e-6
+    resources = [Point2(position) for position in positions.tolist()]
+    return min(
+        (Point2(candidate) for candidate in candidates[valid].tolist()),
+        key=lambda point: sum(point.distance_to(resource) for resource in resources),
+    )
@@ -0,0 +1,113 @@
+import itertools
+import math
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from .expansion_locations import find_expansion_position, group_resources
+from .position import Point2
+
+# (map size, base count) of layouts similar to ladder maps, 4 player maps have the most bases
+LAYOUTS = [((176, 152), 14), ((232, 232), 28)]
+
+
+def create_layout(
+    size: Tuple[int, int], base_count: int, seed: int = 0
+) -> Tuple[List[Point2], List[bool], np.ndarray]:
+    """ Creates resources of base_count bases with 8 mineral fields and 2 geysers at distance 8 from the base position.
+
+    Returns resource positions, geyser flags and the placement grid. """
+    rng = np.random.RandomState(seed)
+    width, height = size
+    placement_grid = np.ones((height, width), dtype=np.uint8)
+    positions: List[Point2] = []
+    is_geyser: List[bool] = []
+    bases: List[Tuple[float, float]] = []
+    while len(bases) < base_count:
+        base = (rng.randint(15, width - 15) + 0.5, rng.randint(15, height - 15) + 0.5)
+        if any(math.hypot(base[0] - x, base[1] - y) < 30 for x, y in bases):
+            continue
+        bases.append(base)
+        direction = rng.uniform(0, 2 * math.pi)
+        for angle in np.linspace(direction - 1, direction + 1, 8):
+            x = math.floor(base[0] + 8 * math.cos(angle))
+            y = math.floor(base[1] + 8 * math.sin(angle))
+            # Mineral fields are 2x1 and geysers 3x3
+            mineral = Point2((x, y + 0.5))
+            positions.append(mineral)
+            is_geyser.append(False)
+            placement_grid[int(mineral.y), int(mineral.x) - 1 : int(mineral.x) + 1] = 0
+        for angle in (direction - 1.8, direction + 1.8):
+            x = math.floor(base[0] + 8 * math.cos(angle))
+            y = math.floor(base[1] + 8 * math.sin(angle))
+            geyser = Point2((x + 0.5, y + 0.5))
+            positions.append(geyser)
+            is_geyser.append(True)
+            placement_grid[int(geyser.y) - 1 : int(geyser.y) + 2, int(geyser.x) - 1 : int(geyser.x) + 2] = 0
+    return positions, is_geyser, placement_grid
+
+
+def reference_resource_groups(positions: List[Point2], threshold: float) -> List[List[int]]:
+    """ Resource groups merged pair by pair the way BotAI._find_expansion_locations did before group_resources. """
+    resource_groups = [[index] for index in range(len(positions))]
+    merged_group = True
+    while merged_group:
+        merged_group = False
+        for group_a, group_b in itertools.combinations(resource_groups, 2):
+            if any(
+                positions[a].distance_to(positions[b]) <= threshold for a, b in itertools.product(group_a, group_b)
+            ):
+                resource_groups.remove(group_a)
+                resource_groups.remove(group_b)
+                resource_groups.append(group_a + group_b)
+                merged_group = True
+                break
+    return resource_groups
+
+
+def reference_expansion_position(
+    positions: List[Point2], is_geyser: List[bool], placement_grid: np.ndarray, group: List[int]
+) -> Point2:
+    """ Expansion location of a resource group calculated the way BotAI._find_expansion_locations did before. """
+    offsets = [(x, y) for x, y in itertools.product(range(-7, 8), repeat=2) if math.hypot(x, y) <= 8]
+    center_x = int(sum(positions[index].x for index in group) / len(group)) + 0.5
+    center_y = int(sum(positions[index].y for index in group) / len(group)) + 0.5
+    possible_points = (Point2((x + center_x, y + center_y)) for x, y in offsets)
+    possible_points = (
+        point
+        for point in possible_points
+        if placement_grid[point.rounded[1], point.rounded[0]] == 1
+        and all(point.distance_to(positions[index]) > (7 if is_geyser[index] else 6) for index in group)
+    )
+    return min(possible_points, key=lambda point: sum(point.distance_to(positions[index]) for index in group))
+
+
+class TestExpansionLocations:
+    @pytest.mark.parametrize("size, base_count", LAYOUTS)
+    def test_groups_match_pairwise_merging(self, size, base_count):
+        positions, _, _ = create_layout(size, base_count)
+
+        groups = group_resources(np.array(positions, dtype=np.float64), 8.5)
+
+        assert groups == reference_resource_groups(positions, 8.5)
+        assert len(groups) == base_count
+
+    def test_groups_of_chained_resources(self):
+        # 0 and 2 are only connected through 1, 3 is alone
+        positions = [Point2((0, 0)), Point2((5, 0)), Point2((10, 0)), Point2((30, 0))]
+
+        groups = group_resources(np.array(positions, dtype=np.float64), 8.5)
+
+        assert groups == reference_resource_groups(positions, 8.5)
+        assert sorted(sorted(group) for group in groups) == [[0, 1, 2], [3]]
+
+    @pytest.mark.parametrize("size, base_count", LAYOUTS)
+    def test_expansion_positions_match_reference(self, size, base_count):
+        positions, is_geyser, placement_grid = create_layout(size, base_count, seed=1)
+        position_array = np.array(positions, dtype=np.float64)
+        geyser_array = np.array(is_geyser, dtype=bool)
+
+        for group in group_resources(position_array, 8.5):
+            expected = reference_expansion_position(positions, is_geyser, placement_grid, group)
+            assert find_expansion_position(position_array[group], geyser_array[group], placement_grid) == expected
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from bisect import bisect_left
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union, TYPE_CHECKING
 
-from .constants import ZERGLING
+import numpy as np
+
+from .constants import TARGET_AIR, TARGET_GROUND, UNIT_BATTLECRUISER, UNIT_ORACLE, ZERGLING
 from .data import Attribute, Race
 from .ids.ability_id import AbilityId
 from .ids.unit_typeid import UnitTypeId
@@ -24,6 +26,8 @@ class GameData:
         self.abilities = {a.ability_id: AbilityData(self, a) for a in data.abilities if a.ability_id in ids}
         self.units = {u.unit_id: UnitTypeData(self, u) for u in data.units if u.available}
         self.upgrades = {u.upgrade_id: UpgradeData(self, u) for u in data.upgrades}
+        # Values of the unit types that are used in unit properties, indexed by unit type id
+        self.unit_table = UnitTypeTable(unit._proto for unit in self.units.values())
         # Cached UnitTypeIds so that conversion does not take long. This needs to be moved elsewhere if a new GameData object is created multiple times per game
         self.unit_types: Dict[int, UnitTypeId] = {}
 
@@ -124,6 +128,105 @@ class AbilityData:
         return self._game_data.calculate_ability_cost(self.id)
 
 
+class UnitTypeValues(NamedTuple):
+    """ Values of a single unit type, see UnitTypeTable """
+
+    # Attribute bits, see IS_STRUCTURE_FLAG in constants.py
+    attributes: int
+    can_attack_ground: bool
+    ground_dps: float
+    ground_range: float
+    can_attack_air: bool
+    air_dps: float
+    air_range: float
+    armor: float
+    sight_range: float
+    movement_speed: float
+    minerals: int
+    vespene: int
+    build_time: float
+
+
+class UnitTypeTable:
+    """ Values of all unit types in numpy arrays indexed by unit type id, built once from the unit type protos.
+    Unit types that are not in the game data have zero values.
+
+    The arrays are meant for calculations over many units at once. For a single unit type, values[unit_type]
+    returns all values of the type without numpy scalar conversions. Weapon values don't include upgrades and
+    are taken from the first weapon that can hit ground or air, with the same exceptions for battlecruisers and
+    oracles as in Unit. """
+
+    def __init__(self, protos: Iterable[Any]):
+        protos = list(protos)
+        size = max((proto.unit_id for proto in protos), default=0) + 1
+        self.attributes = np.zeros(size, dtype=np.uint32)
+        self.can_attack_ground = np.zeros(size, dtype=bool)
+        self.ground_dps = np.zeros(size, dtype=np.float64)
+        self.ground_range = np.zeros(size, dtype=np.float64)
+        self.can_attack_air = np.zeros(size, dtype=bool)
+        self.air_dps = np.zeros(size, dtype=np.float64)
+        self.air_range = np.zeros(size, dtype=np.float64)
+        self.armor = np.zeros(size, dtype=np.float64)
+        self.sight_range = np.zeros(size, dtype=np.float64)
+        self.movement_speed = np.zeros(size, dtype=np.float64)
+        self.minerals = np.zeros(size, dtype=np.int32)
+        self.vespene = np.zeros(size, dtype=np.int32)
+        self.build_time = np.zeros(size, dtype=np.float64)
+
+        for proto in protos:
+            unit_id = proto.unit_id
+            self.attributes[unit_id] = sum(1 << attribute for attribute in set(proto.attributes))
+            ground_weapon = next((weapon for weapon in proto.weapons if weapon.type in TARGET_GROUND), None)
+            air_weapon = next((weapon for weapon in proto.weapons if weapon.type in TARGET_AIR), None)
+            if ground_weapon is not None:
+                self.can_attack_ground[unit_id] = True
+                self.ground_dps[unit_id] = (ground_weapon.damage * ground_weapon.attacks) / ground_weapon.speed
+                self.ground_range[unit_id] = ground_weapon.range
+            if air_weapon is not None:
+                self.can_attack_air[unit_id] = True
+                self.air_dps[unit_id] = (air_weapon.damage * air_weapon.attacks) / air_weapon.speed
+                self.air_range[unit_id] = air_weapon.range
+            self.armor[unit_id] = proto.armor
+            self.sight_range[unit_id] = proto.sight_range
+            self.movement_speed[unit_id] = proto.movement_speed
+            self.minerals[unit_id] = proto.mineral_cost
+            self.vespene[unit_id] = proto.vespene_cost
+            self.build_time[unit_id] = proto.build_time
+
+        # The game data has no weapons for battlecruisers and oracles, so their attacks are added here
+        for unit_type, ground_range in ((UNIT_BATTLECRUISER, 6), (UNIT_ORACLE, 4)):
+            if unit_type.value < size:
+                self.can_attack_ground[unit_type.value] = True
+                self.ground_range[unit_type.value] = ground_range
+        if UNIT_BATTLECRUISER.value < size:
+            self.can_attack_air[UNIT_BATTLECRUISER.value] = True
+            self.air_range[UNIT_BATTLECRUISER.value] = 6
+
+        self.values: List[UnitTypeValues] = [
+            UnitTypeValues(*row)
+            for row in zip(
+                *(
+                    array.tolist()
+                    for array in (
+                        self.attributes,
+                        self.can_attack_ground,
+                        self.ground_dps,
+                        self.ground_range,
+                        self.can_attack_air,
+                        self.air_dps,
+                        self.air_range,
+                        self.armor,
+                        self.sight_range,
+                        self.movement_speed,
+                        self.minerals,
+                        self.vespene,
+                        self.build_time,
+                    )
+                )
+            )
+        ]
+
+
 class UnitTypeData:
     def __init__(self, game_data: GameData, proto):
         """
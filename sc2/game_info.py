@@ -1,14 +1,18 @@
 from __future__ import annotations
-from collections import deque
-from typing import Any, Deque, Dict, FrozenSet, Generator, List, Optional, Sequence, Set, Tuple, Union, TYPE_CHECKING
+from typing import Any, Dict, FrozenSet, Generator, List, Optional, Sequence, Set, Tuple, Union, TYPE_CHECKING
 
 import numpy as np
+from scipy import ndimage
 
 from .cache import property_immutable_cache, property_mutable_cache
+from .grouping import label_indices
 from .pixel_map import PixelMap
 from .player import Player
 from .position import Point2, Rect, Size
 
+if TYPE_CHECKING:
+    from .map_analysis_cache import MapAnalysisCache
+
 
 class Ramp:
     def __init__(self, points: Set[Point2], game_info: GameInfo):
@@ -43,19 +47,23 @@ class Ramp:
     def points(self) -> Set[Point2]:
         return self._points.copy()
 
+    @property_immutable_cache
+    def _point_heights(self) -> Tuple[np.ndarray, np.ndarray]:
+        """ Points of the ramp as an (n, 2) array and their terrain heights. """
+        points = np.array(list(self._points), dtype=np.int64).reshape(-1, 2)
+        return points, self._height_map.values_at(points)
+
+    def _points_at_height(self, height: int) -> Set[Point2]:
+        points, heights = self._point_heights
+        return set(Point2(point) for point in points[heights == height].tolist())
+
     @property_mutable_cache
     def upper(self) -> Set[Point2]:
         """ Returns the upper points of a ramp. """
-        current_max = -10000
-        result = set()
-        for p in self._points:
-            height = self.height_at(p)
-            if height > current_max:
-                current_max = height
-                result = {p}
-            elif height == current_max:
-                result.add(p)
-        return result
+        points, heights = self._point_heights
+        if not len(points):
+            return set()
+        return self._points_at_height(heights.max())
 
     @property_mutable_cache
     def upper2_for_ramp_wall(self) -> Set[Point2]:
@@ -79,16 +87,10 @@ class Ramp:
 
     @property_mutable_cache
     def lower(self) -> Set[Point2]:
-        current_min = 10000
-        result = set()
-        for p in self._points:
-            height = self.height_at(p)
-            if height < current_min:
-                current_min = height
-                result = {p}
-            elif height == current_min:
-                result.add(p)
-        return result
+        points, heights = self._point_heights
+        if not len(points):
+            return set()
+        return self._points_at_height(heights.min())
 
     @property_immutable_cache
     def bottom_center(self) -> Point2:
@@ -246,30 +248,46 @@ class GameInfo:
         self.start_locations: List[Point2] = [Point2.from_proto(sl) for sl in self._proto.start_raw.start_locations]
         self.player_start_location: Point2 = None  # Filled later by BotAI._prepare_first_step
 
-    def _find_ramps_and_vision_blockers(self) -> Tuple[List[Ramp], Set[Point2]]:
+    def _find_ramps_and_vision_blockers(
+        self, cache: Optional[MapAnalysisCache] = None
+    ) -> Tuple[List[Ramp], Set[Point2]]:
         """ Calculate points that are pathable but not placeable.
         Then devide them into ramp points if not all points around the points are equal height
-        and into vision blockers if they are. """
-
-        def equal_height_around(tile):
-            # mask to slice array 1 around tile
-            sliced = self.terrain_height.data_numpy[tile[1] - 1 : tile[1] + 2, tile[0] - 1 : tile[0] + 2]
-            return len(np.unique(sliced)) == 1
+        and into vision blockers if they are.
+
+        :param cache: Map analysis cache the result is loaded from or stored to """
+        if cache is not None:
+            cached = cache.get("ramps")
+            if cached is not None:
+                groups: List[Set[Point2]] = [set() for _ in range(int(cached["count"]))]
+                for point, group in zip(cached["points"].tolist(), cached["groups"].tolist()):
+                    groups[group].add(Point2(point))
+                vision_blockers = set(Point2(point) for point in cached["vision_blockers"].tolist())
+                return [Ramp(group, self) for group in groups], vision_blockers
 
         map_area = self.playable_area
         # all points in the playable area that are pathable but not placable
-        points = [
-            Point2((a, b))
-            for (b, a), value in np.ndenumerate(self.pathing_grid.data_numpy)
-            if value == 1
-            and map_area.x <= a < map_area.x + map_area.width
-            and map_area.y <= b < map_area.y + map_area.height
-            and self.placement_grid[(a, b)] == 0
-        ]
+        points = (self.pathing_grid.data_numpy == 1) & (self.placement_grid.data_numpy == 0)
+        in_area = np.zeros_like(points)
+        in_area[map_area.y : map_area.y + map_area.height, map_area.x : map_area.x + map_area.width] = True
+        points &= in_area
+
         # divide points into ramp points and vision blockers
-        rampPoints = [point for point in points if not equal_height_around(point)]
-        visionBlockers = set(point for point in points if equal_height_around(point))
-        ramps = [Ramp(group, self) for group in self._find_groups(rampPoints)]
+        height = self.terrain_height.data_numpy
+        equal_height_around = ndimage.maximum_filter(height, size=3, mode="nearest") == ndimage.minimum_filter(
+            height, size=3, mode="nearest"
+        )
+        ys, xs = np.nonzero(points & equal_height_around)
+        visionBlockers = set(Point2(point) for point in zip(xs.tolist(), ys.tolist()))
+        ramps = [Ramp(group, self) for group in self._label_groups(points & ~equal_height_around)]
+        if cache is not None:
+            cache.put(
+                "ramps",
+                count=np.array(len(ramps)),
+                points=np.array([point for ramp in ramps for point in ramp.points], dtype=np.int32).reshape(-1, 2),
+                groups=np.array([index for index, ramp in enumerate(ramps) for _ in ramp.points], dtype=np.int32),
+                vision_blockers=np.array(list(visionBlockers), dtype=np.int32).reshape(-1, 2),
+            )
         return ramps, visionBlockers
 
     def _find_groups(self, points: Set[Point2], minimum_points_per_group: int = 8):
@@ -278,42 +296,18 @@ class GameInfo:
         painting clusters of points in a rectangular map using flood fill algorithm.
         Returns groups of points as list, like [{p1, p2, p3}, {p4, p5, p6, p7, p8}]
         """
-        # TODO do we actually need colors here? the ramps will never touch anyways.
-        NOT_COLORED_YET = -1
-        map_width = self.pathing_grid.width
-        map_height = self.pathing_grid.height
-        currentColor: int = NOT_COLORED_YET
-        picture: List[List[int]] = [[-2 for _ in range(map_width)] for _ in range(map_height)]
-
-        def paint(pt: Point2) -> None:
-            picture[pt.y][pt.x] = currentColor
-
-        nearby = [(a, b) for a in [-1, 0, 1] for b in [-1, 0, 1] if a != 0 or b != 0]
-
-        remaining: Set[Point2] = set(points)
-        for point in remaining:
-            paint(point)
-        currentColor = 1
-        queue: Deque[Point2] = deque()
-        while remaining:
-            currentGroup: Set[Point2] = set()
-            if not queue:
-                start = remaining.pop()
-                paint(start)
-                queue.append(start)
-                currentGroup.add(start)
-            while queue:
-                base: Point2 = queue.popleft()
-                for offset in nearby:
-                    px, py = base.x + offset[0], base.y + offset[1]
-                    if not (0 <= px < map_width and 0 <= py < map_height):
-                        continue
-                    if picture[py][px] != NOT_COLORED_YET:
-                        continue
-                    point: Point2 = Point2((px, py))
-                    remaining.discard(point)
-                    paint(point)
-                    queue.append(point)
-                    currentGroup.add(point)
-            if len(currentGroup) >= minimum_points_per_group:
-                yield currentGroup
+        mask = np.zeros((self.pathing_grid.height, self.pathing_grid.width), dtype=bool)
+        if points:
+            xs, ys = np.array(list(points), dtype=np.int64).T
+            mask[ys, xs] = True
+        return self._label_groups(mask, minimum_points_per_group)
+
+    def _label_groups(self, mask: np.ndarray, minimum_points_per_group: int = 8) -> Generator[Set[Point2], None, None]:
+        """ Yields the 8-connected groups of the cells set in the mask, indexed [y, x], as sets of points. """
+        labels, count = ndimage.label(mask, structure=np.ones((3, 3), dtype=bool))
+        if not count:
+            return
+        ys, xs = np.nonzero(labels)
+        for indices in label_indices(labels[ys, xs]):
+            if len(indices) >= minimum_points_per_group:
+                yield set(Point2(point) for point in zip(xs[indices].tolist(), ys[indices].tolist()))
@@ -0,0 +1,13 @@
+from typing import List
+
+import numpy as np
+
+
+def label_indices(labels: np.ndarray) -> List[np.ndarray]:
+    """ Groups the indices of a one dimensional label array by label, in label order.
+    Indices in each group are in ascending order, for example [1, 0, 1] gives [[1], [0, 2]]. """
+    if not len(labels):
+        return []
+    order = np.argsort(labels, kind="stable")
+    splits = np.flatnonzero(np.diff(labels[order])) + 1
+    return np.split(order, splits)
@@ -45,6 +45,13 @@ class SlidingTimeWindow:
         return ",".join(f"{w:.2f}" for w in self.window[1:])
 
 
+async def _request_game_info(client, ai, gs):
+    """ Requests game info for the pathing grid only if the bot needs it this step, see BotAI._pathing_grid_needs_request """
+    if ai._pathing_grid_needs_request(gs):
+        return await client._execute(game_info=sc_pb.RequestGameInfo())
+    return None
+
+
 async def _play_game_human(client, player_id, realtime, game_time_limit):
     while True:
         state = await client.observation()
@@ -95,6 +102,7 @@ async def _play_game_ai(client, player_id, ai, realtime, step_time_limit, game_t
         time_limit = float(step_time_limit.get("time_limit", None))
 
     ai._initialize_variables()
+    client.pipelined = ai.pipelined_steps and not realtime
 
     game_data = await client.get_game_data()
     game_info = await client.get_game_info()
@@ -107,7 +115,7 @@ async def _play_game_ai(client, player_id, ai, realtime, step_time_limit, game_t
         await ai.on_end(client._game_result[player_id])
         return client._game_result[player_id]
     gs = GameState(state.observation)
-    proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
+    proto_game_info = await _request_game_info(client, ai, gs)
     ai._prepare_step(gs, proto_game_info)
     await ai.on_before_start()
     ai._prepare_first_step()
@@ -152,7 +160,7 @@ async def _play_game_ai(client, player_id, ai, realtime, step_time_limit, game_t
             if game_time_limit and (gs.game_loop * 0.725 * (1 / 16)) > game_time_limit:
                 await ai.on_end(Result.Tie)
                 return Result.Tie
-            proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
+            proto_game_info = await _request_game_info(client, ai, gs)
             ai._prepare_step(gs, proto_game_info)
 
         logger.debug(f"Running AI step, it={iteration} {gs.game_loop * 0.725 * (1 / 16):.2f}s")
@@ -278,7 +286,7 @@ async def _play_replay(client, ai, realtime=False, player_id=0):
         await ai.on_end(client._game_result[player_id])
         return client._game_result[player_id]
     gs = GameState(state.observation)
-    proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
+    proto_game_info = await _request_game_info(client, ai, gs)
     ai._prepare_step(gs, proto_game_info)
     ai._prepare_first_step()
     try:
@@ -310,7 +318,7 @@ async def _play_replay(client, ai, realtime=False, player_id=0):
             gs = GameState(state.observation)
             logger.debug(f"Score: {gs.score.score}")
 
-            proto_game_info = await client._execute(game_info=sc_pb.RequestGameInfo())
+            proto_game_info = await _request_game_info(client, ai, gs)
             ai._prepare_step(gs, proto_game_info)
 
         logger.debug(f"Running AI step, it={iteration} {gs.game_loop * 0.725 * (1 / 16):.2f}s")
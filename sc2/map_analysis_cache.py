@@ -0,0 +1,96 @@
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import threading
+import zipfile
+from typing import Dict, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .position import Point2
+
+if TYPE_CHECKING:
+    from .game_info import GameInfo
+
+logger = logging.getLogger(__name__)
+
+# Increase when the stored entries change, old files are then ignored
+MAP_ANALYSIS_VERSION = 1
+
+
+def map_analysis_key(game_info: GameInfo, start_location: Point2) -> str:
+    """ Hash of the pathing, placement and height grids of the map and the start location. """
+    start_raw = game_info._proto.start_raw
+    digest = hashlib.sha1(f"{MAP_ANALYSIS_VERSION}".encode())
+    for grid in (start_raw.pathing_grid, start_raw.placement_grid, start_raw.terrain_height):
+        digest.update(grid.data)
+    digest.update(f"{start_location.x},{start_location.y}".encode())
+    return digest.hexdigest()
+
+
+class MapAnalysisCache:
+    """
+    Results of static map analysis stored on disk, one compressed numpy file per map and start location.
+
+    An entry is a named group of arrays. get() returns an entry that was loaded from the file, put() adds a new
+    entry and save() writes the file in a background thread if entries were added.
+    Enable by setting BotAI.map_analysis_cache_folder.
+    """
+
+    def __init__(self, folder: str, game_info: GameInfo, start_location: Point2):
+        self.folder = folder
+        self.key = map_analysis_key(game_info, start_location)
+        self.file_name = os.path.join(folder, self.key + ".npz")
+        self.hits = 0
+        self.misses = 0
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._changed = False
+        self._writer: Optional[threading.Thread] = None
+        self._load()
+
+    def _load(self):
+        if not os.path.isfile(self.file_name):
+            return
+        try:
+            with np.load(self.file_name) as data:
+                self._arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            logger.warning(f"Could not load map analysis from {self.file_name}: {e}")
+            self._arrays = {}
+
+    def get(self, entry: str) -> Optional[Dict[str, np.ndarray]]:
+        """ Returns the arrays of the entry by name, or None if the entry is not cached. """
+        prefix = entry + "."
+        arrays = {name[len(prefix) :]: array for name, array in self._arrays.items() if name.startswith(prefix)}
+        if arrays:
+            self.hits += 1
+            return arrays
+        self.misses += 1
+        return None
+
+    def put(self, entry: str, **arrays: np.ndarray):
+        for name, array in arrays.items():
+            self._arrays[f"{entry}.{name}"] = np.asarray(array)
+        self._changed = True
+
+    def save(self):
+        """ Writes all entries to the file in a background thread, if there are new entries. """
+        if not self._changed:
+            return
+        self._changed = False
+        if self._writer is not None:
+            # Files are written one at a time, so that the latest one always contains all entries
+            self._writer.join()
+        self._writer = threading.Thread(target=self._write, args=(dict(self._arrays),), name="MapAnalysisCache")
+        self._writer.start()
+
+    def _write(self, arrays: Dict[str, np.ndarray]):
+        temp_name = self.file_name + ".tmp"
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(temp_name, "wb") as file:
+                np.savez_compressed(file, **arrays)
+            os.replace(temp_name, self.file_name)
+        except OSError as e:
+            logger.warning(f"Could not save map analysis to {self.file_name}: {e}")
@@ -228,6 +228,12 @@ class ObserverAI(DistanceCalculation):
             self._game_info.player_start_location = self.townhalls.first.position
         self._game_info.map_ramps, self._game_info.vision_blockers = self._game_info._find_ramps_and_vision_blockers()
 
+    def _pathing_grid_needs_request(self, state: GameState) -> bool:
+        """ The observer does not keep the pathing grid up to date, so game info is never requested during a replay.
+
+        :param state: """
+        return False
+
     def _prepare_step(self, state, proto_game_info):
         """
         :param state:
@@ -274,7 +280,7 @@ class ObserverAI(DistanceCalculation):
         """ Executed by main.py after each on_step function. """
         self.unit_tags_received_action.clear()
         # Commit debug queries
-        await self._client._send_debug()
+        await self._client._send_debug(self.state.game_loop)
         return self.state.game_loop
 
     async def issue_events(self):
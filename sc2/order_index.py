@@ -0,0 +1,129 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Set, Tuple, Union, TYPE_CHECKING
+
+from .constants import TERRAN_STRUCTURES_REQUIRE_SCV
+from .data import Race
+from .position import Point2
+
+if TYPE_CHECKING:
+    from .game_data import GameData
+    from .unit import Unit
+
+TERRAN_STRUCTURES_REQUIRE_SCV_VALUES: Set[int] = {unit_type.value for unit_type in TERRAN_STRUCTURES_REQUIRE_SCV}
+
+
+def creation_ability_id(game_data: GameData, unit_type_value: int) -> int:
+    """ Exact ability id that creates the unit type, 0 if the unit type has no creation ability. """
+    unit_data = game_data.units.get(unit_type_value, None)
+    if unit_data is None:
+        return 0
+    ability_id = unit_data._proto.ability_id
+    return ability_id if ability_id in game_data.abilities else 0
+
+
+class OrderIndex:
+    """ Orders of own units and structures in one observation, indexed by exact ability id.
+    Built once per frame from the order protos without creating UnitOrder objects, see BotAI.order_index.
+
+    Example::
+
+        index = self.order_index
+        pylon_ability = creation_ability_id(self._game_data, UnitTypeId.PYLON.value)
+        pylons_in_production = index.ability_count(pylon_ability)
+        pylon_positions = index.worker_target_positions(pylon_ability)
+    """
+
+    def __init__(
+        self,
+        game_data: GameData,
+        race: Race,
+        units: Iterable[Unit],
+        structures: Iterable[Unit],
+        workers: Iterable[Unit],
+    ):
+        """
+        :param game_data:
+        :param race: Race of the bot, Terran structures in production are already counted by the orders of SCVs
+        :param units:
+        :param structures:
+        :param workers:
+        """
+        # Orders and units in production by ability, includes protoss units warping in and all morphs
+        self._counts: Dict[int, int] = {}
+        # Highest build progress of units in production by ability
+        self._build_progress: Dict[int, float] = {}
+        # Progress of the first research order of ready structures by ability
+        self._research_progress: Dict[int, float] = {}
+        # Highest build progress of structures by unit type value
+        self._structure_progress: Dict[int, float] = {}
+        self._worker_counts: Dict[int, int] = {}
+        # Target positions of worker orders by ability, including SCVs that are constructing
+        self._worker_positions: Dict[int, List[Point2]] = {}
+
+        counts = self._counts
+        scv_structures: Set[Union[Tuple[float, float], int]] = set()
+        skip_terran_structures = race == Race.Terran
+        for group, is_structure in ((units, False), (structures, True)):
+            for unit in group:
+                proto = unit._proto
+                build_progress = proto.build_progress
+                for order in proto.orders:
+                    ability_id = order.ability_id
+                    counts[ability_id] = counts.get(ability_id, 0) + 1
+                    if is_structure and build_progress == 1 and ability_id not in self._research_progress:
+                        self._research_progress[ability_id] = order.progress
+
+                if build_progress < 1 and not (is_structure and skip_terran_structures):
+                    # If an SCV is constructing a building, it would be counted twice
+                    # (once from the SCV order, and once from the structure not being ready)
+                    ability_id = creation_ability_id(game_data, proto.unit_type)
+                    counts[ability_id] = counts.get(ability_id, 0) + 1
+                    if build_progress > self._build_progress.get(ability_id, 0):
+                        self._build_progress[ability_id] = build_progress
+
+                if is_structure:
+                    unit_type = proto.unit_type
+                    if build_progress > self._structure_progress.get(unit_type, 0):
+                        self._structure_progress[unit_type] = build_progress
+                    if unit_type in TERRAN_STRUCTURES_REQUIRE_SCV_VALUES:
+                        scv_structures.add((proto.pos.x, proto.pos.y))
+                        scv_structures.add(proto.tag)
+
+        for worker in workers:
+            for order in worker._proto.orders:
+                ability_id = order.ability_id
+                if order.HasField("target_world_space_pos"):
+                    target = order.target_world_space_pos
+                    position = (target.x, target.y)
+                    self._worker_positions.setdefault(ability_id, []).append(Point2(position))
+                    # Skip if the SCV is constructing a structure
+                    if position in scv_structures:
+                        continue
+                # Skip if the SCV is resuming construction of a structure
+                elif order.target_unit_tag in scv_structures:
+                    continue
+                self._worker_counts[ability_id] = self._worker_counts.get(ability_id, 0) + 1
+
+    def ability_count(self, ability_id: int) -> int:
+        """ Amount of orders with the ability and of units in production that the ability creates. """
+        return self._counts.get(ability_id, 0)
+
+    def build_progress(self, ability_id: int) -> float:
+        """ Highest build progress of the units in production that the ability creates. """
+        return self._build_progress.get(ability_id, 0)
+
+    def worker_count(self, ability_id: int) -> int:
+        """ Amount of orders of workers with the ability, excluding SCVs that are constructing. """
+        return self._worker_counts.get(ability_id, 0)
+
+    def research_progress(self, ability_id: int) -> float:
+        """ Progress of a research order with the ability in a ready structure, 0 if there is none. """
+        return self._research_progress.get(ability_id, 0)
+
+    def structure_progress(self, unit_type_value: int) -> float:
+        """ Highest build progress of own structures of the unit type, 0 if there are none. """
+        return self._structure_progress.get(unit_type_value, 0)
+
+    def worker_target_positions(self, ability_id: int) -> List[Point2]:
+        """ Target positions of the orders of workers with the ability, including SCVs that are constructing. """
+        return self._worker_positions.get(ability_id, [])
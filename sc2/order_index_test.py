@@ -0,0 +1,164 @@
+from types import SimpleNamespace
+
+from s2clientprotocol import common_pb2, data_pb2, raw_pb2, sc2api_pb2
+
+from .bot_ai import BotAI
+from .data import Race
+from .game_data import GameData
+from .ids.ability_id import AbilityId
+from .ids.unit_typeid import UnitTypeId
+from .ids.upgrade_id import UpgradeId
+from .position import Point2
+from .unit import Unit
+from .units import Units
+
+CREATION_ABILITIES = {
+    UnitTypeId.SCV: AbilityId.COMMANDCENTERTRAIN_SCV,
+    UnitTypeId.COMMANDCENTER: AbilityId.TERRANBUILD_COMMANDCENTER,
+    UnitTypeId.BARRACKS: AbilityId.TERRANBUILD_BARRACKS,
+    UnitTypeId.ENGINEERINGBAY: AbilityId.TERRANBUILD_ENGINEERINGBAY,
+}
+STRUCTURES = {UnitTypeId.COMMANDCENTER, UnitTypeId.BARRACKS, UnitTypeId.ENGINEERINGBAY}
+RESEARCH_ABILITY = AbilityId.ENGINEERINGBAYRESEARCH_TERRANINFANTRYWEAPONSLEVEL1
+
+BARRACKS_TAG = 100
+BARRACKS_POSITION = (10.5, 10.5)
+NEW_BARRACKS_POSITION = (30.5, 30.5)
+
+
+def create_game_data() -> GameData:
+    abilities = set(CREATION_ABILITIES.values()) | {RESEARCH_ABILITY}
+    data = sc2api_pb2.ResponseData(
+        abilities=[data_pb2.AbilityData(ability_id=ability.value, available=True) for ability in abilities],
+        units=[
+            data_pb2.UnitTypeData(
+                unit_id=unit_type.value,
+                available=True,
+                ability_id=ability.value,
+                attributes=[data_pb2.Structure] if unit_type in STRUCTURES else [],
+            )
+            for unit_type, ability in CREATION_ABILITIES.items()
+        ],
+        upgrades=[
+            data_pb2.UpgradeData(
+                upgrade_id=UpgradeId.TERRANINFANTRYWEAPONSLEVEL1.value, ability_id=RESEARCH_ABILITY.value
+            )
+        ],
+    )
+    return GameData(data)
+
+
+def create_unit(bot: BotAI, unit_type: UnitTypeId, tag: int, position=(0.5, 0.5), build_progress=1, orders=()):
+    proto = raw_pb2.Unit(
+        unit_type=unit_type.value,
+        alliance=1,
+        tag=tag,
+        build_progress=build_progress,
+        pos=common_pb2.Point(x=position[0], y=position[1]),
+        orders=list(orders),
+    )
+    return Unit(proto, bot)
+
+
+def build_order(ability: AbilityId, position=None, target_tag=0) -> raw_pb2.UnitOrder:
+    if position is not None:
+        target = common_pb2.Point(x=position[0], y=position[1])
+        return raw_pb2.UnitOrder(ability_id=ability.value, target_world_space_pos=target)
+    return raw_pb2.UnitOrder(ability_id=ability.value, target_unit_tag=target_tag)
+
+
+def create_bot(race: Race, research_progress: float = 0.5) -> BotAI:
+    """
+    Terran base with a barracks under construction and a worker building it, a worker on its way to build another
+    barracks, a worker resuming construction of the barracks, a command center training an SCV and an engineering bay
+    researching infantry weapons.
+    """
+    bot = BotAI()
+    bot.race = race
+    bot._game_data = create_game_data()
+    bot.state = SimpleNamespace(game_loop=1, upgrades=set())
+
+    structures = [
+        create_unit(bot, UnitTypeId.COMMANDCENTER, 1, orders=[build_order(AbilityId.COMMANDCENTERTRAIN_SCV)]),
+        create_unit(bot, UnitTypeId.BARRACKS, BARRACKS_TAG, BARRACKS_POSITION, build_progress=0.5),
+        create_unit(
+            bot,
+            UnitTypeId.ENGINEERINGBAY,
+            2,
+            orders=[raw_pb2.UnitOrder(ability_id=RESEARCH_ABILITY.value, progress=research_progress)],
+        ),
+    ]
+    workers = [
+        # Constructing the barracks
+        create_unit(bot, UnitTypeId.SCV, 10, orders=[build_order(AbilityId.TERRANBUILD_BARRACKS, BARRACKS_POSITION)]),
+        # On its way to build a new barracks
+        create_unit(
+            bot, UnitTypeId.SCV, 11, orders=[build_order(AbilityId.TERRANBUILD_BARRACKS, NEW_BARRACKS_POSITION)]
+        ),
+        # Resuming construction of the barracks
+        create_unit(
+            bot, UnitTypeId.SCV, 12, orders=[build_order(AbilityId.TERRANBUILD_BARRACKS, target_tag=BARRACKS_TAG)]
+        ),
+        create_unit(bot, UnitTypeId.SCV, 13),
+    ]
+    bot.structures = Units(structures, bot)
+    bot.workers = Units(workers, bot)
+    bot.units = Units(workers, bot)
+    return bot
+
+
+class TestOrderIndex:
+    def test_terran_structures_are_counted_by_scv_orders(self):
+        bot = create_bot(Race.Terran)
+
+        # Three worker orders, the barracks under construction is not counted again
+        assert bot.already_pending(UnitTypeId.BARRACKS) == 3
+        assert bot.already_pending(UnitTypeId.SCV) == 1
+        assert bot.already_pending(UnitTypeId.COMMANDCENTER) == 0
+
+    def test_structures_under_construction_are_counted_for_other_races(self):
+        bot = create_bot(Race.Protoss)
+
+        assert bot.already_pending(UnitTypeId.BARRACKS) == 4
+
+    def test_worker_en_route_skips_constructing_scvs(self):
+        bot = create_bot(Race.Terran)
+
+        # Neither the SCV constructing the barracks nor the one resuming its construction is counted
+        assert bot.worker_en_route_to_build(UnitTypeId.BARRACKS) == 1
+        assert bot.worker_en_route_to_build(UnitTypeId.ENGINEERINGBAY) == 0
+
+    def test_worker_target_positions(self):
+        bot = create_bot(Race.Terran)
+        ability_id = AbilityId.TERRANBUILD_BARRACKS.value
+
+        assert bot.order_index.worker_target_positions(ability_id) == [
+            Point2(BARRACKS_POSITION),
+            Point2(NEW_BARRACKS_POSITION),
+        ]
+
+    def test_structure_type_build_progress(self):
+        bot = create_bot(Race.Terran)
+
+        assert bot.structure_type_build_progress(UnitTypeId.BARRACKS) == 0.5
+        assert bot.structure_type_build_progress(UnitTypeId.COMMANDCENTER) == 1
+        # Orbital command counts as a command center, not the other way around
+        assert bot.structure_type_build_progress(UnitTypeId.ORBITALCOMMAND) == 0
+        assert bot.structure_type_build_progress(UnitTypeId.FACTORY) == 0
+
+    def test_already_pending_upgrade(self):
+        bot = create_bot(Race.Terran, research_progress=0.25)
+
+        assert bot.already_pending_upgrade(UpgradeId.TERRANINFANTRYWEAPONSLEVEL1) == 0.25
+        assert bot.already_pending(UpgradeId.TERRANINFANTRYWEAPONSLEVEL1) == 0.25
+
+        bot.state.upgrades.add(UpgradeId.TERRANINFANTRYWEAPONSLEVEL1)
+        assert bot.already_pending_upgrade(UpgradeId.TERRANINFANTRYWEAPONSLEVEL1) == 1
+
+    def test_index_is_built_once_per_frame(self):
+        bot = create_bot(Race.Terran)
+
+        index = bot.order_index
+        assert bot.order_index is index
+        bot.state.game_loop += 1
+        assert bot.order_index is not index
@@ -1,10 +1,40 @@
-from typing import Callable, FrozenSet, List, Set
+from collections import OrderedDict
+from typing import Callable, FrozenSet, List, Set, Tuple, Union
 
 import numpy as np
+from scipy import ndimage
 
+from .grouping import label_indices
 from .position import Point2
 
 
+# Decoded data of recently seen map protos, see _decode
+_DECODED_CACHE_SIZE = 32
+_decoded_cache: "OrderedDict[Tuple[bytes, int, int, bool, bool], np.ndarray]" = OrderedDict()
+
+
+def _decode(data: bytes, width: int, height: int, in_bits: bool, mirrored: bool) -> np.ndarray:
+    """ Returns a read-only array of the map data, shared by all pixel maps that are created from identical data. """
+    key = (data, width, height, in_bits, mirrored)
+    decoded = _decoded_cache.get(key, None)
+    if decoded is not None:
+        _decoded_cache.move_to_end(key)
+        return decoded
+
+    buffer_data = np.frombuffer(data, dtype=np.uint8)
+    if in_bits:
+        buffer_data = np.unpackbits(buffer_data)
+    decoded = buffer_data.reshape(height, width)
+    if mirrored:
+        decoded = np.flipud(decoded)
+    decoded.flags.writeable = False
+
+    _decoded_cache[key] = decoded
+    if len(_decoded_cache) > _DECODED_CACHE_SIZE:
+        _decoded_cache.popitem(last=False)
+    return decoded
+
+
 class PixelMap:
     def __init__(self, proto, in_bits: bool = False, mirrored: bool = False):
         """
@@ -17,15 +47,27 @@ class PixelMap:
         self._in_bits: bool = in_bits
         self._mirrored: bool = mirrored
 
+        data = self._proto.data
         assert self.width * self.height == (8 if in_bits else 1) * len(
-            self._proto.data
-        ), f"{self.width * self.height} {(8 if in_bits else 1)*len(self._proto.data)}"
-        buffer_data = np.frombuffer(self._proto.data, dtype=np.uint8)
-        if in_bits:
-            buffer_data = np.unpackbits(buffer_data)
-        self.data_numpy = buffer_data.reshape(self._proto.size.y, self._proto.size.x)
-        if mirrored:
-            self.data_numpy = np.flipud(self.data_numpy)
+            data
+        ), f"{self.width * self.height} {(8 if in_bits else 1)*len(data)}"
+        # Read-only until written to, see writable
+        self._data: np.ndarray = _decode(data, self.width, self.height, in_bits, mirrored)
+
+    @property
+    def data_numpy(self) -> np.ndarray:
+        """ Map data indexed [y, x]. The array is shared with other pixel maps and read-only, use writable() to modify it. """
+        return self._data
+
+    @data_numpy.setter
+    def data_numpy(self, value: np.ndarray):
+        self._data = value
+
+    def writable(self) -> np.ndarray:
+        """ Returns the map data for modifying, the shared data is copied on the first call. """
+        if not self._data.flags.writeable:
+            self._data = self._data.copy()
+        return self._data
 
     @property
     def width(self):
@@ -47,7 +89,7 @@ class PixelMap:
         """ Example usage: is_pathable = self._game_info.pathing_grid[Point2((20, 20))] != 0 """
         assert 0 <= pos[0] < self.width, f"x is {pos[0]}, self.width is {self.width}"
         assert 0 <= pos[1] < self.height, f"y is {pos[1]}, self.height is {self.height}"
-        return int(self.data_numpy[pos[1], pos[0]])
+        return self._data.item(pos[1], pos[0])
 
     def __setitem__(self, pos, value):
         """ Example usage: self._game_info.pathing_grid[Point2((20, 20))] = 255 """
@@ -57,7 +99,23 @@ class PixelMap:
             0 <= value <= 254 * self._in_bits + 1
         ), f"value is {value}, it should be between 0 and {254 * self._in_bits + 1}"
         assert isinstance(value, int), f"value is of type {type(value)}, it should be an integer"
-        self.data_numpy[pos[1], pos[0]] = value
+        self.writable()[pos[1], pos[0]] = value
+
+    def values_at(self, points: Union[np.ndarray, List[Tuple[float, float]]]) -> np.ndarray:
+        """ Batched lookup, returns the values at the (x, y) points as an array.
+        Example usage: visible = self.state.visibility.values_at(positions) == 2 """
+        points = np.asarray(points)
+        if not len(points):
+            return np.empty(0, dtype=self._data.dtype)
+        xs = points[:, 0].astype(np.int64)
+        ys = points[:, 1].astype(np.int64)
+        assert (
+            xs.min() >= 0 and xs.max() < self.width
+        ), f"x is between {xs.min()} and {xs.max()}, self.width is {self.width}"
+        assert (
+            ys.min() >= 0 and ys.max() < self.height
+        ), f"y is between {ys.min()} and {ys.max()}, self.height is {self.height}"
+        return self._data[ys, xs]
 
     def is_set(self, p):
         return self[p] != 0
@@ -68,49 +126,50 @@ class PixelMap:
     def copy(self):
         return PixelMap(self._proto, in_bits=self._in_bits, mirrored=self._mirrored)
 
-    def flood_fill(self, start_point: Point2, pred: Callable[[int], bool]) -> Set[Point2]:
-        nodes: Set[Point2] = set()
-        queue: List[Point2] = [start_point]
+    def mask(self, pred: Callable[[int], bool]) -> np.ndarray:
+        """ Returns a boolean array indexed [y, x] of the pixels for which pred is True.
+        pred is called once per distinct value, not per pixel. """
+        lookup = np.zeros(256, dtype=bool)
+        for value in np.unique(self._data):
+            lookup[value] = bool(pred(int(value)))
+        return lookup[self._data]
 
-        while queue:
-            x, y = queue.pop()
+    def label(self, pred: Callable[[int], bool]) -> Tuple[np.ndarray, int]:
+        """ Labels the 8-connected groups of pixels for which pred is True.
+        Returns the label array indexed [y, x], where 0 is not in any group, and the number of groups. """
+        return ndimage.label(self.mask(pred), structure=np.ones((3, 3), dtype=bool))
 
-            if not (0 <= x < self.width and 0 <= y < self.height):
-                continue
-
-            if Point2((x, y)) in nodes:
-                continue
+    def flood_fill(self, start_point: Point2, pred: Callable[[int], bool]) -> Set[Point2]:
+        x, y = start_point
+        if not (0 <= x < self.width and 0 <= y < self.height) or not pred(self[x, y]):
+            return set()
 
-            if pred(self[x, y]):
-                nodes.add(Point2((x, y)))
-                queue += [Point2((x + a, y + b)) for a in [-1, 0, 1] for b in [-1, 0, 1] if not (a == 0 and b == 0)]
-        return nodes
+        labels, _ = self.label(pred)
+        ys, xs = np.nonzero(labels == labels[y, x])
+        return {Point2(point) for point in zip(xs.tolist(), ys.tolist())}
 
     def flood_fill_all(self, pred: Callable[[int], bool]) -> Set[FrozenSet[Point2]]:
-        groups: Set[FrozenSet[Point2]] = set()
-
-        for x in range(self.width):
-            for y in range(self.height):
-                if any((x, y) in g for g in groups):
-                    continue
-
-                if pred(self[x, y]):
-                    groups.add(frozenset(self.flood_fill(Point2((x, y)), pred)))
+        labels, count = self.label(pred)
+        if not count:
+            return set()
 
+        ys, xs = np.nonzero(labels)
+        groups: Set[FrozenSet[Point2]] = set()
+        for indices in label_indices(labels[ys, xs]):
+            groups.add(frozenset(Point2(point) for point in zip(xs[indices].tolist(), ys[indices].tolist())))
         return groups
 
     def print(self, wide=False):
-        for y in range(self.height):
-            for x in range(self.width):
-                print("#" if self.is_set((x, y)) else " ", end=(" " if wide else ""))
-            print("")
+        separator = " " if wide else ""
+        for row in self._data != 0:
+            print(separator.join("#" if is_set else " " for is_set in row.tolist()) + separator)
 
     def save_image(self, filename):
-        data = [(0, 0, self[x, y]) for y in range(self.height) for x in range(self.width)]
+        data = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        data[:, :, 2] = self._data
         from PIL import Image
 
-        im = Image.new("RGB", (self.width, self.height))
-        im.putdata(data)
+        im = Image.fromarray(data, "RGB")
         im.save(filename)
 
     def plot(self):
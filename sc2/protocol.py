@@ -2,6 +2,8 @@ import asyncio
 
 import logging
 import sys
+import time
+from typing import Dict, List, Optional, Tuple
 
 from s2clientprotocol import sc2api_pb2 as sc_pb
 
@@ -9,6 +11,9 @@ from .data import Status
 
 logger = logging.getLogger(__name__)
 
+# Deferred requests whose responses have not been read yet, the responses are read before more requests are deferred
+MAX_DEFERRED_REQUESTS = 8
+
 
 class ProtocolError(Exception):
     @property
@@ -20,6 +25,30 @@ class ConnectionAlreadyClosed(ProtocolError):
     pass
 
 
+class RequestStats:
+    """ Time spent sending and awaiting requests and message sizes of one request type, see Protocol.request_stats.
+    Responses of deferred requests only count the time spent waiting for them when they are read. """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def add(self, wait_time: float, request_size: int, response_size: int):
+        self.count += 1
+        self.total_time += wait_time
+        self.max_time = max(self.max_time, wait_time)
+        self.request_bytes += request_size
+        self.response_bytes += response_size
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.count if self.count else 0
+
+
 class Protocol:
     def __init__(self, ws):
         """
@@ -28,19 +57,36 @@ class Protocol:
         assert ws
         self._ws = ws
         self._status = None
-
-    async def __request(self, request):
-        logger.debug(f"Sending request: {request !r}")
+        # Name, time spent sending and size of requests that were sent with _execute_deferred and whose responses
+        # have not been read yet
+        self._deferred: List[Tuple[str, float, int]] = []
+        # Responses of deferred requests are only checked for errors, so the same message is parsed into every time
+        self._deferred_response = sc_pb.Response()
+        self.request_stats: Dict[str, RequestStats] = {}
+
+    async def __send(self, request) -> int:
+        """ Sends the request and returns its size in bytes. """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sending request: {request !r}")
+        data = request.SerializeToString()
         try:
-            await self._ws.send_bytes(request.SerializeToString())
+            await self._ws.send_bytes(data)
         except TypeError:
             logger.exception("Cannot send: Connection already closed.")
             raise ConnectionAlreadyClosed("Connection already closed.")
-        logger.debug(f"Request sent")
+        logger.debug("Request sent")
+        return len(data)
+
+    async def __receive(self, response=None) -> Tuple[sc_pb.Response, int, float]:
+        """ Receives the next response and returns it with its size in bytes and the time spent waiting for it.
 
-        response = sc_pb.Response()
+        :param response: Message to parse the response into, a new one by default """
+        if response is None:
+            response = sc_pb.Response()
+        start = time.perf_counter()
         try:
             response_bytes = await self._ws.receive_bytes()
+            wait_time = time.perf_counter() - start
         except TypeError:
             if self._status == Status.ended:
                 logger.info("Cannot receive: Game has already ended.")
@@ -58,16 +104,46 @@ class Protocol:
             raise
 
         response.ParseFromString(response_bytes)
-        logger.debug(f"Response received")
+        logger.debug("Response received")
+        return response, len(response_bytes), wait_time
+
+    def _record(self, name: str, wait_time: float, request_size: int, response_size: int):
+        stats = self.request_stats.get(name, None)
+        if stats is None:
+            stats = self.request_stats[name] = RequestStats(name)
+        stats.add(wait_time, request_size, response_size)
+
+    async def __request(self, name: str, request):
+        start = time.perf_counter()
+        request_size = await self.__send(request)
+        send_time = time.perf_counter() - start
+
+        # Responses arrive in the order the requests were sent, so the responses of deferred requests come first
+        deferred_error = await self.__receive_deferred()
+        response, response_size, wait_time = await self.__receive()
+        self._record(name, send_time + wait_time, request_size, response_size)
+        if deferred_error is not None:
+            raise deferred_error
         return response
 
-    async def _execute(self, **kwargs):
-        assert len(kwargs) == 1, "Only one request allowed"
-
-        request = sc_pb.Request(**kwargs)
-
-        response = await self.__request(request)
-
+    async def __receive_deferred(self) -> Optional[ProtocolError]:
+        """ Reads and checks the responses of deferred requests, returns the game over error if there was one. """
+        game_over_error = None
+        deferred = self._deferred
+        self._deferred = []
+        for name, send_time, request_size in deferred:
+            response, response_size, wait_time = await self.__receive(self._deferred_response)
+            self._record(name, send_time + wait_time, request_size, response_size)
+            try:
+                self._check_response(response)
+            except ProtocolError as e:
+                if e.is_game_over_error:
+                    game_over_error = game_over_error or e
+                else:
+                    logger.warning(f"Deferred {name} request failed: {e}")
+        return game_over_error
+
+    def _check_response(self, response):
         new_status = Status(response.status)
         if new_status != self._status:
             logger.info(f"Client status changed to {new_status} (was {self._status})")
@@ -77,8 +153,44 @@ class Protocol:
             logger.debug(f"Response contained an error: {response.error}")
             raise ProtocolError(f"{response.error}")
 
+    async def _execute(self, **kwargs):
+        assert len(kwargs) == 1, "Only one request allowed"
+
+        request = sc_pb.Request(**kwargs)
+
+        response = await self.__request(next(iter(kwargs)), request)
+        self._check_response(response)
         return response
 
+    async def _execute_deferred(self, **kwargs):
+        """
+        Sends a request without waiting for the response.
+        The response is read when the next request is executed, errors other than game over errors are only logged.
+        At most MAX_DEFERRED_REQUESTS responses are left unread, the oldest ones are read before sending more.
+        """
+        assert len(kwargs) == 1, "Only one request allowed"
+
+        if len(self._deferred) >= MAX_DEFERRED_REQUESTS:
+            deferred_error = await self.__receive_deferred()
+            if deferred_error is not None:
+                raise deferred_error
+
+        start = time.perf_counter()
+        request_size = await self.__send(sc_pb.Request(**kwargs))
+        self._deferred.append((next(iter(kwargs)), time.perf_counter() - start, request_size))
+
+    def request_stats_report(self) -> List[str]:
+        """ Returns a line of send and wait times and sizes for each request type, the slowest in total first. """
+        lines = [
+            f"{'request':<16} {'count':>7} {'total s':>9} {'avg ms':>8} {'max ms':>8} {'sent kB':>9} {'recv kB':>9}"
+        ]
+        for stats in sorted(self.request_stats.values(), key=lambda s: s.total_time, reverse=True):
+            lines.append(
+                f"{stats.name:<16} {stats.count:>7} {stats.total_time:>9.2f} {stats.average_time * 1000:>8.2f} "
+                f"{stats.max_time * 1000:>8.2f} {stats.request_bytes / 1024:>9.1f} {stats.response_bytes / 1024:>9.1f}"
+            )
+        return lines
+
     async def ping(self):
         result = await self._execute(ping=sc_pb.RequestPing())
         return result
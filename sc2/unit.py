@@ -7,15 +7,14 @@ from .cache import property_immutable_cache, property_mutable_cache
 from .constants import (
     transforming,
     DAMAGE_BONUS_PER_UPGRADE,
-    IS_STRUCTURE,
+    IS_STRUCTURE_FLAG,
     IS_LIGHT,
-    IS_ARMORED,
-    IS_BIOLOGICAL,
-    IS_MECHANICAL,
-    IS_MASSIVE,
-    IS_PSIONIC,
-    UNIT_BATTLECRUISER,
-    UNIT_ORACLE,
+    IS_LIGHT_FLAG,
+    IS_ARMORED_FLAG,
+    IS_BIOLOGICAL_FLAG,
+    IS_MECHANICAL_FLAG,
+    IS_MASSIVE_FLAG,
+    IS_PSIONIC_FLAG,
     TARGET_GROUND,
     TARGET_AIR,
     TARGET_BOTH,
@@ -68,7 +67,7 @@ from .unit_command import UnitCommand
 
 if TYPE_CHECKING:
     from .bot_ai import BotAI
-    from .game_data import AbilityData, UnitTypeData
+    from .game_data import AbilityData, UnitTypeData, UnitTypeValues
 
 
 class UnitOrder:
@@ -127,6 +126,11 @@ class Unit:
         """ Provides the unit type data. """
         return self._bot_object._game_data.units[self._proto.unit_type]
 
+    @property_immutable_cache
+    def _type_values(self) -> UnitTypeValues:
+        """ Provides the values of the unit type from the unit type table. """
+        return self._bot_object._game_data.unit_table.values[self._proto.unit_type]
+
     @property_immutable_cache
     def _creation_ability(self) -> AbilityData:
         """ Provides the AbilityData of the creation ability of this unit. """
@@ -150,37 +154,37 @@ class Unit:
     @property
     def is_structure(self) -> bool:
         """ Checks if the unit is a structure. """
-        return IS_STRUCTURE in self._type_data.attributes
+        return bool(self._type_values.attributes & IS_STRUCTURE_FLAG)
 
     @property
     def is_light(self) -> bool:
         """ Checks if the unit has the 'light' attribute. """
-        return IS_LIGHT in self._type_data.attributes
+        return bool(self._type_values.attributes & IS_LIGHT_FLAG)
 
     @property
     def is_armored(self) -> bool:
         """ Checks if the unit has the 'armored' attribute. """
-        return IS_ARMORED in self._type_data.attributes
+        return bool(self._type_values.attributes & IS_ARMORED_FLAG)
 
     @property
     def is_biological(self) -> bool:
         """ Checks if the unit has the 'biological' attribute. """
-        return IS_BIOLOGICAL in self._type_data.attributes
+        return bool(self._type_values.attributes & IS_BIOLOGICAL_FLAG)
 
     @property
     def is_mechanical(self) -> bool:
         """ Checks if the unit has the 'mechanical' attribute. """
-        return IS_MECHANICAL in self._type_data.attributes
+        return bool(self._type_values.attributes & IS_MECHANICAL_FLAG)
 
     @property
     def is_massive(self) -> bool:
         """ Checks if the unit has the 'massive' attribute. """
-        return IS_MASSIVE in self._type_data.attributes
+        return bool(self._type_values.attributes & IS_MASSIVE_FLAG)
 
     @property
     def is_psionic(self) -> bool:
         """ Checks if the unit has the 'psionic' attribute. """
-        return IS_PSIONIC in self._type_data.attributes
+        return bool(self._type_values.attributes & IS_PSIONIC_FLAG)
 
     @property
     def tech_alias(self) -> Optional[List[UnitTypeId]]:
@@ -207,8 +211,7 @@ class Unit:
     @property_immutable_cache
     def can_attack(self) -> bool:
         """ Checks if the unit can attack at all. """
-        # TODO BATTLECRUISER doesnt have weapons in proto?!
-        return bool(self._weapons) or self.type_id in {UNIT_BATTLECRUISER, UNIT_ORACLE}
+        return self._type_values.can_attack_ground or self._type_values.can_attack_air
 
     @property_immutable_cache
     def can_attack_both(self) -> bool:
@@ -218,62 +221,32 @@ class Unit:
     @property_immutable_cache
     def can_attack_ground(self) -> bool:
         """ Checks if the unit can attack ground units. """
-        if self.type_id in {UNIT_BATTLECRUISER, UNIT_ORACLE}:
-            return True
-        if self._weapons:
-            return any(weapon.type in TARGET_GROUND for weapon in self._weapons)
-        return False
+        return self._type_values.can_attack_ground
 
     @property_immutable_cache
     def ground_dps(self) -> float:
         """ Returns the dps against ground units. Does not include upgrades. """
-        if self.can_attack_ground:
-            weapon = next((weapon for weapon in self._weapons if weapon.type in TARGET_GROUND), None)
-            if weapon:
-                return (weapon.damage * weapon.attacks) / weapon.speed
-        return 0
+        return self._type_values.ground_dps
 
     @property_immutable_cache
     def ground_range(self) -> float:
         """ Returns the range against ground units. Does not include upgrades. """
-        if self.type_id == UNIT_ORACLE:
-            return 4
-        if self.type_id == UNIT_BATTLECRUISER:
-            return 6
-        if self.can_attack_ground:
-            weapon = next((weapon for weapon in self._weapons if weapon.type in TARGET_GROUND), None)
-            if weapon:
-                return weapon.range
-        return 0
+        return self._type_values.ground_range
 
     @property_immutable_cache
     def can_attack_air(self) -> bool:
         """ Checks if the unit can air attack at all. Does not include upgrades. """
-        if self.type_id == UNIT_BATTLECRUISER:
-            return True
-        if self._weapons:
-            return any(weapon.type in TARGET_AIR for weapon in self._weapons)
-        return False
+        return self._type_values.can_attack_air
 
     @property_immutable_cache
     def air_dps(self) -> float:
         """ Returns the dps against air units. Does not include upgrades. """
-        if self.can_attack_air:
-            weapon = next((weapon for weapon in self._weapons if weapon.type in TARGET_AIR), None)
-            if weapon:
-                return (weapon.damage * weapon.attacks) / weapon.speed
-        return 0
+        return self._type_values.air_dps
 
     @property_immutable_cache
     def air_range(self) -> float:
         """ Returns the range against air units. Does not include upgrades. """
-        if self.type_id == UNIT_BATTLECRUISER:
-            return 6
-        if self.can_attack_air:
-            weapon = next((weapon for weapon in self._weapons if weapon.type in TARGET_AIR), None)
-            if weapon:
-                return weapon.range
-        return 0
+        return self._type_values.air_range
 
     @property_immutable_cache
     def bonus_damage(self):
@@ -291,19 +264,19 @@ class Unit:
     @property
     def armor(self) -> float:
         """ Returns the armor of the unit. Does not include upgrades """
-        return self._type_data._proto.armor
+        return self._type_values.armor
 
     @property
     def sight_range(self) -> float:
         """ Returns the sight range of the unit. """
-        return self._type_data._proto.sight_range
+        return self._type_values.sight_range
 
     @property
     def movement_speed(self) -> float:
         """ Returns the movement speed of the unit.
         This is the unit movement speed on game speed 'normal'. To convert it to 'faster' movement speed, multiply it by a factor of '1.4'. E.g. reaper movement speed is listed here as 3.75, but should actually be 5.25.
         Does not include upgrades or buffs. """
-        return self._type_data._proto.movement_speed
+        return self._type_values.movement_speed
 
     @property
     def real_speed(self) -> float:
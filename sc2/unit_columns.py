@@ -0,0 +1,117 @@
+from __future__ import annotations
+from typing import Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .constants import IS_SNAPSHOT
+from .ids.buff_id import BuffId
+
+if TYPE_CHECKING:
+    from .unit import Unit
+
+# Units objects smaller than this are filtered in python, numpy overhead is larger than the gain for tiny groups
+VECTORIZE_MIN_UNITS: int = 16
+
+# Bits of the UnitColumns.flags column
+FLAG_FLYING: int = 1
+FLAG_BURROWED: int = 2
+FLAG_HALLUCINATION: int = 4
+FLAG_STRUCTURE: int = 8
+FLAG_SNAPSHOT: int = 16
+
+GRAVITON_BEAM: int = BuffId.GRAVITONBEAM.value
+
+
+class UnitColumns:
+    """ Struct-of-arrays snapshot of all units in one observation.
+    Row i holds the data of the unit with distance_calculation_index i, so it lines up with BotAI.all_units
+    and the distance matrix in distances.py.
+
+    Example::
+
+        columns = self.unit_columns
+        enemy_rows = np.flatnonzero(columns.alliance == 4)
+        total_enemy_health = columns.health[enemy_rows].sum()
+    """
+
+    def __init__(self, game_loop: int, tags: List[int], rows: List[Tuple[float, ...]]):
+        """
+        :param game_loop:
+        :param tags:
+        :param rows: One tuple per unit in the order of the columns below, see UnitColumns.row
+        """
+        self.game_loop: int = game_loop
+        self.tag: np.ndarray = np.array(tags, dtype=np.uint64)
+        data = np.array(rows, dtype=float).reshape((-1, 12))
+        self.type_id: np.ndarray = data[:, 0].astype(np.int32)
+        self.alliance: np.ndarray = data[:, 1].astype(np.int8)
+        self.flags: np.ndarray = data[:, 2].astype(np.int32)
+        # Positions as (n, 2) array, x and y are views into it
+        self.positions: np.ndarray = np.ascontiguousarray(data[:, 3:5])
+        self.x: np.ndarray = self.positions[:, 0]
+        self.y: np.ndarray = self.positions[:, 1]
+        self.z: np.ndarray = data[:, 5]
+        self.health: np.ndarray = data[:, 6]
+        self.shield: np.ndarray = data[:, 7]
+        self.energy: np.ndarray = data[:, 8]
+        self.weapon_cooldown: np.ndarray = data[:, 9]
+        self.build_progress: np.ndarray = data[:, 10]
+        self.radius: np.ndarray = data[:, 11]
+
+    @staticmethod
+    def row(proto, is_structure: bool) -> Tuple[float, ...]:
+        """ Converts a raw unit proto to a row of the column arrays.
+
+        :param proto:
+        :param is_structure: """
+        flags = 0
+        if proto.is_flying or GRAVITON_BEAM in proto.buff_ids:
+            flags |= FLAG_FLYING
+        if proto.is_burrowed:
+            flags |= FLAG_BURROWED
+        if proto.is_hallucination:
+            flags |= FLAG_HALLUCINATION
+        if is_structure:
+            flags |= FLAG_STRUCTURE
+        if proto.display_type == IS_SNAPSHOT:
+            flags |= FLAG_SNAPSHOT
+        pos = proto.pos
+        return (
+            proto.unit_type,
+            proto.alliance,
+            flags,
+            pos.x,
+            pos.y,
+            pos.z,
+            proto.health,
+            proto.shield,
+            proto.energy,
+            proto.weapon_cooldown,
+            proto.build_progress,
+            proto.radius,
+        )
+
+    def __len__(self) -> int:
+        return len(self.tag)
+
+    def has_flag(self, flag: int) -> np.ndarray:
+        """ Boolean mask of all rows that have the flag set.
+
+        :param flag: """
+        return (self.flags & flag) != 0
+
+    def rows_of(self, units: Iterable[Unit], amount: int) -> Optional[np.ndarray]:
+        """ Returns the row indices of the given units, or None if any of the units is not from this observation (e.g. memory units).
+
+        :param units:
+        :param amount: """
+        game_loop = self.game_loop
+        rows = np.fromiter(
+            (unit.distance_calculation_index if unit.game_loop == game_loop else -1 for unit in units),
+            dtype=np.int64,
+            count=amount,
+        )
+        if amount and rows.min() < 0:
+            return None
+        return rows
+
@@ -2,12 +2,18 @@ from __future__ import annotations
 import random
 import warnings
 import math
-from itertools import chain
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union, Generator, TYPE_CHECKING
+from itertools import chain, compress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union, Generator, TYPE_CHECKING
 
 from .ids.unit_typeid import UnitTypeId
 from .position import Point2, Point3
 from .unit import Unit
+from .unit_columns import (
+    UnitColumns,
+    VECTORIZE_MIN_UNITS,
+    FLAG_FLYING,
+    FLAG_STRUCTURE,
+)
 import numpy as np
 
 warnings.simplefilter("once")
@@ -158,6 +164,16 @@ class Units(list):
 
         :param unit:
         :param bonus_distance: """
+        distances_squared = self._distances_squared_to(unit)
+        if distances_squared is not None:
+            columns, rows = self._columns_and_rows()
+            flying = columns.has_flag(FLAG_FLYING)[rows]
+            attack_ground = unit.can_attack_ground & ~flying
+            attack_air = unit.can_attack_air & (flying | (columns.type_id[rows] == UnitTypeId.COLOSSUS.value))
+            attack_range = np.where(attack_ground, unit.ground_range, unit.air_range)
+            max_distance = unit.radius + columns.radius[rows] + attack_range + bonus_distance
+            in_range = (attack_ground | attack_air) & (distances_squared <= max_distance * max_distance)
+            return self.subgroup(compress(self, in_range))
         return self.filter(lambda x: unit.target_in_range(x, bonus_distance=bonus_distance))
 
     def closest_distance_to(self, position: Union[Unit, Point2, Point3]) -> float:
@@ -174,6 +190,9 @@ class Units(list):
 
         :param position: """
         assert self, "Units object is empty"
+        distances_squared = self._distances_squared_to(position)
+        if distances_squared is not None:
+            return float(distances_squared.min()) ** 0.5
         if isinstance(position, Unit):
             return min(self._bot_object._distance_squared_unit_to_unit(unit, position) for unit in self) ** 0.5
         return min(self._bot_object._distance_units_to_pos(self, position))
@@ -193,6 +212,9 @@ class Units(list):
 
         :param position: """
         assert self, "Units object is empty"
+        distances_squared = self._distances_squared_to(position)
+        if distances_squared is not None:
+            return float(distances_squared.max()) ** 0.5
         if isinstance(position, Unit):
             return max(self._bot_object._distance_squared_unit_to_unit(unit, position) for unit in self) ** 0.5
         return max(self._bot_object._distance_units_to_pos(self, position))
@@ -211,6 +233,9 @@ class Units(list):
 
         :param position: """
         assert self, "Units object is empty"
+        distances_squared = self._distances_squared_to(position)
+        if distances_squared is not None:
+            return self[int(distances_squared.argmin())]
         if isinstance(position, Unit):
             return min(
                 (unit1 for unit1 in self),
@@ -234,6 +259,9 @@ class Units(list):
 
         :param position: """
         assert self, "Units object is empty"
+        distances_squared = self._distances_squared_to(position)
+        if distances_squared is not None:
+            return self[int(distances_squared.argmax())]
         if isinstance(position, Unit):
             return max(
                 (unit1 for unit1 in self),
@@ -259,6 +287,9 @@ class Units(list):
         """
         if not self:
             return self
+        distances_squared = self._distances_squared_to(position)
+        if distances_squared is not None:
+            return self.subgroup(compress(self, distances_squared < distance ** 2))
         if isinstance(position, Unit):
             distance_squared = distance ** 2
             return self.subgroup(
@@ -286,6 +317,9 @@ class Units(list):
         """
         if not self:
             return self
+        distances_squared = self._distances_squared_to(position)
+        if distances_squared is not None:
+            return self.subgroup(compress(self, distance ** 2 < distances_squared))
         if isinstance(position, Unit):
             distance_squared = distance ** 2
             return self.subgroup(
@@ -316,6 +350,11 @@ class Units(list):
         """
         if not self:
             return self
+        distances_squared = self._distances_squared_to(position)
+        if distances_squared is not None:
+            return self.subgroup(
+                compress(self, (distance1 ** 2 < distances_squared) & (distances_squared < distance2 ** 2))
+            )
         if isinstance(position, Unit):
             distance1_squared = distance1 ** 2
             distance2_squared = distance2 ** 2
@@ -378,6 +417,9 @@ class Units(list):
         if not self:
             return self
         distance_squared = distance ** 2
+        distances_squared = self._distances_squared_to_group(other_units)
+        if distances_squared is not None:
+            return self.subgroup(compress(self, (distances_squared < distance_squared).any(axis=1)))
         if len(self) == 1:
             if any(
                 self._bot_object._distance_squared_unit_to_unit(self[0], target) < distance_squared
@@ -405,6 +447,9 @@ class Units(list):
         :param other_units: """
         assert self, "Units object is empty"
         assert other_units, "Given units object is empty"
+        distances_squared = self._distances_squared_to_group(other_units)
+        if distances_squared is not None:
+            return self[int(distances_squared.min(axis=1).argmin())]
         return min(
             self,
             key=lambda self_unit: min(
@@ -465,11 +510,89 @@ class Units(list):
         assert callable(pred), "Function is not callable"
         return self.subgroup(filter(pred, self))
 
+    def _columns_and_rows(self, minimum_amount: int = VECTORIZE_MIN_UNITS) -> Tuple[Optional[UnitColumns], Optional[np.ndarray]]:
+        """
+        Returns the unit columns of the current observation and the rows of these units in it, see unit_columns.py
+        Returns (None, None) if there are fewer units than minimum_amount or if the units can not be found in the columns (e.g. memory units),
+        the caller then has to fall back to python.
+
+        :param minimum_amount:
+        """
+        amount = len(self)
+        if amount < minimum_amount:
+            return None, None
+        columns: UnitColumns = getattr(self._bot_object, "unit_columns", None)
+        if columns is None:
+            return None, None
+        rows = columns.rows_of(self, amount)
+        if rows is None:
+            return None, None
+        return columns, rows
+
+    def _filter_columns(self, column_mask: Callable[[UnitColumns], np.ndarray]) -> Optional[Units]:
+        """
+        Filters the units with a boolean mask over the unit columns of the current observation.
+        Returns None if the units can not be filtered this way, see _columns_and_rows.
+
+        :param column_mask: Function that returns a boolean mask over all rows of the columns
+        """
+        columns, rows = self._columns_and_rows()
+        if columns is None:
+            return None
+        return self.subgroup(compress(self, column_mask(columns)[rows]))
+
+    def _distances_squared_to(self, position: Union[Unit, Point2, Point3, np.ndarray]) -> Optional[np.ndarray]:
+        """
+        Returns the squared distances of these units to the unit or position as numpy array, in the order of this Units object.
+        Reads the per frame distance matrix if the bot calculates one, otherwise the unit column positions.
+        Returns None for small or memory unit groups, the caller then has to calculate in python.
+
+        :param position:
+        """
+        columns, rows = self._columns_and_rows()
+        if columns is None:
+            return None
+        if isinstance(position, Unit):
+            if (
+                position.game_loop == columns.game_loop
+                and position.distance_calculation_index >= 0
+                and getattr(self._bot_object, "distance_calculation_method", 0) in {2, 3}
+            ):
+                return self._bot_object._cdist[rows, position.distance_calculation_index]
+            position = position.position_tuple
+        difference = columns.positions[rows] - (position[0], position[1])
+        return np.einsum("ij,ij->i", difference, difference)
+
+    def _distances_squared_to_group(self, other_units: Units) -> Optional[np.ndarray]:
+        """
+        Returns the squared distances between these units (rows) and other_units (columns) as 2d numpy array.
+        Returns None if either group can not be looked up from the unit columns or both groups are small.
+
+        :param other_units:
+        """
+        if len(self) < VECTORIZE_MIN_UNITS and len(other_units) < VECTORIZE_MIN_UNITS:
+            return None
+        columns, rows = self._columns_and_rows(minimum_amount=1)
+        if columns is None:
+            return None
+        other_columns, other_rows = other_units._columns_and_rows(minimum_amount=1)
+        if other_columns is not columns:
+            return None
+        if getattr(self._bot_object, "distance_calculation_method", 0) in {2, 3}:
+            return self._bot_object._cdist[np.ix_(rows, other_rows)]
+        difference = columns.positions[rows, np.newaxis, :] - columns.positions[np.newaxis, other_rows, :]
+        return np.einsum("ijk,ijk->ij", difference, difference)
+
     def sorted(self, key: callable, reverse: bool = False) -> Units:
         return self.subgroup(sorted(self, key=key, reverse=reverse))
 
     def _list_sorted_by_distance_to(self, position: Union[Unit, Point2], reverse: bool = False) -> List[Unit]:
         """ This function should be a bit faster than using units.sorted(key=lambda u: u.distance_to(position)) """
+        distances_squared = self._distances_squared_to(position)
+        if distances_squared is not None:
+            if reverse:
+                distances_squared = -distances_squared
+            return [self[index] for index in np.argsort(distances_squared, kind="stable")]
         if isinstance(position, Unit):
             return sorted(
                 self, key=lambda unit: self._bot_object._distance_squared_unit_to_unit(unit, position), reverse=reverse
@@ -525,6 +648,9 @@ class Units(list):
             other = {other}
         elif isinstance(other, list):
             other = set(other)
+        filtered = self._filter_columns(lambda columns: np.isin(columns.type_id, [t.value for t in other]))
+        if filtered is not None:
+            return filtered
         return self.filter(lambda unit: unit.type_id in other)
 
     def exclude_type(self, other: Union[UnitTypeId, Set[UnitTypeId], List[UnitTypeId], Dict[UnitTypeId, Any]]) -> Units:
@@ -541,6 +667,11 @@ class Units(list):
             other = {other}
         elif isinstance(other, list):
             other = set(other)
+        filtered = self._filter_columns(
+            lambda columns: np.isin(columns.type_id, [t.value for t in other], invert=True)
+        )
+        if filtered is not None:
+            return filtered
         return self.filter(lambda unit: unit.type_id not in other)
 
     def same_tech(self, other: Set[UnitTypeId]) -> Units:
@@ -619,6 +750,12 @@ class Units(list):
         """ Returns the central position of all units. """
         assert self, f"Units object is empty"
         amount = self.amount
+        if amount >= VECTORIZE_MIN_UNITS:
+            columns: UnitColumns = getattr(self._bot_object, "unit_columns", None)
+            rows = columns.rows_of(self, amount) if columns is not None else None
+            if rows is not None:
+                center_x, center_y = columns.positions[rows].mean(axis=0)
+                return Point2((float(center_x), float(center_y)))
         return Point2(
             (sum(unit._proto.pos.x for unit in self) / amount, sum(unit._proto.pos.y for unit in self) / amount,)
         )
@@ -636,11 +773,17 @@ class Units(list):
     @property
     def ready(self) -> Units:
         """ Returns all structures that are ready (construction complete). """
+        filtered = self._filter_columns(lambda columns: columns.build_progress == 1)
+        if filtered is not None:
+            return filtered
         return self.filter(lambda unit: unit.is_ready)
 
     @property
     def not_ready(self) -> Units:
         """ Returns all structures that are not ready (construction not complete). """
+        filtered = self._filter_columns(lambda columns: columns.build_progress != 1)
+        if filtered is not None:
+            return filtered
         return self.filter(lambda unit: not unit.is_ready)
 
     @property
@@ -661,21 +804,33 @@ class Units(list):
     @property
     def flying(self) -> Units:
         """ Returns all units that are flying. """
+        filtered = self._filter_columns(lambda columns: columns.has_flag(FLAG_FLYING))
+        if filtered is not None:
+            return filtered
         return self.filter(lambda unit: unit.is_flying)
 
     @property
     def not_flying(self) -> Units:
         """ Returns all units that not are flying. """
+        filtered = self._filter_columns(lambda columns: ~columns.has_flag(FLAG_FLYING))
+        if filtered is not None:
+            return filtered
         return self.filter(lambda unit: not unit.is_flying)
 
     @property
     def structure(self) -> Units:
         """ Deprecated: All structures. """
+        filtered = self._filter_columns(lambda columns: columns.has_flag(FLAG_STRUCTURE))
+        if filtered is not None:
+            return filtered
         return self.filter(lambda unit: unit.is_structure)
 
     @property
     def not_structure(self) -> Units:
         """ Deprecated: All units that are not structures. """
+        filtered = self._filter_columns(lambda columns: ~columns.has_flag(FLAG_STRUCTURE))
+        if filtered is not None:
+            return filtered
         return self.filter(lambda unit: not unit.is_structure)
 
     @property
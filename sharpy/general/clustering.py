@@ -0,0 +1,46 @@
+from itertools import chain
+from typing import List
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial.ckdtree import cKDTree
+
+import sc2
+from sc2.grouping import label_indices
+from sc2.units import Units
+
+
+def unit_positions(ai: sc2.BotAI, units: Units) -> np.ndarray:
+    """Positions of the units as (n, 2) array, taken from the unit columns of the frame when possible."""
+    count = len(units)
+    columns = getattr(ai, "unit_columns", None)
+    rows = columns.rows_of(units, count) if columns is not None else None
+    if rows is not None:
+        return columns.positions[rows]
+    flat = np.fromiter(chain.from_iterable(unit.position_tuple for unit in units), dtype=float, count=2 * count)
+    return flat.reshape((count, 2))
+
+
+def cluster_labels(positions: np.ndarray, eps: float) -> np.ndarray:
+    """
+    Labels positions so that positions within eps of each other have the same label.
+
+    Same result as sklearn DBSCAN with min_samples=1: clusters are the connected components of the graph of close
+    pairs and labels are numbered in the order of the first position of each cluster.
+
+    :param positions: Positions as (n, 2) array
+    :param eps: Maximum distance between two positions of the same cluster
+    """
+    count = len(positions)
+    if count < 2:
+        return np.zeros(count, dtype=np.int32)
+    pairs = cKDTree(positions).query_pairs(eps, output_type="ndarray")
+    graph = coo_matrix((np.ones(len(pairs), dtype=bool), (pairs[:, 0], pairs[:, 1])), shape=(count, count))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def cluster_indices(positions: np.ndarray, eps: float) -> List[np.ndarray]:
+    """Returns the indices of the positions in each cluster of cluster_labels, in label order."""
+    return label_indices(cluster_labels(positions, eps))
@@ -0,0 +1,20 @@
+import numpy as np
+
+from .clustering import cluster_indices, cluster_labels
+
+
+class TestClustering:
+    def test_chained_positions_are_one_cluster(self):
+        positions = np.array([(0, 0), (6, 0), (12, 0), (40, 40)], dtype=float)
+
+        assert cluster_labels(positions, 7).tolist() == [0, 0, 0, 1]
+
+    def test_labels_follow_first_position_of_cluster(self):
+        positions = np.array([(50, 50), (0, 0), (51, 50), (1, 0)], dtype=float)
+
+        assert cluster_labels(positions, 7).tolist() == [0, 1, 0, 1]
+        assert [indices.tolist() for indices in cluster_indices(positions, 7)] == [[0, 2], [1, 3]]
+
+    def test_empty_and_single_positions(self):
+        assert cluster_indices(np.zeros((0, 2)), 7) == []
+        assert [indices.tolist() for indices in cluster_indices(np.array([(3.0, 4.0)]), 7)] == [[0]]
@@ -0,0 +1,170 @@
+from collections import Counter
+from math import ceil, floor, sqrt
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+# Layer names
+GROUND = "ground"
+AIR = "air"
+DETECTION = "detection"
+SPLASH_GROUND = "splash_ground"
+SPLASH_AIR = "splash_air"
+
+LAYERS = (GROUND, AIR, DETECTION, SPLASH_GROUND, SPLASH_AIR)
+
+# Area of the grid as x_start, y_start, x_end, y_end with exclusive end
+Region = Tuple[int, int, int, int]
+# Influence source as cell x, cell y, value, distance, flat
+Source = Tuple[int, int, float, float, bool]
+
+_falloff_cache: Dict[Tuple[float, bool], np.ndarray] = {}
+_stamp_cache: Dict[Tuple[float, float, bool], np.ndarray] = {}
+
+
+def _falloff(distance: float, flat: bool) -> np.ndarray:
+    """
+    Multiplier for every cell around the center cell, using octile distance like sc2pathlib does.
+    Array has size (2 * r + 1, 2 * r + 1) with the source cell in the middle.
+    """
+    key = (distance, flat)
+    falloff = _falloff_cache.get(key, None)
+    if falloff is None:
+        r = max(0, ceil(distance) - 1)
+        # Single precision to round the same way as sc2pathlib
+        offsets = np.abs(np.arange(-r, r + 1, dtype=np.float32))
+        dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+        octile = np.maximum(dx, dy) + np.float32(sqrt(2) - 1) * np.minimum(dx, dy)
+        inside = octile < distance
+        if flat:
+            falloff = inside.astype(np.float32)
+        else:
+            falloff = np.where(inside, 1 - octile * np.float32(1 / distance), 0).astype(np.float32)
+        _falloff_cache[key] = falloff
+    return falloff
+
+
+def influence_stamp(value: float, distance: float, flat: bool = False) -> np.ndarray:
+    """Precomputed integer influence around a single source, values are floored per source like in sc2pathlib."""
+    key = (value, distance, flat)
+    stamp = _stamp_cache.get(key, None)
+    if stamp is None:
+        stamp = np.floor(np.float32(value) * _falloff(distance, flat)).astype(np.int64)
+        _stamp_cache[key] = stamp
+    return stamp
+
+
+def merge_regions(region1: Optional[Region], region2: Optional[Region]) -> Optional[Region]:
+    if region1 is None:
+        return region2
+    if region2 is None:
+        return region1
+    return (
+        min(region1[0], region2[0]),
+        min(region1[1], region2[1]),
+        max(region1[2], region2[2]),
+        max(region1[3], region2[3]),
+    )
+
+
+class InfluenceLayer:
+    """
+    Accumulated influence of all sources added in the current frame.
+
+    Sources are compared to the previous frame, so only sources that appeared or disappeared are stamped
+    and the changed area is reported as dirty region.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.values = np.zeros((width, height), dtype=np.int64)
+        self.dirty: Optional[Region] = None
+        self._sources: Counter = Counter()
+        self._pending: Counter = Counter()
+
+    def add(self, points: Iterable[Tuple[float, float]], value: float, distance: float, flat: bool = False):
+        pending = self._pending
+        for point in points:
+            pending[(floor(point[0]), floor(point[1]), value, distance, flat)] += 1
+
+    def commit(self) -> Optional[Region]:
+        """Applies the sources added since the last commit and returns the region that changed, if any."""
+        added = self._pending - self._sources
+        removed = self._sources - self._pending
+        self._sources = self._pending
+        self._pending = Counter()
+        self.dirty = None
+
+        for source, count in removed.items():
+            self._stamp(source, -count)
+        for source, count in added.items():
+            self._stamp(source, count)
+        return self.dirty
+
+    def _stamp(self, source: Source, multiplier: int):
+        x, y, value, distance, flat = source
+        stamp = influence_stamp(value, distance, flat)
+        r = stamp.shape[0] // 2
+        x0 = max(0, x - r)
+        y0 = max(0, y - r)
+        x1 = min(self.width, x + r + 1)
+        y1 = min(self.height, y + r + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        sx = x0 - (x - r)
+        sy = y0 - (y - r)
+        self.values[x0:x1, y0:y1] += multiplier * stamp[sx : sx + x1 - x0, sy : sy + y1 - y0]
+        self.dirty = merge_regions(self.dirty, (x0, y0, x1, y1))
+
+
+class InfluenceEngine:
+    """
+    Numpy influence layers that are combined into pathing grids.
+
+    Usage each frame: add sources with add(), call commit() and then compose() the grids for path finders
+    that need to be updated. Layers are indexed [x][y] like sc2pathlib maps.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.layers: Dict[str, InfluenceLayer] = {name: InfluenceLayer(width, height) for name in LAYERS}
+
+    def add(
+        self, layer: str, points: Iterable[Tuple[float, float]], value: float, distance: float, flat: bool = False
+    ):
+        self.layers[layer].add(points, value, distance, flat)
+
+    def commit(self) -> Dict[str, Optional[Region]]:
+        """Applies sources of all layers, returns dirty region by layer name."""
+        return {name: layer.commit() for name, layer in self.layers.items()}
+
+    def compose(
+        self, base: np.ndarray, layer_names: Iterable[str], out: np.ndarray, region: Optional[Region] = None
+    ) -> np.ndarray:
+        """
+        Writes base + influence of the layers into out, cells that are not pathable in base stay 0.
+
+        :param base: Normalized pathing grid where 0 means blocked
+        :param layer_names: Layers to sum
+        :param out: Target grid, only the region is written when region is set
+        :param region: Dirty region, defaults to whole grid
+        """
+        if region is None:
+            region = (0, 0, self.width, self.height)
+        x0, y0, x1, y1 = region
+        base_part = base[x0:x1, y0:y1]
+        total = base_part.copy()
+        for name in layer_names:
+            total += self.layers[name].values[x0:x1, y0:y1]
+        np.maximum(total, 0, out=total)
+        out[x0:x1, y0:y1] = np.where(base_part > 0, total, 0)
+        return out
+
+    def value_at(self, layer: str, position: Tuple[float, float]) -> int:
+        x = floor(position[0])
+        y = floor(position[1])
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return int(self.layers[layer].values[x, y])
+        return 0
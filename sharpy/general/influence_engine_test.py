@@ -0,0 +1,43 @@
+import numpy as np
+
+from .influence_engine import InfluenceEngine, influence_stamp, GROUND, AIR
+
+
+class TestInfluenceEngine:
+    def test_stamp_uses_octile_distance_falloff(self):
+        stamp = influence_stamp(100, 5)
+
+        assert stamp.shape == (9, 9)
+        assert stamp[4, 4] == 100
+        assert stamp[4, 5] == 80
+        assert stamp[5, 5] == 71
+        assert stamp[0, 0] == 0
+
+    def test_commit_reports_dirty_region_of_changed_sources_only(self):
+        engine = InfluenceEngine(30, 30)
+        engine.add(GROUND, [(10.5, 10.5)], 100, 3)
+        dirty = engine.commit()
+        assert dirty[GROUND] == (8, 8, 13, 13)
+        assert dirty[AIR] is None
+
+        engine.add(GROUND, [(10.5, 10.5)], 100, 3)
+        assert engine.commit()[GROUND] is None
+
+        engine.add(GROUND, [(20.5, 10.5)], 100, 3)
+        assert engine.commit()[GROUND] == (8, 8, 23, 13)
+        assert engine.layers[GROUND].values[10, 10] == 0
+        assert engine.layers[GROUND].values[20, 10] == 100
+
+    def test_compose_keeps_blocked_cells(self):
+        engine = InfluenceEngine(10, 10)
+        base = np.full((10, 10), 20, dtype=np.int64)
+        base[5, 5] = 0
+        engine.add(GROUND, [(5, 4), (0, 0)], 50, 2)
+        engine.commit()
+
+        grid = engine.compose(base, (GROUND,), np.zeros_like(base))
+
+        assert grid[5, 5] == 0
+        assert grid[5, 4] == 70
+        assert grid[0, 0] == 70
+        assert grid[9, 9] == 20
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from math import floor
+from typing import Dict, List, Optional, Tuple
+
+# Path finder layers
+TERRAIN = "terrain"
+GROUND = "ground"
+GROUND_INFLUENCE = "ground_influence"
+AIR_INFLUENCE = "air_influence"
+
+PathResult = Tuple[List[Tuple[int, int]], float]
+
+
+class PathCache:
+    """
+    LRU cache for path finder results.
+
+    Results are keyed by layer, the epoch of the layer, start cell and goal cell. The epoch is increased when
+    the grid of the layer changes, stale paths are never hit again and fall out of the cache as least recently used.
+    """
+
+    def __init__(self, max_size: int = 512, cell_size: int = 1):
+        """
+        :param max_size: Maximum number of cached paths
+        :param cell_size: Size of the start and goal cells, paths are calculated from the
+            same cells sc2pathlib uses with 1, larger values share paths between nearby queries
+        """
+        self.max_size = max_size
+        self.cell_size = cell_size
+        self.hits = 0
+        self.misses = 0
+        self.epochs: Dict[str, int] = {TERRAIN: 0, GROUND: 0, GROUND_INFLUENCE: 0, AIR_INFLUENCE: 0}
+        self._paths: "OrderedDict[tuple, PathResult]" = OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0
+        return self.hits / total
+
+    def key(self, layer: str, start: Tuple[float, float], goal: Tuple[float, float]) -> tuple:
+        cell_size = self.cell_size
+        return (
+            layer,
+            self.epochs[layer],
+            floor(start[0] / cell_size),
+            floor(start[1] / cell_size),
+            floor(goal[0] / cell_size),
+            floor(goal[1] / cell_size),
+        )
+
+    def get(self, key: tuple) -> Optional[PathResult]:
+        result = self._paths.get(key, None)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._paths.move_to_end(key)
+        return result
+
+    def put(self, key: tuple, result: PathResult):
+        self._paths[key] = result
+        self._paths.move_to_end(key)
+        if len(self._paths) > self.max_size:
+            self._paths.popitem(last=False)
+
+    def invalidate(self, layer: str):
+        """Called when the grid of the layer changes."""
+        self.epochs[layer] += 1
+
+    def clear(self):
+        for layer in self.epochs:
+            self.epochs[layer] += 1
+        self._paths.clear()
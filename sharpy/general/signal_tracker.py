@@ -0,0 +1,150 @@
+import enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from sc2 import UnitTypeId
+from sc2.constants import EQUIVALENTS_FOR_TECH_PROGRESS
+
+if TYPE_CHECKING:
+    from sharpy.knowledges import Knowledge
+    from sharpy.plans.acts import ActBase
+    from sharpy.plans.require import RequireBase
+
+
+class SignalKind(enum.Enum):
+    # Amount, ready count and build progress of own units of the type
+    Units = 0
+    # Pending count of own units of the type
+    Pending = 1
+    # Lost own units of the type
+    Killed = 2
+    # Used, worker, free supply and supply cap
+    Supply = 3
+    Minerals = 4
+    Gas = 5
+    # Research progress of the upgrade
+    Upgrade = 6
+    # Whether the game time has passed the argument in seconds
+    TimePassed = 7
+    # Known enemy units of the type
+    EnemyUnits = 8
+
+
+# Kind of the signal and its argument, such as (SignalKind.Units, UnitTypeId.PYLON)
+Signal = Tuple[SignalKind, Any]
+
+_missing = object()
+
+
+def unit_type_signals(kind: SignalKind, unit_type: UnitTypeId) -> List[Signal]:
+    """Signals of the kind for the unit type and its equivalent types, such as warp gates for gateways."""
+    signals = [(kind, unit_type)]
+    for related_type in EQUIVALENTS_FOR_TECH_PROGRESS.get(unit_type, ()):
+        signals.append((kind, related_type))
+    return signals
+
+
+def merge_signals(acts: Iterable[Optional["ActBase"]]) -> Optional[List[Signal]]:
+    """Signals of all of the acts, None if any of them does not declare its signals. Missing acts are ignored."""
+    merged: List[Signal] = []
+    for act in acts:
+        if act is None:
+            continue
+        signals = act.signals()
+        if signals is None:
+            return None
+        for signal in signals:
+            if signal not in merged:
+                merged.append(signal)
+    return merged
+
+
+class SignalTracker:
+    """
+    Skips evaluation of plan subtrees when nothing they depend on has changed, see ActBase.signals.
+
+    Acts and requirements without side effects declare the signals their result depends on, such as own unit counts,
+    supply or resources. Values of the signals are read once per frame. The act is only executed again when one of
+    the values differs from its last execution, otherwise its last result is returned. Acts that do not declare
+    signals are always executed. Tracking is disabled unless track_requirements is set in the general config section.
+    """
+
+    def __init__(self, knowledge: "Knowledge", enabled: bool = False):
+        self.knowledge = knowledge
+        self.ai = knowledge.ai
+        self.enabled = enabled
+        self.skipped = 0
+        self._game_loop = -1
+        self._values: Dict[Signal, Any] = {}
+        self._signals: Dict[int, Optional[Tuple[Signal, ...]]] = {}
+        self._results: Dict[int, Tuple[tuple, bool]] = {}
+
+    def value(self, signal: Signal) -> Any:
+        """Value of the signal on the current frame."""
+        game_loop = self.ai.state.game_loop
+        if game_loop != self._game_loop:
+            self._game_loop = game_loop
+            self._values.clear()
+
+        value = self._values.get(signal, _missing)
+        if value is _missing:
+            value = self._read(signal)
+            self._values[signal] = value
+        return value
+
+    def _read(self, signal: Signal) -> Any:
+        kind, argument = signal
+        ai = self.ai
+        if kind == SignalKind.Units:
+            counts = self.knowledge.unit_cache.counts
+            return counts.amount(argument), counts.ready(argument), counts.progress(argument)
+        if kind == SignalKind.Pending:
+            return self.knowledge.unit_cache.counts.pending(argument)
+        if kind == SignalKind.Killed:
+            return self.knowledge.unit_cache.counts.killed(argument)
+        if kind == SignalKind.Supply:
+            return ai.supply_used, ai.supply_workers, ai.supply_left, ai.supply_cap
+        if kind == SignalKind.Minerals:
+            return ai.minerals
+        if kind == SignalKind.Gas:
+            return ai.vespene
+        if kind == SignalKind.Upgrade:
+            return ai.already_pending_upgrade(argument)
+        if kind == SignalKind.TimePassed:
+            return ai.time > argument
+        if kind == SignalKind.EnemyUnits:
+            return self.knowledge.enemy_units_manager.unit_count(argument)
+        raise ValueError(f"Unknown signal {signal}")
+
+    def signals_of(self, act: "ActBase") -> Optional[Tuple[Signal, ...]]:
+        """Signals of the act, the plan tree does not change after start so they are only asked once."""
+        key = id(act)
+        if key not in self._signals:
+            signals = act.signals()
+            self._signals[key] = None if signals is None else tuple(signals)
+        return self._signals[key]
+
+    def last_result(self, act: "ActBase") -> Optional[bool]:
+        """Last result of the act if none of its signals have changed since then, None if it has to be executed."""
+        signals = self.signals_of(act)
+        if signals is None:
+            return None
+        last = self._results.get(id(act), None)
+        if last is None or last[0] != tuple(self.value(signal) for signal in signals):
+            return None
+        self.skipped += 1
+        return last[1]
+
+    def set_result(self, act: "ActBase", result: bool):
+        signals = self.signals_of(act)
+        if signals is not None:
+            self._results[id(act)] = (tuple(self.value(signal) for signal in signals), result)
+
+    def check(self, requirement: "RequireBase") -> bool:
+        """Same as requirement.check, skipped when the signals of the requirement have not changed."""
+        if not self.enabled:
+            return requirement.check()
+        result = self.last_result(requirement)
+        if result is None:
+            result = requirement.check()
+            self.set_result(requirement, result)
+        return result
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from .signal_tracker import SignalKind, SignalTracker, merge_signals
+
+
+class Requirement:
+    def __init__(self, signals):
+        self._signals = signals
+        self.checks = 0
+
+    def signals(self):
+        return self._signals
+
+    def check(self) -> bool:
+        self.checks += 1
+        return True
+
+
+def create_tracker() -> SignalTracker:
+    knowledge = mock.Mock()
+    knowledge.ai.state.game_loop = 0
+    knowledge.ai.minerals = 50
+    return SignalTracker(knowledge, enabled=True)
+
+
+class TestSignalTracker:
+    def test_check_is_skipped_until_signal_changes(self):
+        tracker = create_tracker()
+        requirement = Requirement([(SignalKind.Minerals, None)])
+
+        assert tracker.check(requirement)
+        tracker.ai.state.game_loop = 1
+        assert tracker.check(requirement)
+        assert requirement.checks == 1
+
+        tracker.ai.state.game_loop = 2
+        tracker.ai.minerals = 100
+        assert tracker.check(requirement)
+        assert requirement.checks == 2
+
+    def test_requirement_without_signals_is_always_checked(self):
+        tracker = create_tracker()
+        requirement = Requirement(None)
+
+        tracker.check(requirement)
+        tracker.check(requirement)
+        assert requirement.checks == 2
+
+    def test_merge_signals(self):
+        minerals = Requirement([(SignalKind.Minerals, None)])
+        gas = Requirement([(SignalKind.Gas, None), (SignalKind.Minerals, None)])
+
+        assert merge_signals([minerals, None, gas]) == [(SignalKind.Minerals, None), (SignalKind.Gas, None)]
+        assert merge_signals([minerals, Requirement(None)]) is None
@@ -0,0 +1,218 @@
+from itertools import chain, compress
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from scipy.spatial.ckdtree import cKDTree
+
+import sc2
+from sc2 import Race, UnitTypeId
+from sc2.position import Point2
+from sc2.units import Units
+
+Position = Union[Point2, Tuple[float, float]]
+
+
+class SpatialIndex:
+    """
+    Spatial index over a group of units that is refreshed once per frame.
+
+    Positions are written into a preallocated array that only grows, the k-d tree is only rebuilt
+    when the positions have changed since the last frame. Queries can be filtered by type,
+    flying and targetable state, and sub-indexes for unit types or races are built lazily and
+    cached until the next update.
+    """
+
+    def __init__(self, ai: sc2.BotAI, capacity: int = 256):
+        self.ai = ai
+        self.units: Units = Units([], ai)
+        self.count = 0
+        self.tree: Optional[cKDTree] = None
+        self._positions = np.zeros((capacity, 2), dtype=float)
+        self._type_ids = np.zeros(capacity, dtype=np.int32)
+        self._flying: Optional[np.ndarray] = None
+        self._targetable: Optional[np.ndarray] = None
+        self._sub_indexes: Dict[object, "SpatialIndex"] = {}
+        self._race_by_type: Dict[int, Race] = {}
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Positions of the indexed units as (n, 2) array, row i belongs to units[i]."""
+        return self._positions[: self.count]
+
+    @property
+    def type_ids(self) -> np.ndarray:
+        return self._type_ids[: self.count]
+
+    @property
+    def flying(self) -> np.ndarray:
+        """Boolean mask of flying units, calculated on first use each frame."""
+        if self._flying is None:
+            self._flying = np.fromiter((unit.is_flying for unit in self.units), dtype=bool, count=self.count)
+        return self._flying
+
+    @property
+    def targetable(self) -> np.ndarray:
+        """Boolean mask of units that can be attacked (or are snapshots), calculated on first use each frame."""
+        if self._targetable is None:
+            self._targetable = np.fromiter(
+                (unit.can_be_attacked or unit.is_snapshot for unit in self.units), dtype=bool, count=self.count
+            )
+        return self._targetable
+
+    def update(self, units: Units):
+        """Refreshes the index with the current units."""
+        count = len(units)
+        self._reserve(count)
+        self.units = units
+        self.count = count
+        self._flying = None
+        self._targetable = None
+        self._sub_indexes.clear()
+
+        if count == 0:
+            self.tree = None
+            return
+
+        positions = self._positions[:count]
+        columns = getattr(self.ai, "unit_columns", None)
+        rows = columns.rows_of(units, count) if columns is not None else None
+        if rows is not None:
+            np.take(columns.positions, rows, axis=0, out=positions)
+            np.take(columns.type_id, rows, out=self._type_ids[:count])
+        else:
+            positions.reshape(-1)[:] = np.fromiter(
+                chain.from_iterable(unit.position_tuple for unit in units), dtype=float, count=2 * count
+            )
+            self._type_ids[:count] = np.fromiter((unit.type_id.value for unit in units), dtype=np.int32, count=count)
+
+        if self.tree is None or self.tree.n != count or not np.array_equal(self.tree.data, positions):
+            # cKDTree keeps a reference to contiguous input, the buffer is overwritten on the next frame
+            self.tree = cKDTree(positions.copy())
+
+    def _update_subset(self, parent: "SpatialIndex", mask: np.ndarray):
+        units = Units(compress(parent.units, mask), parent.ai)
+        count = len(units)
+        self._reserve(count)
+        self.units = units
+        self.count = count
+        self._positions[:count] = parent.positions[mask]
+        self._type_ids[:count] = parent.type_ids[mask]
+        self._flying = None if parent._flying is None else parent._flying[mask]
+        self._targetable = None if parent._targetable is None else parent._targetable[mask]
+        self._sub_indexes.clear()
+        self.tree = cKDTree(self._positions[:count].copy()) if count > 0 else None
+
+    def _reserve(self, count: int):
+        capacity = len(self._positions)
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        self._positions = np.zeros((capacity, 2), dtype=float)
+        self._type_ids = np.zeros(capacity, dtype=np.int32)
+
+    def of_type(self, type_id: Union[UnitTypeId, Iterable[UnitTypeId]]) -> "SpatialIndex":
+        """Returns a sub-index with only units of the specified type(s)."""
+        if isinstance(type_id, UnitTypeId):
+            key = frozenset((type_id,))
+        else:
+            key = frozenset(type_id)
+        sub_index = self._sub_indexes.get(key, None)
+        if sub_index is None:
+            mask = np.isin(self.type_ids, [single_type.value for single_type in key])
+            sub_index = self._create_subset(key, mask)
+        return sub_index
+
+    def of_race(self, race: Race) -> "SpatialIndex":
+        """Returns a sub-index with only units that belong to the specified race."""
+        sub_index = self._sub_indexes.get(race, None)
+        if sub_index is None:
+            mask = np.fromiter(
+                (self._race_of(type_value) == race for type_value in self.type_ids), dtype=bool, count=self.count
+            )
+            sub_index = self._create_subset(race, mask)
+        return sub_index
+
+    def filtered(self, flying: Optional[bool] = None, targetable: Optional[bool] = None) -> "SpatialIndex":
+        """Returns a sub-index with only units matching the flying and targetable filters."""
+        key = ("filter", flying, targetable)
+        sub_index = self._sub_indexes.get(key, None)
+        if sub_index is None:
+            sub_index = self._create_subset(key, self._filter_mask(flying, targetable))
+        return sub_index
+
+    def _create_subset(self, key: object, mask: Optional[np.ndarray]) -> "SpatialIndex":
+        if mask is None:
+            return self
+        sub_index = SpatialIndex(self.ai, max(1, int(np.count_nonzero(mask))))
+        sub_index._race_by_type = self._race_by_type
+        sub_index._update_subset(self, mask)
+        self._sub_indexes[key] = sub_index
+        return sub_index
+
+    def _race_of(self, type_value: int) -> Race:
+        race = self._race_by_type.get(type_value, None)
+        if race is None:
+            race = self.ai._game_data.units[type_value].race
+            self._race_by_type[type_value] = race
+        return race
+
+    def _filter_mask(self, flying: Optional[bool], targetable: Optional[bool]) -> Optional[np.ndarray]:
+        mask: Optional[np.ndarray] = None
+        if flying is not None:
+            mask = self.flying if flying else ~self.flying
+        if targetable is not None:
+            targetable_mask = self.targetable if targetable else ~self.targetable
+            mask = targetable_mask if mask is None else mask & targetable_mask
+        return mask
+
+    def _to_units(self, indices: Iterable[int], mask: Optional[np.ndarray]) -> Units:
+        all_units = self.units
+        if mask is None:
+            return Units((all_units[index] for index in indices), self.ai)
+        return Units((all_units[index] for index in indices if mask[index]), self.ai)
+
+    def in_range(
+        self, position: Position, distance: float, flying: Optional[bool] = None, targetable: Optional[bool] = None
+    ) -> Units:
+        """Returns all units within distance of the position."""
+        if self.tree is None:
+            return Units([], self.ai)
+        indices = self.tree.query_ball_point((position[0], position[1]), distance)
+        return self._to_units(indices, self._filter_mask(flying, targetable))
+
+    def in_range_batch(
+        self,
+        positions: Union[np.ndarray, List[Position]],
+        distances: Union[float, np.ndarray, List[float]],
+        flying: Optional[bool] = None,
+        targetable: Optional[bool] = None,
+    ) -> List[Units]:
+        """
+        Returns units within distance of each position, all centers are queried from the tree in one call.
+
+        :param positions: Query centers
+        :param distances: Either one distance for all centers or one distance per center
+        """
+        amount = len(positions)
+        if self.tree is None or amount == 0:
+            return [Units([], self.ai) for _ in range(amount)]
+        centers = np.array([(position[0], position[1]) for position in positions], dtype=float)
+        mask = self._filter_mask(flying, targetable)
+        return [
+            self._to_units(indices, mask)
+            for indices in self.tree.query_ball_point(centers, np.asarray(distances, dtype=float))
+        ]
+
+    def closest(
+        self, position: Position, k: int = 1, flying: Optional[bool] = None, targetable: Optional[bool] = None
+    ) -> Units:
+        """Returns up to k units closest to the position, sorted by distance."""
+        index = self.filtered(flying, targetable)
+        if index.tree is None or k < 1:
+            return Units([], self.ai)
+        k = min(k, index.count)
+        _, indices = index.tree.query((position[0], position[1]), k=k)
+        if k == 1:
+            return Units([index.units[int(indices)]], self.ai)
+        return Units((index.units[i] for i in indices), self.ai)
@@ -0,0 +1,84 @@
+from unittest import mock
+
+from sc2 import UnitTypeId
+from sc2.position import Point2
+from sc2.units import Units
+
+from .spatial_index import SpatialIndex
+
+
+def mock_unit(x: float, y: float, type_id: UnitTypeId = UnitTypeId.ZEALOT, flying: bool = False, cloaked=False):
+    unit = mock.Mock()
+    unit.position_tuple = (x, y)
+    unit.type_id = type_id
+    unit.is_flying = flying
+    unit.can_be_attacked = not cloaked
+    unit.is_snapshot = False
+    return unit
+
+
+def create_index(units) -> SpatialIndex:
+    ai = mock.Mock()
+    ai.unit_columns = None
+    index = SpatialIndex(ai, capacity=2)
+    index.update(Units(units, ai))
+    return index
+
+
+class TestSpatialIndex:
+    def test_in_range_returns_units_within_distance(self):
+        near = mock_unit(1, 1)
+        far = mock_unit(10, 10)
+        index = create_index([near, far])
+
+        assert index.in_range(Point2((0, 0)), 2) == [near]
+        assert index.in_range(Point2((0, 0)), 20) == [near, far]
+
+    def test_in_range_filters_flying_and_targetable(self):
+        ground = mock_unit(1, 1)
+        air = mock_unit(1, 2, UnitTypeId.OBSERVER, flying=True, cloaked=True)
+        index = create_index([ground, air])
+
+        assert index.in_range(Point2((0, 0)), 5, flying=False) == [ground]
+        assert index.in_range(Point2((0, 0)), 5, flying=True) == [air]
+        assert index.in_range(Point2((0, 0)), 5, targetable=True) == [ground]
+
+    def test_in_range_batch_matches_single_queries(self):
+        units = [mock_unit(x, x % 3) for x in range(10)]
+        index = create_index(units)
+        centers = [Point2((0, 0)), Point2((5, 1)), Point2((50, 50))]
+
+        result = index.in_range_batch(centers, [2, 3, 1])
+
+        assert result == [index.in_range(center, r) for center, r in zip(centers, [2, 3, 1])]
+
+    def test_closest_returns_sorted_neighbours(self):
+        units = [mock_unit(5, 0), mock_unit(1, 0), mock_unit(3, 0)]
+        index = create_index(units)
+
+        assert index.closest(Point2((0, 0)), 2) == [units[1], units[2]]
+        assert index.closest(Point2((0, 0))) == [units[1]]
+
+    def test_of_type_sub_index(self):
+        zealot = mock_unit(1, 1)
+        stalker = mock_unit(2, 2, UnitTypeId.STALKER)
+        index = create_index([zealot, stalker])
+
+        sub_index = index.of_type(UnitTypeId.STALKER)
+
+        assert sub_index.units == [stalker]
+        assert sub_index.closest(Point2((0, 0))) == [stalker]
+        assert index.of_type(UnitTypeId.STALKER) is sub_index
+
+    def test_update_grows_buffer_and_reuses_tree_when_nothing_moved(self):
+        units = [mock_unit(x, 0) for x in range(5)]
+        index = create_index(units)
+        tree = index.tree
+
+        index.update(Units(units, index.ai))
+        assert index.tree is tree
+
+        units[0].position_tuple = (0, 7)
+        index.update(Units(units, index.ai))
+        assert index.tree is not tree
+        assert index.in_range(Point2((0, 7)), 0.5) == [units[0]]
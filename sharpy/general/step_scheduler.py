@@ -0,0 +1,110 @@
+import enum
+from time import perf_counter
+from typing import Dict, Optional, Set
+
+import sc2
+
+# Used as the step budget in seconds when the game is run without a step time limit
+DEFAULT_STEP_BUDGET = 0.05
+
+
+class StepPriority(enum.IntEnum):
+    # Runs every step
+    Critical = 0
+    # Runs when due, skipped only when the step budget is already spent
+    Normal = 1
+    # Runs when due and there is budget left, spread so that only a few run on the same step
+    Deferrable = 2
+
+
+class StepScheduler:
+    """
+    Cooperative scheduler that decides which managers and acts run on the current step.
+
+    Work is declared with the step_priority and update_interval attributes (interval in game seconds, 0 for every step).
+    Critical work always runs. Other work runs when it is due, deferrable work additionally only when the
+    remaining step budget allows it. After a step that went over budget, deferrable work is skipped until
+    the bot has caught up, but never for longer than max_delay.
+    """
+
+    def __init__(self, ai: sc2.BotAI, max_deferrable_per_step: int = 2, max_delay: float = 5):
+        """
+        :param max_deferrable_per_step: How many deferrable items can run on the same step
+        :param max_delay: Game seconds after which deferred work runs regardless of the budget
+        """
+        self.ai = ai
+        self.max_deferrable_per_step = max_deferrable_per_step
+        self.max_delay = max_delay
+        self.budget: float = DEFAULT_STEP_BUDGET
+        self.overrun = False
+        self.skipped = 0
+        self._step_start: float = 0
+        self._deferrable_run = 0
+        self._last_run: Dict[int, float] = {}
+        self._run_this_step: Set[int] = set()
+        self._last_results: Dict[int, bool] = {}
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds used in the current step so far."""
+        return perf_counter() - self._step_start
+
+    @property
+    def remaining(self) -> float:
+        return self.budget - self.elapsed
+
+    def begin_step(self):
+        budget: Optional[float] = getattr(self.ai, "time_budget_available", None)
+        if budget is None:
+            budget = DEFAULT_STEP_BUDGET
+        self.budget = budget
+        # Step time of the previous step is stored in seconds
+        self.overrun = self.ai._last_step_step_time > budget
+        self._step_start = perf_counter()
+        self._deferrable_run = 0
+        self._run_this_step.clear()
+
+    def should_run(self, item: object) -> bool:
+        """Returns True if the manager or act should run on this step."""
+        priority: StepPriority = getattr(item, "step_priority", StepPriority.Critical)
+        interval: float = getattr(item, "update_interval", 0)
+        key = id(item)
+
+        if priority == StepPriority.Critical and interval <= 0:
+            self._run_this_step.add(key)
+            return True
+
+        now = self.ai.time
+        last_run = self._last_run.get(key, None)
+        waited = None if last_run is None else now - last_run
+        if waited is not None and waited < interval:
+            return False
+
+        if priority == StepPriority.Deferrable:
+            starving = waited is None or waited >= max(interval, self.max_delay)
+            if not starving and (
+                self.overrun
+                or self._deferrable_run >= self.max_deferrable_per_step
+                or self.remaining < self.budget * 0.5
+            ):
+                self.skipped += 1
+                return False
+            self._deferrable_run += 1
+        elif priority == StepPriority.Normal and self.remaining < 0:
+            self.skipped += 1
+            return False
+
+        self._last_run[key] = now
+        self._run_this_step.add(key)
+        return True
+
+    def ran_this_step(self, item: object) -> bool:
+        """True if should_run allowed the item on this step, used to pair post updates with updates."""
+        return id(item) in self._run_this_step
+
+    def last_result(self, item: object) -> bool:
+        """Result of the latest execution of an act, returned when the act is skipped."""
+        return self._last_results.get(id(item), True)
+
+    def set_result(self, item: object, result: bool):
+        self._last_results[id(item)] = result
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from .step_scheduler import StepScheduler, StepPriority
+
+
+class Work:
+    def __init__(self, step_priority: StepPriority, update_interval: float = 0):
+        self.step_priority = step_priority
+        self.update_interval = update_interval
+
+
+def scheduler_for(time: float, last_step_time: float = 0) -> StepScheduler:
+    ai = mock.Mock()
+    ai.time = time
+    ai.time_budget_available = None
+    ai._last_step_step_time = last_step_time
+    scheduler = StepScheduler(ai)
+    scheduler.begin_step()
+    return scheduler
+
+
+class TestStepScheduler:
+    def test_critical_work_always_runs(self):
+        scheduler = scheduler_for(10, last_step_time=1)
+        work = Work(StepPriority.Critical)
+        assert scheduler.should_run(work)
+        assert scheduler.should_run(work)
+
+    def test_interval_is_respected(self):
+        scheduler = scheduler_for(10)
+        work = Work(StepPriority.Normal, 1)
+        assert scheduler.should_run(work)
+        scheduler.ai.time = 10.5
+        scheduler.begin_step()
+        assert not scheduler.should_run(work)
+        scheduler.ai.time = 11
+        scheduler.begin_step()
+        assert scheduler.should_run(work)
+
+    def test_deferrable_work_waits_after_overrun_until_starving(self):
+        scheduler = scheduler_for(10)
+        work = Work(StepPriority.Deferrable, 1)
+        assert scheduler.should_run(work)
+
+        scheduler.ai.time = 12
+        scheduler.ai._last_step_step_time = 1
+        scheduler.begin_step()
+        assert not scheduler.should_run(work)
+        assert scheduler.skipped == 1
+
+        scheduler.ai.time = 15
+        scheduler.begin_step()
+        assert scheduler.should_run(work)
+
+    def test_deferrable_work_is_spread_over_steps(self):
+        scheduler = scheduler_for(10)
+        works = [Work(StepPriority.Deferrable, 1) for _ in range(3)]
+        # First runs are starving, so all of them run
+        assert all(scheduler.should_run(work) for work in works)
+
+        scheduler.ai.time = 11
+        scheduler.begin_step()
+        assert [scheduler.should_run(work) for work in works] == [True, True, False]
+
+    def test_ran_this_step_pairs_with_should_run(self):
+        scheduler = scheduler_for(10)
+        work = Work(StepPriority.Normal, 1)
+        assert scheduler.should_run(work)
+        assert scheduler.ran_this_step(work)
+
+        scheduler.ai.time = 10.5
+        scheduler.begin_step()
+        assert not scheduler.should_run(work)
+        assert not scheduler.ran_this_step(work)
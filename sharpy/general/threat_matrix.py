@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from sc2 import UnitTypeId
+from sc2.ids.buff_id import BuffId
+from sc2.unit import Unit
+from sc2.units import Units
+
+if TYPE_CHECKING:
+    from sharpy.managers.unit_value import UnitValue
+
+
+class ThreatSide:
+    """Per unit values of one side of a ThreatMatrix, element i belongs to units[i]."""
+
+    def __init__(self, unit_values: "UnitValue", units: Units):
+        self.units = units
+        count = len(units)
+        self.tags: List[int] = [unit.tag for unit in units]
+        self.index: Dict[int, int] = {tag: i for i, tag in enumerate(self.tags)}
+        self.types: List[UnitTypeId] = [unit.type_id for unit in units]
+        self.type_ids = np.fromiter((unit_type.value for unit_type in self.types), dtype=np.int64, count=count)
+
+        self.positions = np.fromiter(
+            (value for unit in units for value in unit.position_tuple), dtype=float, count=2 * count
+        ).reshape((count, 2))
+        self.radius = np.fromiter((unit.radius for unit in units), dtype=float, count=count)
+        # Units lifted by graviton beam are hit by anti-air weapons, see UnitValue.real_range
+        self.flying = np.fromiter(
+            (unit.is_flying or unit.has_buff(BuffId.GRAVITONBEAM) for unit in units), dtype=bool, count=count
+        )
+        self.health = np.fromiter((unit.health for unit in units), dtype=float, count=count)
+        self.hit_points = self.health + np.fromiter((unit.shield for unit in units), dtype=float, count=count)
+        self.shield_health_percentage = np.fromiter(
+            (unit.shield_health_percentage for unit in units), dtype=float, count=count
+        )
+        self.ready = np.fromiter((unit.is_ready for unit in units), dtype=bool, count=count)
+        # Same filter as UnitCacheManager.enemy_in_range
+        self.targetable = np.fromiter(
+            (unit.can_be_attacked or unit.is_snapshot for unit in units), dtype=bool, count=count
+        )
+        # Same filter as MicroStep.is_target
+        self.is_target = np.fromiter(
+            (
+                not unit.is_memory and unit.can_be_attacked and not unit.is_hallucination and not unit.is_snapshot
+                for unit in units
+            ),
+            dtype=bool,
+            count=count,
+        )
+
+        self.ground_range = unit_values.ground_ranges(units)
+        self.air_range = unit_values.air_ranges(units)
+        table = unit_values.ai._game_data.unit_table
+        self.ground_dps = table.ground_dps[self.type_ids]
+        self.air_dps = table.air_dps[self.type_ids]
+        self.power = unit_values.powers(self.types)
+        self._unit_values = unit_values
+        self._speed: Optional[np.ndarray] = None
+
+    @property
+    def speed(self) -> np.ndarray:
+        """Speeds from UnitValue.real_speed, calculated on first use."""
+        if self._speed is None:
+            self._speed = np.fromiter(
+                (self._unit_values.real_speed(unit) for unit in self.units), dtype=float, count=len(self.units)
+            )
+        return self._speed
+
+    def real_range_against(self, flying: np.ndarray, radius: np.ndarray) -> np.ndarray:
+        """
+        Real ranges of all units of this side against targets, same as UnitValue.real_range.
+        Returns an array of shape (len(units), len(targets)).
+
+        :param flying: Flying state of the targets
+        :param radius: Radius of the targets
+        """
+        ranges = np.where(flying[np.newaxis, :], self.air_range[:, np.newaxis], self.ground_range[:, np.newaxis])
+        return np.where(ranges <= 0, ranges, ranges + self.radius[:, np.newaxis] + radius[np.newaxis, :])
+
+    def dps_against(self, flying: np.ndarray, ranges: np.ndarray) -> np.ndarray:
+        """
+        Damage per second of all units of this side against targets, zero when the unit can't shoot the target.
+
+        :param flying: Flying state of the targets
+        :param ranges: Real ranges against the targets from real_range_against
+        """
+        dps = np.where(flying[np.newaxis, :], self.air_dps[:, np.newaxis], self.ground_dps[:, np.newaxis])
+        return np.where(ranges > 0, dps, 0)
+
+
+class ThreatMatrix:
+    """
+    Ranges, damage and time to kill between own units and enemy units, calculated for all pairs at once.
+
+    All matrices have shape (len(own.units), len(enemies.units)): row i belongs to own unit i and
+    column j to enemy unit j, see row() and column() for finding them by unit. Damage values
+    don't include upgrades, armor or bonus damage. Use UnitValue.threats for the matrix of the current frame.
+    """
+
+    def __init__(self, unit_values: "UnitValue", own_units: Units, enemy_units: Units):
+        self.own = ThreatSide(unit_values, own_units)
+        self.enemies = ThreatSide(unit_values, enemy_units)
+        own = self.own
+        enemies = self.enemies
+
+        difference = own.positions[:, np.newaxis, :] - enemies.positions[np.newaxis, :, :]
+        self.distances: np.ndarray = np.sqrt((difference ** 2).sum(axis=2))
+
+        # Own units against enemies
+        self.range: np.ndarray = own.real_range_against(enemies.flying, enemies.radius)
+        self.in_range: np.ndarray = self.distances < self.range
+        self.dps: np.ndarray = own.dps_against(enemies.flying, self.range)
+
+        # Enemies against own units, transposed to the same shape
+        self.enemy_range: np.ndarray = enemies.real_range_against(own.flying, own.radius).T
+        self.enemy_in_range: np.ndarray = self.distances < self.enemy_range
+        self.enemy_dps: np.ndarray = enemies.dps_against(own.flying, self.enemy_range.T).T
+
+        with np.errstate(divide="ignore"):
+            self.time_to_kill: np.ndarray = np.where(self.dps > 0, enemies.hit_points[np.newaxis, :] / self.dps, np.inf)
+            self.enemy_time_to_kill: np.ndarray = np.where(
+                self.enemy_dps > 0, own.hit_points[:, np.newaxis] / self.enemy_dps, np.inf
+            )
+
+    def row(self, unit: Unit) -> Optional[int]:
+        """Returns the row of an own unit, or None if the unit wasn't in the matrix."""
+        return self.own.index.get(unit.tag, None)
+
+    def column(self, unit: Unit) -> Optional[int]:
+        """Returns the column of an enemy unit, or None if the unit wasn't in the matrix."""
+        return self.enemies.index.get(unit.tag, None)
+
+    def incoming_dps(self, row: int) -> float:
+        """Total dps of the ready enemies that have the own unit of the row in range."""
+        mask = self.enemy_in_range[row] & self.enemies.ready
+        return float(self.enemy_dps[row, mask].sum())
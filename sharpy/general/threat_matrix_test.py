@@ -0,0 +1,91 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+from s2clientprotocol import data_pb2
+
+from sc2 import UnitTypeId
+from sc2.game_data import UnitTypeTable
+from sc2.units import Units
+from sharpy.managers.unit_value import UnitValue
+
+from .threat_matrix import ThreatMatrix
+
+Weapon = data_pb2.Weapon
+
+
+def create_unit_values() -> UnitValue:
+    unit_values = UnitValue()
+    unit_values.ai = mock.Mock()
+    unit_values.ai._game_data.unit_table = UnitTypeTable(
+        [
+            data_pb2.UnitTypeData(
+                unit_id=UnitTypeId.MARINE.value,
+                weapons=[Weapon(type=Weapon.Any, damage=6, attacks=1, range=5, speed=0.5)],
+            ),
+            data_pb2.UnitTypeData(
+                unit_id=UnitTypeId.ZEALOT.value,
+                weapons=[Weapon(type=Weapon.Ground, damage=8, attacks=2, range=0.1, speed=1)],
+            ),
+            data_pb2.UnitTypeData(unit_id=UnitTypeId.MUTALISK.value),
+        ]
+    )
+    return unit_values
+
+
+def mock_unit(tag: int, x: float, y: float, type_id: UnitTypeId, radius: float = 0.5, flying: bool = False):
+    unit = mock.Mock()
+    unit.tag = tag
+    unit.type_id = type_id
+    unit.position_tuple = (x, y)
+    unit.radius = radius
+    unit.is_flying = flying
+    unit.has_buff.return_value = False
+    unit.health = 40
+    unit.shield = 0
+    unit.shield_health_percentage = 1
+    unit.is_ready = True
+    unit.can_be_attacked = True
+    unit.is_snapshot = False
+    unit.is_memory = False
+    unit.is_hallucination = False
+    return unit
+
+
+def create_matrix(own, enemies) -> ThreatMatrix:
+    unit_values = create_unit_values()
+    return ThreatMatrix(unit_values, Units(own, unit_values.ai), Units(enemies, unit_values.ai))
+
+
+class TestThreatMatrix:
+    def test_range_includes_radius_of_both_units(self):
+        marine = mock_unit(1, 0, 0, UnitTypeId.MARINE, radius=0.375)
+        zealot = mock_unit(2, 5, 0, UnitTypeId.ZEALOT)
+        matrix = create_matrix([marine], [zealot])
+
+        assert matrix.range[0, 0] == pytest.approx(0.375 + 5 + 0.5)
+        assert matrix.enemy_range[0, 0] == pytest.approx(0.5 + 0.1 + 0.375)
+        assert matrix.in_range[0, 0]
+        assert not matrix.enemy_in_range[0, 0]
+
+    def test_ground_only_unit_has_no_dps_against_air(self):
+        zealot = mock_unit(1, 0, 0, UnitTypeId.ZEALOT)
+        mutalisk = mock_unit(2, 0, 0, UnitTypeId.MUTALISK, flying=True)
+        marine = mock_unit(3, 1, 0, UnitTypeId.MARINE)
+        matrix = create_matrix([zealot], [mutalisk, marine])
+
+        assert matrix.dps[0, 0] == 0
+        assert matrix.time_to_kill[0, 0] == np.inf
+        assert matrix.dps[0, 1] == 16
+        assert matrix.time_to_kill[0, 1] == 40 / 16
+
+    def test_rows_and_columns_are_found_by_tag(self):
+        own = [mock_unit(1, 0, 0, UnitTypeId.MARINE), mock_unit(2, 1, 0, UnitTypeId.MARINE)]
+        enemy = mock_unit(3, 3, 4, UnitTypeId.MARINE)
+        matrix = create_matrix(own, [enemy])
+
+        assert matrix.row(own[1]) == 1
+        assert matrix.column(enemy) == 0
+        assert matrix.row(enemy) is None
+        assert matrix.distances[0, 0] == 5
+        assert matrix.incoming_dps(0) == 12
@@ -0,0 +1,112 @@
+from typing import Dict, Iterable, Tuple, Union, TYPE_CHECKING
+
+from sc2 import UnitTypeId
+from sc2.constants import EQUIVALENTS_FOR_TECH_PROGRESS
+from sc2.units import Units
+
+if TYPE_CHECKING:
+    from sharpy.knowledges import Knowledge
+
+
+class UnitCounts:
+    """
+    Counts of own units by type for the current frame, see UnitCacheManager.counts.
+
+    All values are calculated from the own unit cache, pending counts and lost units on first use and remembered until
+    the next update, so every unit is only checked once per frame. Build orders ask the same questions from dozens of
+    steps every frame and all but the first one are cheap dictionary lookups.
+    """
+
+    def __init__(self, knowledge: "Knowledge"):
+        self.knowledge = knowledge
+        self.ai = knowledge.ai
+        self._own_unit_cache: Dict[UnitTypeId, Units] = {}
+        # Ready count and highest build progress of not ready units by type
+        self._ready: Dict[UnitTypeId, Tuple[int, float]] = {}
+        self._pending: Dict[UnitTypeId, float] = {}
+        self._killed: Dict[UnitTypeId, int] = {}
+        self._counts: Dict[Tuple[UnitTypeId, bool, bool, bool], float] = {}
+
+    def update(self, own_unit_cache: Dict[UnitTypeId, Units]):
+        self._own_unit_cache = own_unit_cache
+        self._ready.clear()
+        self._pending.clear()
+        self._killed.clear()
+        self._counts.clear()
+
+    def _ready_progress(self, unit_type: UnitTypeId) -> Tuple[int, float]:
+        result = self._ready.get(unit_type, None)
+        if result is None:
+            ready = 0
+            progress = 0
+            for unit in self._own_unit_cache.get(unit_type, ()):
+                build_progress = unit.build_progress
+                if build_progress == 1:
+                    ready += 1
+                elif build_progress > progress:
+                    progress = build_progress
+            result = (ready, progress)
+            self._ready[unit_type] = result
+        return result
+
+    def amount(self, unit_type: Union[UnitTypeId, Iterable[UnitTypeId]]) -> int:
+        """Amount of own units of the type(s), ready or not."""
+        if isinstance(unit_type, UnitTypeId):
+            return len(self._own_unit_cache.get(unit_type, ()))
+        return sum(len(self._own_unit_cache.get(single_type, ())) for single_type in unit_type)
+
+    def ready(self, unit_type: UnitTypeId) -> int:
+        return self._ready_progress(unit_type)[0]
+
+    def not_ready(self, unit_type: UnitTypeId) -> int:
+        return self.amount(unit_type) - self._ready_progress(unit_type)[0]
+
+    def progress(self, unit_type: UnitTypeId) -> float:
+        """Highest build progress of the not ready units of the type, 0 if there are none."""
+        return self._ready_progress(unit_type)[1]
+
+    def pending(self, unit_type: UnitTypeId) -> float:
+        """Same as BotAI.already_pending."""
+        pending = self._pending.get(unit_type, None)
+        if pending is None:
+            pending = self.ai.already_pending(unit_type)
+            self._pending[unit_type] = pending
+        return pending
+
+    def killed(self, unit_type: UnitTypeId) -> int:
+        """Amount of own units of the type that have been lost, without real type conversion."""
+        killed = self._killed.get(unit_type, None)
+        if killed is None:
+            killed = self.knowledge.lost_units_manager.own_lost_type(unit_type, real_type=False)
+            self._killed[unit_type] = killed
+        return killed
+
+    def count(
+        self, unit_type: UnitTypeId, include_pending=True, include_killed=False, include_not_ready: bool = True
+    ) -> float:
+        """Same as ActBase.get_count."""
+        key = (unit_type, include_pending, include_killed, include_not_ready)
+        count = self._counts.get(key, None)
+        if count is not None:
+            return count
+
+        if include_pending:
+            # Not ready units are already included in pending
+            count = self.pending(unit_type) + self.ready(unit_type)
+        elif include_not_ready:
+            count = self.amount(unit_type)
+        else:
+            count = self.ready(unit_type)
+
+        related = EQUIVALENTS_FOR_TECH_PROGRESS.get(unit_type, None)
+        if related:
+            count += self.amount(related)
+
+        if include_killed:
+            count += self.killed(unit_type)
+            if related:
+                for related_type in related:
+                    count += self.killed(related_type)
+
+        self._counts[key] = count
+        return count
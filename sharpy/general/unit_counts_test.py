@@ -0,0 +1,52 @@
+from unittest import mock
+
+from sc2 import UnitTypeId
+
+from .unit_counts import UnitCounts
+
+
+def create_counts() -> UnitCounts:
+    knowledge = mock.Mock()
+    knowledge.ai.already_pending.return_value = 2
+    knowledge.lost_units_manager.own_lost_type.return_value = 1
+    counts = UnitCounts(knowledge)
+    counts.update(
+        {
+            UnitTypeId.GATEWAY: [mock.Mock(build_progress=1), mock.Mock(build_progress=0.5)],
+            UnitTypeId.WARPGATE: [mock.Mock(build_progress=1)],
+            UnitTypeId.PYLON: [mock.Mock(build_progress=0.25), mock.Mock(build_progress=0.75)],
+        }
+    )
+    return counts
+
+
+class TestUnitCounts:
+    def test_ready_and_not_ready_counts(self):
+        counts = create_counts()
+
+        assert counts.ready(UnitTypeId.GATEWAY) == 1
+        assert counts.not_ready(UnitTypeId.GATEWAY) == 1
+        assert counts.ready(UnitTypeId.PYLON) == 0
+        assert counts.progress(UnitTypeId.PYLON) == 0.75
+        assert counts.progress(UnitTypeId.WARPGATE) == 0
+        assert counts.amount(UnitTypeId.NEXUS) == 0
+
+    def test_count_includes_related_types(self):
+        counts = create_counts()
+
+        assert counts.count(UnitTypeId.GATEWAY, include_pending=False) == 3
+        assert counts.count(UnitTypeId.GATEWAY, include_pending=False, include_not_ready=False) == 2
+        # Pending includes the not ready gateway
+        assert counts.count(UnitTypeId.GATEWAY) == 4
+        assert counts.count(UnitTypeId.GATEWAY, include_pending=False, include_killed=True) == 5
+
+    def test_pending_is_asked_once_per_update(self):
+        counts = create_counts()
+
+        counts.count(UnitTypeId.PYLON)
+        counts.count(UnitTypeId.PYLON, include_not_ready=False)
+        assert counts.ai.already_pending.call_count == 1
+
+        counts.update({})
+        assert counts.count(UnitTypeId.PYLON) == 2
+        assert counts.ai.already_pending.call_count == 2
@@ -11,6 +11,9 @@ from sharpy.managers.enemy_units_manager import EnemyUnitsManager
 from sharpy.mapping.heat_map import HeatMap
 from sharpy.mapping.map import MapInfo
 from sharpy.general.extended_ramp import ExtendedRamp
+from sharpy.general.signal_tracker import SignalTracker
+from sharpy.general.step_scheduler import StepScheduler
+from sharpy.tools.step_profiler import StepProfiler
 from sc2 import Race
 from sc2.constants import *
 from sc2.data import Result
@@ -51,6 +54,10 @@ class Knowledge:
         self.reserved_gas = 0
         self.expanding_to: Zone = None
 
+        self.profiler: StepProfiler = StepProfiler()
+        self.scheduler: Optional[StepScheduler] = None
+        self.signal_tracker: Optional[SignalTracker] = None
+
         # Event listeners
         self._on_unit_destroyed_listeners: List[Callable] = list()
 
@@ -126,12 +133,15 @@ class Knowledge:
     def pre_start(self, ai: "KnowledgeBot", additional_managers: Optional[List[ManagerBase]]):
         # assert isinstance(ai, sc2.BotAI)
         self.ai: "KnowledgeBot" = ai
+        self.scheduler = StepScheduler(ai)
         self._set_managers(additional_managers)
         self._all_own: Units = Units([], self.ai)
         self.config: ConfigParser = self.ai.config
         self.logger = sc2.main.logger
         self.is_chat_allowed = self.config["general"].getboolean("chat")
         self._debug = self.config["general"].getboolean("debug")
+        self.profiler.enabled = bool(self.config["general"].getboolean("profile"))
+        self.signal_tracker = SignalTracker(self, bool(self.config["general"].getboolean("track_requirements")))
 
         self.my_race: Race = self.ai.race
         self.enemy_race: Race = self.ai.enemy_race
@@ -270,8 +280,16 @@ class Knowledge:
 
         self.iteration = iteration
 
+        self.scheduler.begin_step()
         for manager in self.managers:
-            await manager.update()
+            if not self.scheduler.should_run(manager):
+                continue
+            if self.profiler.enabled:
+                self.profiler.begin(f"{type(manager).__name__}.update")
+                await manager.update()
+                self.profiler.end()
+            else:
+                await manager.update()
 
         if not self.supply_blocked and self.ai.supply_left == 0:
             self.supply_blocked = True
@@ -286,9 +304,14 @@ class Knowledge:
         self.expanding_to = None
         self.reserved_minerals = 0
         self.reserved_gas = 0
-        self.heat_map.update()
+        if self.scheduler.should_run(self.heat_map):
+            self.heat_map.update()
         self.update_enemy_random()
 
+        if iteration == 0 and self.ai.map_analysis_cache is not None:
+            # Zone pathing and the building grid are analyzed on the first iteration
+            self.ai.map_analysis_cache.save()
+
     def update_enemy_random(self):
         if self.enemy_race == Race.Random:
             if self._known_enemy_units_workers(UnitTypeId.SCV).exists:
@@ -477,10 +500,21 @@ class Knowledge:
 
         step_time_max = round(self.ai.step_time[2])
         self._print(f"Step time max: {step_time_max}", stats=False)
+        self._print(f"Deferred updates: {self.scheduler.skipped}", stats=False)
+        if self.signal_tracker.enabled:
+            self._print(f"Skipped plan evaluations: {self.signal_tracker.skipped}", stats=False)
 
         for manager in self.managers:
             await manager.on_end(game_result)
 
+        if self.profiler.enabled:
+            for line in self.profiler.report()[:21]:
+                self._print(line, stats=False)
+            file_name = f"profile_{self.ai.opponent_id}_{self.ai.state.game_loop}"
+            self.profiler.write(file_name)
+            for line in self.ai._client.request_stats_report():
+                self._print(line, stats=False)
+
     # region Knowledge event handlers
 
     # todo: if this is useful, it should be refactored as a more general solution
@@ -576,8 +610,25 @@ class Knowledge:
         return h
 
     async def post_update(self):
-        for manager in self.managers:
-            await manager.post_update()
+        client = self.ai._client
+        if self.profiler.enabled:
+            for manager in self.managers:
+                if not self.scheduler.ran_this_step(manager):
+                    # Post update works on the state of update, skip it when update was deferred and keep its draws
+                    client.keep_debug_layer(type(manager).__name__)
+                    continue
+                client.debug_layer(type(manager).__name__, interval=manager.debug_interval)
+                self.profiler.begin(f"{type(manager).__name__}.post_update")
+                await manager.post_update()
+                self.profiler.end()
+        else:
+            for manager in self.managers:
+                if not self.scheduler.ran_this_step(manager):
+                    client.keep_debug_layer(type(manager).__name__)
+                    continue
+                client.debug_layer(type(manager).__name__, interval=manager.debug_interval)
+                await manager.post_update()
+        client.debug_layer()
 
         # if self.debug:
         #     await self.ai._client.send_debug()
@@ -1,4 +1,5 @@
 import logging
+import os
 import sys
 import threading
 from abc import abstractmethod
@@ -16,6 +17,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from sharpy.knowledges import BuildOrder
 
+MAP_CACHE_FOLDER = os.path.join("data", "map_cache")
+
 
 class KnowledgeBot(BotAI):
     """Base class for bots that are built around Knowledge class."""
@@ -33,7 +36,10 @@ class KnowledgeBot(BotAI):
         self.realtime_split = True
         self.last_game_loop = -1
         self.distance_calculation_method = 0
+        self.pathing_grid_update_method = 2
         self.unit_command_uses_self_do = True
+        if self.config["general"].getboolean("map_cache", fallback=False):
+            self.map_analysis_cache_folder = MAP_CACHE_FOLDER
 
     async def real_init(self):
         self.knowledge.pre_start(self, self.configure_managers())
@@ -123,11 +129,27 @@ class KnowledgeBot(BotAI):
             self.last_game_loop = self.state.game_loop
 
             ns_step = time.perf_counter_ns()
-            await self.knowledge.update(iteration)
-            await self.pre_step_execute()
-            await self.plan.execute()
-
-            await self.knowledge.post_update()
+            profiler = self.knowledge.profiler
+            if profiler.enabled:
+                profiler.begin("Knowledge.update")
+                await self.knowledge.update(iteration)
+                profiler.end()
+                profiler.begin("pre_step_execute")
+                await self.pre_step_execute()
+                profiler.end()
+                profiler.begin(type(self.plan).__name__)
+                await self.plan.execute()
+                profiler.end()
+                profiler.begin("Knowledge.post_update")
+                await self.knowledge.post_update()
+                profiler.end()
+                profiler.end_step()
+            else:
+                await self.knowledge.update(iteration)
+                await self.pre_step_execute()
+                await self.plan.execute()
+
+                await self.knowledge.post_update()
 
             if self.knowledge.debug:
                 await self.plan.debug_draw()
@@ -1,6 +1,7 @@
 import pytest
 from unittest import mock
 
+from sc2.client import Client
 from sharpy.knowledges import Knowledge
 from sharpy.managers import DataManager, ManagerBase
 
@@ -22,6 +23,20 @@ class CustomTestManager(ManagerBase):
         pass
 
 
+class DrawingManager(ManagerBase):
+    def __init__(self, client: Client):
+        super().__init__()
+        self.drawing_client = client
+        self.post_updates = 0
+
+    async def update(self):
+        pass
+
+    async def post_update(self):
+        self.post_updates += 1
+        self.drawing_client.debug_text_simple("drawing")
+
+
 class TestKnowledge:
     @pytest.mark.asyncio
     async def test_get_DataManager(self):
@@ -78,3 +93,33 @@ class TestKnowledge:
         custom_manager = knowledge.get_manager(CustomTestManager)
 
         assert custom_manager is None
+
+    @pytest.mark.asyncio
+    async def test_deferred_manager_keeps_its_draws(self):
+        client = Client(mock.Mock())
+        client._execute_debug = mock.AsyncMock()
+        manager = DrawingManager(client)
+        knowledge = Knowledge()
+        knowledge.ai = mock.Mock()
+        knowledge.ai._client = client
+        knowledge.scheduler = mock.Mock()
+        knowledge.managers = [manager]
+
+        knowledge.scheduler.ran_this_step.return_value = True
+        await knowledge.post_update()
+        await client._send_debug()
+        assert client._execute_debug.call_count == 1
+
+        knowledge.scheduler.ran_this_step.return_value = False
+        await knowledge.post_update()
+        await client._send_debug()
+        assert manager.post_updates == 1
+        # The draws of the manager stay on screen and are not sent again
+        assert client._execute_debug.call_count == 1
+        assert client.debug_layers["DrawingManager"].draw.text[0].text == "drawing"
+
+        knowledge.scheduler.ran_this_step.return_value = True
+        await knowledge.post_update()
+        await client._send_debug()
+        assert manager.post_updates == 2
+        assert client._execute_debug.call_count == 1
@@ -1,6 +1,7 @@
 import enum
 import sys
 from typing import Dict, List, Optional, Set, TYPE_CHECKING
+from sharpy.general.step_scheduler import StepPriority
 from sharpy.managers.manager_base import ManagerBase
 
 if TYPE_CHECKING:
@@ -52,6 +53,9 @@ class EnemyMacroBuild(enum.IntEnum):
 class BuildDetector(ManagerBase):
     """Enemy build detector."""
 
+    step_priority = StepPriority.Deferrable
+    update_interval = 0.5
+
     def __init__(self):
         super().__init__()
         self.rush_build = EnemyRushBuild.Macro
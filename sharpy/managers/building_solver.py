@@ -440,6 +440,24 @@ class BuildingSolver(ManagerBase):
             self.wall_save(pylon, zealot, [gate, core])
 
     async def natural_wall(self) -> bool:
+        cache = self.ai.map_analysis_cache
+        cached = cache.get("natural_wall") if cache is not None else None
+        if cached is not None:
+            positions = [Point2(position) for position in cached["positions"].tolist()]
+            wall = (positions[0], positions[1], positions[2:]) if positions else None
+        else:
+            wall = await self._find_natural_wall()
+            if cache is not None:
+                positions = [wall[0], wall[1]] + wall[2] if wall else []
+                cache.put("natural_wall", positions=np.array(positions, dtype=np.float64).reshape(-1, 2))
+
+        if wall is None:
+            return False
+        self.save_natural_wall(wall[0], wall[1], wall[2])
+        return True
+
+    async def _find_natural_wall(self) -> Optional[Tuple[Point2, Point2, List[Point2]]]:
+        """Returns pylon, zealot and gate positions of the best natural wall, or None if there is no wall."""
         natural: Zone = self.knowledge.expansion_zones[1]
 
         search_vector: Point2 = natural.center_location - natural.behind_mineral_position_center
@@ -459,8 +477,9 @@ class BuildingSolver(ManagerBase):
         wall_finders.extend(self.wall_finders_d)
 
         center = natural.center_location
-        if await self.find_wall_in_direction(center, perpendicular, search_vector, wall_finders):
-            return True
+        wall = await self.find_wall_in_direction(center, perpendicular, search_vector, wall_finders)
+        if wall is not None:
+            return wall
 
         search_vector: Point2 = natural.center_location - natural.behind_mineral_position_center
         wall_finders: List[WallFinder] = []
@@ -487,7 +506,7 @@ class BuildingSolver(ManagerBase):
 
     async def find_wall_in_direction(
         self, center: Point2, perpendicular: Point2, search_vector: Point2, wall_finders: List[WallFinder]
-    ):
+    ) -> Optional[Tuple[Point2, Point2, List[Point2]]]:
         map_data = np.swapaxes(self.ai.game_info.pathing_grid.data_numpy, 0, 1)
 
         zone_height = self.ai.get_terrain_height(center)
@@ -544,9 +563,8 @@ class BuildingSolver(ManagerBase):
                             wall = (finder.score, pylon, zealot, gates)
 
         if wall is not None:
-            self.save_natural_wall(wall[1], wall[2], wall[3])
-            return True
-        return False
+            return wall[1], wall[2], wall[3]
+        return None
 
     def save_natural_wall(self, pylon: Point2, zealot: Point2, gates: List[Point2]):
         pylon = pylon.rounded
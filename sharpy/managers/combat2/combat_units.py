@@ -1,5 +1,7 @@
 from typing import Optional, List
 
+import numpy as np
+
 from sc2.position import Point2
 from sharpy import sc2math
 from sharpy.general.extended_power import ExtendedPower
@@ -9,24 +11,37 @@ from sc2.units import Units
 
 
 class CombatUnits:
-    def __init__(self, units: Units, knowledge: "Knowledge"):
+    def __init__(self, units: Units, knowledge: "Knowledge", positions: Optional[np.ndarray] = None):
+        """
+        :param units:
+        :param knowledge:
+        :param positions: Positions of the units as (n, 2) array if they are already known
+        """
         self.knowledge = knowledge
         self.unit_values = knowledge.unit_values
+        self.debug_index = 0
+        self.refresh(units, positions)
+
+    def refresh(self, units: Units, positions: Optional[np.ndarray] = None):
+        """Updates the group with the current state of the units, the group object stays the same."""
+        self.game_loop = self.knowledge.ai.state.game_loop
         self.units = units
-        self.center: Point2 = sc2math.unit_geometric_median(units)
+        if positions is None:
+            self.center: Point2 = sc2math.unit_geometric_median(units)
+        else:
+            self.center: Point2 = Point2(sc2math.geometric_median(positions, 0.5))
         self.ground_units = self.units.not_flying
         if self.ground_units:
             self.center: Point2 = self.ground_units.closest_to((self.center)).position
 
         self.power = ExtendedPower(self.unit_values)
         self.power.add_units(self.units)
-        self.debug_index = 0
         self._total_distance: Optional[float] = None
         self._area_by_circles: float = 0
         self.average_speed = 0
 
         for unit in self.units:
-            self.average_speed += knowledge.unit_values.real_speed(unit)
+            self.average_speed += self.unit_values.real_speed(unit)
 
         if len(self.units) > 1:
             self.average_speed /= len(self.units)
@@ -1,12 +1,16 @@
 from abc import abstractmethod
-from typing import List, Optional, Dict, Callable
+from typing import List, Optional, Dict
+
+import numpy as np
 
 from sc2 import UnitTypeId, Race, AbilityId
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 from sharpy.general.extended_power import ExtendedPower
+from sharpy.general.threat_matrix import ThreatSide
 from sharpy.managers.combat2 import CombatUnits, MoveType, MicroStep, Action
+from sharpy.managers.combat2.group_engagement import GroupEngagement
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -24,6 +28,9 @@ changelings = {
     UnitTypeId.CHANGELINGZERGLINGWINGS,
 }
 
+ignored_type_values = np.array([type_id.value for type_id in ignored_types])
+changeling_type_values = np.array([type_id.value for type_id in changelings])
+
 
 class DefaultMicroMethods:
     @staticmethod
@@ -118,46 +125,24 @@ class DefaultMicroMethods:
 
         step.engaged_power.add_units(step.enemies_near_by)
 
-        engage_count = 0
-        can_engage_count = 0
-        step.attack_range = 0
-        step.enemy_attack_range = 0
-        attack_range_count = 0
-        enemy_attack_range_count = 0
+        step.engagement = GroupEngagement(step.unit_values, units, step.enemies_near_by)
+        engagement = step.engagement
 
         for unit in units:
-            closest_distance = 1000
             if step.ready_to_shoot(unit):
                 ready_to_attack += 1
 
-            engage_added = False
-            can_engage_added = False
-            for enemy_near in step.enemies_near_by:  # type: Unit
-                d = enemy_near.distance_to(unit)
-                if d < closest_distance:
-                    step.closest_units[unit.tag] = enemy_near
-                    closest_distance = d
-
-                att_range = step.unit_values.real_range(enemy_near, unit)
-                step.enemy_attack_range += att_range
-                enemy_attack_range_count += 1
-                if not engage_added and d < att_range:
-                    engage_count += 1
-                    engage_added = True
-
-                att_range = step.unit_values.real_range(unit, enemy_near)
-                step.attack_range += att_range
-                attack_range_count += 1
-
-                if not can_engage_added and d < att_range:
-                    can_engage_count += 1
-                    can_engage_added = True
+        step.closest_units.update(engagement.closest_units())
 
-        if attack_range_count > 0:
-            step.attack_range = step.attack_range / attack_range_count
+        if engagement.distances.size > 0:
+            step.attack_range = float(engagement.range.mean())
+            step.enemy_attack_range = float(engagement.enemy_range.mean())
+        else:
+            step.attack_range = 0
+            step.enemy_attack_range = 0
 
-        if enemy_attack_range_count > 0:
-            step.enemy_attack_range = step.enemy_attack_range / enemy_attack_range_count
+        engage_count = int(np.count_nonzero(engagement.enemy_in_range.any(axis=1)))
+        can_engage_count = int(np.count_nonzero(engagement.in_range.any(axis=1)))
 
         step.ready_to_attack_ratio = ready_to_attack / len(units)
         step.engage_ratio = engage_count / len(units)
@@ -173,54 +158,37 @@ class DefaultMicroMethods:
         air_range = step.unit_values.air_range(unit)
         ground_range = step.unit_values.ground_range(unit)
         lookup = min(air_range + 3, ground_range + 3)
-        enemies = step.cache.enemy_in_range(unit.position, lookup)
 
-        last_target = step.last_targeted(unit)
+        threats = step.unit_values.threats
+        row = threats.row(unit)
+        if row is None:
+            return current_command
 
-        if not enemies:
+        enemies = threats.enemies
+        distances = threats.distances[row]
+        candidates = (distances <= lookup) & enemies.is_target & ~np.isin(enemies.type_ids, ignored_type_values)
+        if not shoot_air:
+            candidates &= ~enemies.flying
+        if not shoot_ground:
+            candidates &= enemies.flying
+        indices = np.flatnonzero(candidates)
+
+        if not len(indices):
             # No enemies to shoot at
             return current_command
 
-        value_func: Callable[[Unit], float]
         if prio:
-            value_func = (
-                lambda u: 1 if u.type_id in changelings else prio.get(u.type_id, -1) * (1 - u.shield_health_percentage)
-            )
+            values = np.fromiter((prio.get(enemies.types[i], -1) for i in indices), dtype=float, count=len(indices))
         else:
-            value_func = (
-                lambda u: 1
-                if u.type_id in changelings
-                else 2 * step.unit_values.power_by_type(u.type_id, 1 - u.shield_health_percentage)
-            )
-
-        best_target: Optional[Unit] = None
-        best_score: float = 0
-        for enemy in enemies:  # type: Unit
-            if enemy.type_id in ignored_types:
-                continue
-
-            if not step.is_target(enemy):
-                continue
-
-            if not shoot_air and enemy.is_flying:
-                continue
-
-            if not shoot_ground and not enemy.is_flying:
-                continue
+            values = 2 * enemies.power[indices]
+        values *= 1 - enemies.shield_health_percentage[indices]
+        values[np.isin(enemies.type_ids[indices], changeling_type_values)] = 1
 
-            pos: Point2 = enemy.position
-            score = value_func(enemy) + (1 - pos.distance_to(unit) / lookup)
-            if enemy.tag == last_target:
-                score += 3
+        scores = DefaultMicroMethods._target_scores(step, unit, enemies, indices, values, distances, lookup, 3)
+        best = int(np.argmax(scores))
 
-            if step.focus_fired.get(enemy.tag, 0) > enemy.health:
-                score *= 0.1
-
-            if score > best_score:
-                best_target = enemy
-                best_score = score
-
-        if best_target:
+        if scores[best] > 0:
+            best_target: Unit = enemies.units[indices[best]]
             step.focus_fired[best_target.tag] = (
                 step.focus_fired.get(best_target.tag, 0) + unit.calculate_damage_vs_target(best_target)[0]
             )
@@ -235,55 +203,68 @@ class DefaultMicroMethods:
     ) -> Action:
         ground_range = step.unit_values.ground_range(unit)
         lookup = ground_range + 3
-        enemies = step.cache.enemy_in_range(unit.position, lookup)
 
-        last_target = step.last_targeted(unit)
+        threats = step.unit_values.threats
+        row = threats.row(unit)
+        if row is None:
+            return current_command
 
-        if not enemies:
+        enemies = threats.enemies
+        distances = threats.distances[row]
+        candidates = (
+            (distances <= lookup)
+            & enemies.targetable
+            & ~enemies.flying
+            & ~np.isin(enemies.type_ids, ignored_type_values)
+        )
+        indices = np.flatnonzero(candidates)
+
+        if not len(indices):
             # No enemies to shoot at
             return current_command
 
-        def melee_value(u: Unit):
-            val = 1 - u.shield_health_percentage
-            range = step.unit_values.real_range(unit, u)
-            if unit.distance_to(u) < range:
-                val += 2
-            if step.knowledge.enemy_race == Race.Terran and unit.is_structure and unit.build_progress < 1:
-                # if building isn't finished, focus on the possible scv instead
-                val -= 2
-            return val
-
-        value_func = melee_value
-        close_enemies = step.cache.enemy_in_range(unit.position, lookup)
-
-        best_target: Optional[Unit] = None
-        best_score: float = 0
-
-        for enemy in close_enemies:  # type: Unit
-            if enemy.type_id in ignored_types:
-                continue
-
-            if enemy.is_flying:
-                continue
-
-            pos: Point2 = enemy.position
-            score = value_func(enemy) + (1 - pos.distance_to(unit) / lookup)
-            if enemy.tag == last_target:
-                score += 1
-
-            if step.focus_fired.get(enemy.tag, 0) > enemy.health:
-                score *= 0.1
+        values = 1 - enemies.shield_health_percentage[indices]
+        values += np.where(threats.in_range[row, indices], 2, 0)
+        if step.knowledge.enemy_race == Race.Terran and unit.is_structure and unit.build_progress < 1:
+            # if building isn't finished, focus on the possible scv instead
+            values -= 2
 
-            if score > best_score:
-                best_target = enemy
-                best_score = score
+        scores = DefaultMicroMethods._target_scores(step, unit, enemies, indices, values, distances, lookup, 1)
+        best = int(np.argmax(scores))
 
-        if best_target:
+        if scores[best] > 0:
+            best_target: Unit = enemies.units[indices[best]]
             step.focus_fired[best_target.tag] = step.focus_fired.get(best_target.tag, 0)
             return Action(best_target, True)
 
         return current_command
 
+    @staticmethod
+    def _target_scores(
+        step: MicroStep,
+        unit: Unit,
+        enemies: ThreatSide,
+        indices: np.ndarray,
+        values: np.ndarray,
+        distances: np.ndarray,
+        lookup: float,
+        last_target_bonus: float,
+    ) -> np.ndarray:
+        """Scores of the focus fire targets, closer targets, the last target and targets that aren't
+        overkilled already are preferred."""
+        scores = values + (1 - distances[indices] / lookup)
+
+        last_target = step.last_targeted(unit)
+        if last_target is not None:
+            scores[indices == enemies.index.get(last_target, -1)] += last_target_bonus
+
+        if step.focus_fired:
+            fired = np.fromiter(
+                (step.focus_fired.get(enemies.tags[i], 0) for i in indices), dtype=float, count=len(indices)
+            )
+            scores[fired > enemies.health[indices]] *= 0.1
+        return scores
+
     @staticmethod
     def ready_to_shoot(step: MicroStep, unit: Unit) -> bool:
         delay_to_shoot = step.client.game_step + 1.5
@@ -0,0 +1,72 @@
+from typing import Dict, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from sc2.unit import Unit
+from sc2.units import Units
+from sharpy.general.threat_matrix import ThreatMatrix
+
+if TYPE_CHECKING:
+    from sharpy.managers.unit_value import UnitValue
+
+
+class GroupEngagement:
+    """
+    Distances and real ranges between the units of a micro group and the enemies near by, see MicroStep.engagement.
+
+    Row i of the matrices belongs to units[i] and column j to enemies[j]. The values are taken from the threat matrix
+    of the frame, a separate matrix is only calculated if some of the units are not in it.
+    """
+
+    def __init__(self, unit_values: "UnitValue", units: Units, enemies: Units):
+        self.units = units
+        self.enemies = enemies
+        self.index: Dict[int, int] = {unit.tag: i for i, unit in enumerate(units)}
+
+        threats = unit_values.threats
+        rows = [threats.row(unit) for unit in units]
+        columns = [threats.column(enemy) for enemy in enemies]
+        if None in rows or None in columns:
+            threats = ThreatMatrix(unit_values, units, enemies)
+            rows = list(range(len(units)))
+            columns = list(range(len(enemies)))
+
+        pairs = np.ix_(np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64))
+        self.distances: np.ndarray = threats.distances[pairs]
+        # Ranges of the units against the enemies
+        self.range: np.ndarray = threats.range[pairs]
+        self.in_range: np.ndarray = threats.in_range[pairs]
+        # Ranges of the enemies against the units
+        self.enemy_range: np.ndarray = threats.enemy_range[pairs]
+        self.enemy_in_range: np.ndarray = threats.enemy_in_range[pairs]
+        # Column of the closest enemy of each unit, -1 without enemies
+        if len(enemies):
+            self.closest: np.ndarray = np.argmin(self.distances, axis=1)
+        else:
+            self.closest = np.full(len(units), -1, dtype=np.int64)
+
+    def closest_units(self) -> Dict[int, Unit]:
+        """Returns the closest enemy by unit tag."""
+        if not len(self.enemies):
+            return {}
+        return {unit.tag: self.enemies[column] for unit, column in zip(self.units, self.closest.tolist())}
+
+    def closest_enemy(self, unit: Unit) -> Optional[Unit]:
+        row = self.index.get(unit.tag, None)
+        if row is None or not len(self.enemies):
+            return None
+        return self.enemies[int(self.closest[row])]
+
+    def enemies_in_range(self, unit: Unit) -> Units:
+        """Returns the enemies that the unit has in range."""
+        return self._enemies_by_mask(unit, self.in_range)
+
+    def enemies_in_range_of(self, unit: Unit) -> Units:
+        """Returns the enemies that have the unit in range."""
+        return self._enemies_by_mask(unit, self.enemy_in_range)
+
+    def _enemies_by_mask(self, unit: Unit, mask: np.ndarray) -> Units:
+        row = self.index.get(unit.tag, None)
+        if row is None:
+            return Units([], self.enemies._bot_object)
+        return Units((self.enemies[column] for column in np.flatnonzero(mask[row]).tolist()), self.enemies._bot_object)
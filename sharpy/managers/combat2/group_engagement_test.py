@@ -0,0 +1,213 @@
+import math
+from unittest import mock
+
+import pytest
+from s2clientprotocol import data_pb2
+
+from sc2 import UnitTypeId
+from sc2.game_data import UnitTypeTable
+from sc2.units import Units
+from sharpy.general.threat_matrix import ThreatMatrix
+from sharpy.managers.combat2 import MoveType
+from sharpy.managers.unit_value import UnitValue
+
+from .default_micro_methods import DefaultMicroMethods
+from .group_engagement import GroupEngagement
+
+Weapon = data_pb2.Weapon
+
+# Ground and air ranges of the weapons in the unit table, as Unit.ground_range and Unit.air_range return them
+RANGES = {
+    UnitTypeId.MARINE: (5, 5),
+    UnitTypeId.ZEALOT: (0.1, 0),
+    UnitTypeId.MUTALISK: (0, 0),
+}
+
+
+def create_unit_values() -> UnitValue:
+    unit_values = UnitValue()
+    unit_values.ai = mock.Mock()
+    unit_values.ai.state.game_loop = 1
+    unit_values.ai._game_data.unit_table = UnitTypeTable(
+        [
+            data_pb2.UnitTypeData(
+                unit_id=UnitTypeId.MARINE.value,
+                weapons=[Weapon(type=Weapon.Any, damage=6, attacks=1, range=5, speed=0.5)],
+            ),
+            data_pb2.UnitTypeData(
+                unit_id=UnitTypeId.ZEALOT.value,
+                weapons=[Weapon(type=Weapon.Ground, damage=8, attacks=2, range=0.1, speed=1)],
+            ),
+            data_pb2.UnitTypeData(unit_id=UnitTypeId.MUTALISK.value),
+        ]
+    )
+    return unit_values
+
+
+def mock_unit(tag: int, x: float, y: float, type_id: UnitTypeId, radius: float = 0.5, flying: bool = False):
+    unit = mock.Mock()
+    unit.tag = tag
+    unit.type_id = type_id
+    unit.position_tuple = (x, y)
+    unit._proto.pos.x = x
+    unit._proto.pos.y = y
+    unit.distance_to = lambda other: math.hypot(x - other.position_tuple[0], y - other.position_tuple[1])
+    unit.ground_range, unit.air_range = RANGES[type_id]
+    unit.radius = radius
+    unit.is_flying = flying
+    unit.has_buff.return_value = False
+    unit.health = 40
+    unit.shield = 0
+    unit.shield_health_percentage = 1
+    unit.is_ready = True
+    unit.can_be_attacked = True
+    unit.is_snapshot = False
+    unit.is_memory = False
+    unit.is_hallucination = False
+    return unit
+
+
+def set_frame_threats(unit_values: UnitValue, own, enemies):
+    unit_values._threats = ThreatMatrix(unit_values, Units(own, unit_values.ai), Units(enemies, unit_values.ai))
+    unit_values._threats_game_loop = unit_values.ai.state.game_loop
+
+
+def nested_loop_engagement(unit_values: UnitValue, units: Units, enemies: Units):
+    """The per pair loop that init_micro_group used before GroupEngagement."""
+    closest_units = dict()
+    engage_count = 0
+    can_engage_count = 0
+    attack_range = 0
+    enemy_attack_range = 0
+    attack_range_count = 0
+    enemy_attack_range_count = 0
+
+    for unit in units:
+        closest_distance = 1000
+        engage_added = False
+        can_engage_added = False
+        for enemy_near in enemies:
+            d = enemy_near.distance_to(unit)
+            if d < closest_distance:
+                closest_units[unit.tag] = enemy_near
+                closest_distance = d
+
+            att_range = unit_values.real_range(enemy_near, unit)
+            enemy_attack_range += att_range
+            enemy_attack_range_count += 1
+            if not engage_added and d < att_range:
+                engage_count += 1
+                engage_added = True
+
+            att_range = unit_values.real_range(unit, enemy_near)
+            attack_range += att_range
+            attack_range_count += 1
+            if not can_engage_added and d < att_range:
+                can_engage_count += 1
+                can_engage_added = True
+
+    if attack_range_count > 0:
+        attack_range = attack_range / attack_range_count
+    if enemy_attack_range_count > 0:
+        enemy_attack_range = enemy_attack_range / enemy_attack_range_count
+
+    return closest_units, engage_count / len(units), can_engage_count / len(units), attack_range, enemy_attack_range
+
+
+def init_micro_group(unit_values: UnitValue, units: Units, enemies: Units) -> mock.Mock:
+    step = mock.Mock()
+    step.unit_values = unit_values
+    step.knowledge.unit_cache.enemy_in_range.return_value = enemies
+    step.ready_to_shoot.return_value = True
+    step.closest_units = dict()
+    group = mock.Mock()
+    group.units = units
+    group.closest_target_group.return_value = None
+    DefaultMicroMethods.init_micro_group(step, group, units, [], MoveType.Assault)
+    return step
+
+
+def assert_same_as_nested_loop(unit_values: UnitValue, units: Units, enemies: Units):
+    closest_units, engage_ratio, can_engage_ratio, attack_range, enemy_attack_range = nested_loop_engagement(
+        unit_values, units, enemies
+    )
+    step = init_micro_group(unit_values, units, enemies)
+
+    assert step.closest_units == closest_units
+    assert step.engagement.closest_units() == closest_units
+    assert step.engage_ratio == engage_ratio
+    assert step.can_engage_ratio == can_engage_ratio
+    assert step.attack_range == pytest.approx(attack_range)
+    assert step.enemy_attack_range == pytest.approx(enemy_attack_range)
+
+
+class TestGroupEngagement:
+    def setup_method(self):
+        self.unit_values = create_unit_values()
+        self.marine = mock_unit(1, 0, 0, UnitTypeId.MARINE, radius=0.375)
+        self.far_marine = mock_unit(2, 10, 0, UnitTypeId.MARINE, radius=0.375)
+        self.zealot = mock_unit(3, 5.5, 0.75, UnitTypeId.ZEALOT)
+        # Not part of the group
+        self.other = mock_unit(4, 50, 50, UnitTypeId.MARINE, radius=0.375)
+
+        self.enemy_zealot = mock_unit(11, 5, 0, UnitTypeId.ZEALOT)
+        self.mutalisk = mock_unit(12, 12, 1, UnitTypeId.MUTALISK, flying=True)
+        # Not near by the group
+        self.enemy_marine = mock_unit(13, 30, 0, UnitTypeId.MARINE, radius=0.375)
+
+        set_frame_threats(
+            self.unit_values,
+            [self.other, self.marine, self.zealot, self.far_marine],
+            [self.enemy_marine, self.mutalisk, self.enemy_zealot],
+        )
+        self.units = Units([self.far_marine, self.zealot, self.marine], self.unit_values.ai)
+        self.enemies = Units([self.mutalisk, self.enemy_zealot], self.unit_values.ai)
+
+    def test_same_as_nested_loop(self):
+        assert_same_as_nested_loop(self.unit_values, self.units, self.enemies)
+
+        step = init_micro_group(self.unit_values, self.units, self.enemies)
+        # Only the zealot is in range of the enemy zealot, the mutalisk has no weapons
+        assert step.engage_ratio == pytest.approx(1 / 3)
+        assert step.can_engage_ratio == 1
+
+    def test_rows_and_columns_follow_group_order(self):
+        engagement = GroupEngagement(self.unit_values, self.units, self.enemies)
+
+        assert engagement.distances.shape == (3, 2)
+        assert engagement.distances[0, 0] == pytest.approx(self.far_marine.distance_to(self.mutalisk))
+        assert engagement.distances[2, 1] == pytest.approx(5)
+        assert engagement.closest_enemy(self.marine) is self.enemy_zealot
+        assert engagement.closest_enemy(self.other) is None
+        assert list(engagement.enemies_in_range(self.zealot)) == [self.enemy_zealot]
+        assert list(engagement.enemies_in_range_of(self.zealot)) == [self.enemy_zealot]
+        assert list(engagement.enemies_in_range_of(self.far_marine)) == []
+
+    def test_units_missing_from_the_frame_matrix(self):
+        # Units that were created after the threat matrix of the frame, a separate matrix is calculated
+        new_marine = mock_unit(5, 6, 1, UnitTypeId.MARINE, radius=0.375)
+        new_zealot = mock_unit(14, 1, 1, UnitTypeId.ZEALOT)
+        units = Units([self.far_marine, new_marine, self.marine], self.unit_values.ai)
+        enemies = Units([self.mutalisk, new_zealot, self.enemy_zealot], self.unit_values.ai)
+
+        with mock.patch("sharpy.managers.combat2.group_engagement.ThreatMatrix", wraps=ThreatMatrix) as threat_matrix:
+            engagement = GroupEngagement(self.unit_values, units, enemies)
+            threat_matrix.assert_called_once_with(self.unit_values, units, enemies)
+
+        assert engagement.closest_enemy(new_marine) is self.enemy_zealot
+        assert engagement.closest_enemy(self.marine) is new_zealot
+        assert_same_as_nested_loop(self.unit_values, units, enemies)
+
+    def test_frame_matrix_is_used_for_known_units(self):
+        with mock.patch("sharpy.managers.combat2.group_engagement.ThreatMatrix") as threat_matrix:
+            GroupEngagement(self.unit_values, self.units, self.enemies)
+
+        threat_matrix.assert_not_called()
+
+    def test_no_enemies(self):
+        enemies = Units([], self.unit_values.ai)
+        engagement = GroupEngagement(self.unit_values, self.units, enemies)
+
+        assert engagement.closest_units() == {}
+        assert engagement.closest_enemy(self.marine) is None
+        assert_same_as_nested_loop(self.unit_values, self.units, enemies)
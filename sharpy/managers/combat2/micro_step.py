@@ -7,6 +7,7 @@ from sharpy.managers.combat2.move_type import MoveType
 from sc2.ids.buff_id import BuffId
 from .action import Action
 from .combat_units import CombatUnits
+from .group_engagement import GroupEngagement
 
 from sc2 import AbilityId, UnitTypeId, Race
 from sc2.position import Point2
@@ -46,6 +47,8 @@ class MicroStep(ABC, Component):
         self.engaged: Dict[int, List[int]] = dict()
 
         self.closest_units: Dict[int, Optional[Unit]] = dict()
+        # Distances and ranges between the units of the group and enemies_near_by, set by init_group
+        self.engagement: Optional[GroupEngagement] = None
         self.move_type = MoveType.Assault
         self.attack_range = 0
         self.enemy_attack_range = 0
@@ -10,14 +10,16 @@ from pathlib import Path
 from sc2 import Result, Tuple
 from sharpy.managers.build_detector import EnemyRushBuild, EnemyMacroBuild
 
+from sharpy.general.step_scheduler import StepPriority
 from sharpy.managers.manager_base import ManagerBase
-from sharpy.tools import IntervalFunc
 from sharpy.tools.opponent_data import GameResult, OpponentData
 
 DATA_FOLDER = "data"
 
 
 class DataManager(ManagerBase):
+    step_priority = StepPriority.Deferrable
+    update_interval = 1
 
     enabled: bool
     enable_write: bool
@@ -35,7 +37,6 @@ class DataManager(ManagerBase):
         self.enable_write = self.knowledge.config["general"].getboolean("write_data")
         self.file_name = DATA_FOLDER + os.sep + str(self.ai.opponent_id) + ".json"
 
-        self.updater = IntervalFunc(self.ai, lambda: self.real_update(), 1)
         self.result = GameResult()
         self.result.my_race = knowledge.my_race
         self.result.enemy_race = knowledge.enemy_race
@@ -74,11 +75,11 @@ class DataManager(ManagerBase):
             self.data = jsonpickle.decode(text)
 
     async def update(self):
-        pass
+        if self.enabled:
+            self.real_update()
 
     async def post_update(self):
-        if self.enabled:
-            self.updater.execute()
+        pass
 
     def real_update(self):
         if self.result.first_attacked is None:
@@ -7,7 +7,7 @@ from sharpy.managers.predict.composition_guesser import CompositionGuesser
 from sharpy.unit_count import UnitCount
 from sharpy.managers.lostunitsmanager import LostUnitsManager
 
-from sharpy.tools.interval_func import IntervalFuncAsync
+from sharpy.general.step_scheduler import StepPriority
 from sc2 import UnitTypeId, Race
 from sc2.client import Client
 from sc2.position import Point2
@@ -18,6 +18,9 @@ MINERAL_MINING_SPEED = 1800.0 / 15 / 60 / 2
 
 
 class EnemyArmyPredicter(ManagerBase):
+    step_priority = StepPriority.Deferrable
+    update_interval = INTERVAL
+
     def __init__(self):
         super().__init__()
 
@@ -28,8 +31,6 @@ class EnemyArmyPredicter(ManagerBase):
         self.lost_units_manager: LostUnitsManager = knowledge.lost_units_manager
         self.unit_values: "UnitValue" = knowledge.unit_values
 
-        self.updater = IntervalFuncAsync(self.ai, self._real_update, INTERVAL)
-
         self.enemy_base_value_minerals = 400 + 12 * 50 + 50
         self.enemy_known_worker_count = 12
 
@@ -81,7 +82,7 @@ class EnemyArmyPredicter(ManagerBase):
         return self.predicted_enemy_army_minerals + self.predicted_enemy_army_gas
 
     async def update(self):
-        await self.updater.execute()
+        await self._real_update()
 
     async def _real_update(self):
         await self.update_own_army_value()
@@ -1,9 +1,12 @@
 from typing import Dict, Set, List, KeysView
 
+import numpy as np
+
 from sharpy.events import UnitDestroyedEvent
 from sharpy.managers.manager_base import ManagerBase
 from sharpy.unit_count import UnitCount
 from sc2 import UnitTypeId, Result
+from sc2.ids.buff_id import BuffId
 from sc2.position import Point2
 from sc2.unit import Unit
 
@@ -137,28 +140,24 @@ class EnemyUnitsManager(ManagerBase):
             self._enemy_cloak_trigger = True
 
     def danger_value(self, danger_for_unit: Unit, position: Point2) -> float:
-        danger = 0
-        for unit in self.knowledge.known_enemy_units:
-            if not unit.is_ready:
-                continue
-            real_range = self.unit_values.real_range(unit, danger_for_unit)
-
-            if real_range < 1:
-                continue
-            if danger_for_unit.is_flying:
-                local_danger = unit.air_dps
-            else:
-                local_danger = unit.ground_dps
-
-            distance = unit.distance_to(position)
-            if distance < real_range:
-                danger += local_danger + (1 - distance / real_range) * local_danger
-            elif self.unit_values.real_speed(danger_for_unit) > self.unit_values.real_speed(unit):
-                danger += max(0, (1.5 - distance / real_range) * local_danger)
-            else:
-                danger += max(0, (2 - distance / real_range) * local_danger)
-
-        return danger
+        enemies = self.unit_values.threats.enemies
+        flying = danger_for_unit.is_flying or danger_for_unit.has_buff(BuffId.GRAVITONBEAM)
+        real_ranges = enemies.real_range_against(np.array([flying]), np.array([danger_for_unit.radius]))[:, 0]
+        mask = enemies.ready & (real_ranges >= 1)
+        if not mask.any():
+            return 0
+
+        real_ranges = real_ranges[mask]
+        local_danger = (enemies.air_dps if danger_for_unit.is_flying else enemies.ground_dps)[mask]
+        distances = np.sqrt(((enemies.positions[mask] - np.array(position)) ** 2).sum(axis=1))
+        faster = self.unit_values.real_speed(danger_for_unit) > enemies.speed[mask]
+
+        danger = np.where(
+            distances < real_ranges,
+            local_danger + (1 - distances / real_ranges) * local_danger,
+            np.maximum(0, (np.where(faster, 1.5, 2) - distances / real_ranges) * local_danger),
+        )
+        return float(danger.sum())
 
     def on_unit_destroyed(self, event: UnitDestroyedEvent):
         unit = event.unit
@@ -1,6 +1,7 @@
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Union, FrozenSet
 
 from sharpy.managers.combat2 import *
+from sharpy.general.clustering import cluster_indices, unit_positions
 from sharpy.general.extended_power import ExtendedPower
 from sharpy.managers import UnitCacheManager, PathingManager, ManagerBase
 from sharpy.managers.combat2 import Action
@@ -10,7 +11,6 @@ from sc2 import UnitTypeId
 from sc2.position import Point2, Point3
 from sc2.unit import Unit
 import numpy as np
-from sklearn.cluster import DBSCAN
 
 # IMPORTANT, do NOT remove these. Used for pyinstaller to include all files.
 import sklearn.utils._cython_blas
@@ -24,6 +24,8 @@ ignored = {UnitTypeId.MULE, UnitTypeId.LARVA, UnitTypeId.EGG}
 
 class GroupCombatManager(ManagerBase):
     rules: MicroRules
+    # Unit statuses are redrawn every few frames
+    debug_interval = 4
 
     def __init__(self):
         super().__init__()
@@ -31,6 +33,10 @@ class GroupCombatManager(ManagerBase):
         self.default_rules.load_default_methods()
         self.default_rules.load_default_micro()
         self.enemy_group_distance = 7
+        # Groups of this and the previous frame by unit tags, a group with the same units keeps the same object
+        self._groups: Dict[FrozenSet[int], CombatUnits] = {}
+        self._previous_groups: Dict[FrozenSet[int], CombatUnits] = {}
+        self._groups_game_loop = -1
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
@@ -150,8 +156,16 @@ class GroupCombatManager(ManagerBase):
 
             units.append(unit)
 
+        debug = False
+        if self.debug:
+            self.client.debug_layer(type(self).__name__, interval=self.debug_interval)
+            debug = self.client.debug_layer_due()
+
+        profiler = self.knowledge.profiler
         for type_id, type_units in own_unit_cache.items():
             micro: MicroStep = self.unit_micros.get(type_id, self.generic_micro)
+            if profiler.enabled:
+                profiler.begin(type(micro).__name__)
             micro.init_group(self.rules, group, type_units, self.enemy_groups, move_type)
             group_action = micro.group_solve_combat(type_units, Action(target, is_attack))
 
@@ -161,7 +175,7 @@ class GroupCombatManager(ManagerBase):
                 if order:
                     self.ai.do(order)
 
-                if self.debug:
+                if debug:
                     if final_action.debug_comment:
                         status = final_action.debug_comment
                     elif final_action.ability:
@@ -183,6 +197,12 @@ class GroupCombatManager(ManagerBase):
                     pos3d = Point3((pos3d.x, pos3d.y, pos3d.z + 2))
                     self.ai._client.debug_text_world(status, pos3d, size=10)
 
+            if profiler.enabled:
+                profiler.end()
+
+        if self.debug:
+            self.client.debug_layer()
+
     def closest_group(self, start: Point2, combat_groups: List[CombatUnits]) -> Optional[CombatUnits]:
         group = None
         best_distance = 50  # doesn't find enemy groups closer than this
@@ -201,60 +221,46 @@ class GroupCombatManager(ManagerBase):
         return group
 
     def group_own_units(self, units: Units) -> List[CombatUnits]:
-        groups: List[Units] = []
-
-        # import time
-        # ns_pf = time.perf_counter_ns()
-
-        numpy_vectors: List[np.ndarray] = []
-        for unit in units:
-            numpy_vectors.append(np.array([unit.position.x, unit.position.y]))
-
-        if numpy_vectors:
-            clustering = DBSCAN(eps=self.enemy_group_distance, min_samples=1).fit(numpy_vectors)
-            # print(clustering.labels_)
-
-            for index in range(0, len(clustering.labels_)):
-                unit = units[index]
-                if unit.type_id in self.unit_values.combat_ignore:
-                    continue
-
-                label = clustering.labels_[index]
-
-                if label >= len(groups):
-                    groups.append(Units([unit], self.ai))
-                else:
-                    groups[label].append(unit)
-            # for label in clustering.labels_:
-
-        # ns_pf = time.perf_counter_ns() - ns_pf
-        # print(f"Own unit grouping (v2) took {ns_pf / 1000 / 1000} ms. groups: {len(groups)} units: {len(units)}")
-
-        return [CombatUnits(u, self.knowledge) for u in groups]
+        return self._group_units(units, unit_positions(self.ai, units), False)
 
     def group_enemy_units(self) -> List[CombatUnits]:
-        groups: List[Units] = []
-
-        import time
-
-        ns_pf = time.perf_counter_ns()
-
-        if self.cache.enemy_numpy_vectors:
-            clustering = DBSCAN(eps=self.enemy_group_distance, min_samples=1).fit(self.cache.enemy_numpy_vectors)
-            # print(clustering.labels_)
-            units = self.knowledge.known_enemy_units
-            for index in range(0, len(clustering.labels_)):
-                unit = units[index]
-                if unit.type_id in self.unit_values.combat_ignore or not unit.can_be_attacked:
-                    continue
-
-                label = clustering.labels_[index]
-
-                if label >= len(groups):
-                    groups.append(Units([unit], self.ai))
-                else:
-                    groups[label].append(unit)
-            # for label in clustering.labels_:
-        ns_pf = time.perf_counter_ns() - ns_pf
-        # print(f"Enemy unit grouping (v2) took {ns_pf / 1000 / 1000} ms. groups: {len(groups)}")
-        return [CombatUnits(u, self.knowledge) for u in groups]
+        index = self.cache.enemy_index
+        return self._group_units(index.units, index.positions, True)
+
+    def _group_units(self, units: Units, positions: np.ndarray, enemies: bool) -> List[CombatUnits]:
+        """Groups units that are within enemy_group_distance of each other, ignored units still connect groups."""
+        groups: List[CombatUnits] = []
+        combat_ignore = self.unit_values.combat_ignore
+
+        for indices in cluster_indices(positions, self.enemy_group_distance):
+            indices = [
+                index
+                for index in indices.tolist()
+                if units[index].type_id not in combat_ignore and (not enemies or units[index].can_be_attacked)
+            ]
+            if indices:
+                group_units = Units((units[index] for index in indices), self.ai)
+                groups.append(self._combat_units(group_units, positions[indices]))
+
+        return groups
+
+    def _combat_units(self, units: Units, positions: np.ndarray) -> CombatUnits:
+        game_loop = self.ai.state.game_loop
+        if game_loop != self._groups_game_loop:
+            self._previous_groups = self._groups
+            self._groups = {}
+            self._groups_game_loop = game_loop
+
+        key = frozenset(unit.tag for unit in units)
+        group = self._groups.get(key, None)
+        if group is not None:
+            # Already grouped the same units this frame
+            return group
+
+        group = self._previous_groups.get(key, None)
+        if group is None:
+            group = CombatUnits(units, self.knowledge, positions)
+        else:
+            group.refresh(units, positions)
+        self._groups[key] = group
+        return group
@@ -9,6 +9,7 @@ from sc2.client import Client
 from typing import TYPE_CHECKING
 
 from sharpy.general.component import Component
+from sharpy.general.step_scheduler import StepPriority
 
 if TYPE_CHECKING:
     from sharpy.knowledges import Knowledge, KnowledgeBot
@@ -16,6 +17,12 @@ if TYPE_CHECKING:
 
 
 class ManagerBase(ABC, Component):
+    # Scheduling of update, see StepScheduler
+    step_priority: StepPriority = StepPriority.Critical
+    update_interval: float = 0
+    # Frames between refreshes of the debug draws made in post_update, see Client.debug_layer
+    debug_interval: int = 0
+
     @abstractmethod
     async def update(self):
         pass
@@ -1,7 +1,6 @@
 from collections import deque
-from typing import Dict, Set, Deque, List
+from typing import Dict, Set, Deque, List, Tuple
 
-from sc2.position import Point2
 from sharpy.events import UnitDestroyedEvent
 from sharpy.managers import ManagerBase
 from sc2 import UnitTypeId
@@ -18,6 +17,9 @@ class MemoryManager(ManagerBase):
     for the building's snapshot when under fog of war.
     """
 
+    # Names of remembered units are redrawn every few frames
+    debug_interval = 4
+
     def __init__(self):
         super().__init__()
 
@@ -54,37 +56,39 @@ class MemoryManager(ManagerBase):
             if unit.tag not in self._memory_units_by_tag:
                 self._memory_units_by_tag[unit.tag] = snaps
 
-        memory_tags_to_remove = list()
+        hidden_tags: List[int] = []
+        points: List[Tuple[int, int]] = []
 
         for unit_tag in self._memory_units_by_tag:
             if self.is_unit_visible(unit_tag):
                 continue
 
             snap = self.get_latest_snapshot(unit_tag)
-            points: List[Point2] = []
-            points.append(Point2((int(snap.position.x), int(snap.position.y))))
-            points.append(Point2((int(snap.position.x + 1), int(snap.position.y))))
-            points.append(Point2((int(snap.position.x), int(snap.position.y + 1))))
-            points.append(Point2((int(snap.position.x + 1), int(snap.position.y + 1))))
+            x = int(snap.position.x)
+            y = int(snap.position.y)
+            hidden_tags.append(unit_tag)
+            points.extend(((x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)))
 
-            visible = True
+        memory_tags_to_remove = list()
 
-            for point in points:
-                if not self.ai.is_visible(point):
-                    visible = False
+        if hidden_tags:
+            # All four pixels around the last known position must be visible
+            visible_pixels = self.ai.state.visibility.values_at(points) == 2
+            visible_units = visible_pixels.reshape(len(hidden_tags), 4).all(axis=1)
 
-            if visible:
-                # We see that the unit is no longer there.
-                # todo: what about burrowed units, especially lurkers?
-                memory_tags_to_remove.append(unit_tag)
-                snaps = self._memory_units_by_tag.get(unit_tag)
-                self._archive_units_by_tag[unit_tag] = snaps
+            for unit_tag, visible in zip(hidden_tags, visible_units.tolist()):
+                if visible:
+                    # We see that the unit is no longer there.
+                    # todo: what about burrowed units, especially lurkers?
+                    memory_tags_to_remove.append(unit_tag)
+                    snaps = self._memory_units_by_tag.get(unit_tag)
+                    self._archive_units_by_tag[unit_tag] = snaps
 
         for tag in memory_tags_to_remove:
             self._memory_units_by_tag.pop(tag)
 
     async def post_update(self):
-        if not self.debug:
+        if not self.debug or not self.client.debug_layer_due():
             return
 
         for unit in self.ghost_units:  # type: Unit
@@ -1,9 +1,22 @@
 import logging
 from math import floor
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
+import numpy as np
 from sc2pathlibp import Sc2Map
 from sharpy.general.extended_power import ExtendedPower
+from sharpy.general import path_cache
+from sharpy.general.path_cache import PathCache, PathResult
+from sc2 import Result
+from sharpy.general.influence_engine import (
+    InfluenceEngine,
+    merge_regions,
+    AIR,
+    DETECTION,
+    GROUND,
+    SPLASH_AIR,
+    SPLASH_GROUND,
+)
 from sharpy.managers.unit_value import buildings_2x2, buildings_3x3, buildings_5x5
 from sharpy.sc2math import point_normalize
 from sc2.ids.effect_id import EffectId
@@ -28,6 +41,16 @@ class PathingManager(ManagerBase):
         self.found_points = []
         self.found_points_air = []
         self.map = Sc2Map
+        self.influence: Optional[InfluenceEngine] = None
+        # Normalized grids without influence, ground base is refreshed when buildings, minerals or rocks change
+        self._ground_base: Optional[np.ndarray] = None
+        self._air_base: Optional[np.ndarray] = None
+        self._ground_grid: Optional[np.ndarray] = None
+        self._air_grid: Optional[np.ndarray] = None
+        self._terrain_blocks_key: Optional[tuple] = None
+        self._ground_blocks_key: Optional[tuple] = None
+        self._ground_walk_applied = False
+        self.path_cache = PathCache()
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
@@ -65,6 +88,10 @@ class PathingManager(ManagerBase):
                 ):
                     air_data[x][y] = 0
         self.path_finder_air = sc2pathlibp.PathFinder(air_data)
+        self.path_finder_air.normalize_influence(20)
+        self._air_base = np.array(self.path_finder_air.map, dtype=np.int64)
+        self._air_grid = self._air_base.copy()
+        self.influence = InfluenceEngine(path_grid.width, path_grid.height)
 
     @property
     def overlord_spots(self) -> List[Point2]:
@@ -128,25 +155,36 @@ class PathingManager(ManagerBase):
                     else:
                         grid.create_block(rock.position + Point2((-y, y)), (5, 1))
 
-    async def update_influence(self):
-        power = ExtendedPower(self.unit_values)
-        self.path_finder_terrain.reset()  # Reset
-        self.path_finder_ground.reset()  # Reset
-
-        positions = []
-
-        for mf in self.ai.mineral_field:  # type: Unit
-            # In 4.8.5+ minerals are no linger visible in pathing grid
-            positions.append(mf.position)
+    def update_blocks(self) -> bool:
+        """
+        Updates blocked cells of the terrain and ground path finders when minerals, rocks or buildings have changed.
+        Returns True if the ground base grid was recalculated.
+        """
+        terrain_key = (
+            tuple(mf.position_tuple for mf in self.ai.mineral_field),
+            tuple(rock.tag for rock in self.ai.destructables),
+        )
+        ground_key = (
+            terrain_key,
+            tuple(
+                (building.tag, building.type_id, building.position_tuple)
+                for building in self.ai.structures + self.knowledge.known_enemy_structures
+            ),
+        )
 
-        # for mf in self.ai.mineral_walls:  # type: Unit
-        #     # In 4.8.5+ minerals are no linger visible in pathing grid
-        #     positions.append(mf.position)
+        if terrain_key != self._terrain_blocks_key:
+            self._terrain_blocks_key = terrain_key
+            self.path_finder_terrain.reset()  # Reset
+            self.path_finder_terrain.create_block(self._mineral_positions(), (2, 1))
+            self.set_rocks(self.path_finder_terrain)
+            self.path_cache.invalidate(path_cache.TERRAIN)
 
-        self.path_finder_terrain.create_block(positions, (2, 1))
-        self.path_finder_ground.create_block(positions, (2, 1))
+        if ground_key == self._ground_blocks_key:
+            return False
 
-        self.set_rocks(self.path_finder_terrain)
+        self._ground_blocks_key = ground_key
+        self.path_finder_ground.reset()  # Reset
+        self.path_finder_ground.create_block(self._mineral_positions(), (2, 1))
         self.set_rocks(self.path_finder_ground)
 
         for building in self.ai.structures + self.knowledge.known_enemy_structures:  # type: Unit
@@ -158,10 +196,28 @@ class PathingManager(ManagerBase):
                 self.path_finder_ground.create_block(building.position, (5, 3))
                 self.path_finder_ground.create_block(building.position, (3, 5))
 
-        self.set_rocks(self.path_finder_ground)
-
         self.path_finder_ground.normalize_influence(20)
-        self.path_finder_air.normalize_influence(20)
+        self._ground_base = np.array(self.path_finder_ground.map, dtype=np.int64)
+        self._ground_grid = self._ground_base.copy()
+        self.path_cache.invalidate(path_cache.GROUND)
+        return True
+
+    def _mineral_positions(self) -> List[Point2]:
+        # In 4.8.5+ minerals are no linger visible in pathing grid
+        # for mf in self.ai.mineral_walls:  # type: Unit
+        #     positions.append(mf.position)
+        return [mf.position for mf in self.ai.mineral_field]
+
+    async def update_influence(self):
+        """
+        Collects influence sources into the numpy influence layers and pushes the combined grids to the path finders.
+        Grids are only recomposed in the dirty region of changed sources and only sent when something changed.
+        """
+        ground_base_changed = self.update_blocks()
+        influence = self.influence
+        power = ExtendedPower(self.unit_values)
+        # Walk influence depends on walking distance around obstacles, it is applied by sc2pathlib after the grid is set
+        walk_influence: List[Tuple[List[Point2], float]] = []
 
         for enemy_type in self.cache.enemy_unit_cache:  # type: UnitTypeId
             enemies: Units = self.cache.enemy_unit_cache.get(enemy_type, Units([], self.ai))
@@ -171,28 +227,29 @@ class PathingManager(ManagerBase):
             example_enemy: Unit = enemies[0]
             power.clear()
             power.add_unit(enemy_type, 100)
+            positions = [enemy.position_tuple for enemy in enemies]
 
             if self.unit_values.can_shoot_air(example_enemy):
-                positions: List[Point2] = map(lambda u: u.position, enemies)  # need to be specified in both places
                 s_range = self.unit_values.air_range(example_enemy)
 
                 if example_enemy.type_id == UnitTypeId.CYCLONE:
                     s_range = 7
 
-                self.path_finder_air.add_influence(positions, power.air_power, s_range + 3)
+                influence.add(AIR, positions, power.air_power, s_range + 3)
 
             if self.unit_values.can_shoot_ground(example_enemy):
-                positions = map(lambda u: u.position, enemies)  # need to be specified in both places
                 s_range = self.unit_values.ground_range(example_enemy)
                 if example_enemy.type_id == UnitTypeId.CYCLONE:
                     s_range = 7
 
-                if s_range < 2:
-                    self.path_finder_ground.add_influence_walk(positions, power.ground_power, 7)
-                elif s_range < 5:
-                    self.path_finder_ground.add_influence_walk(positions, power.ground_power, 7)
+                if s_range < 5:
+                    walk_influence.append((positions, power.ground_power))
                 else:
-                    self.path_finder_ground.add_influence(positions, power.ground_power, s_range + 3)
+                    influence.add(GROUND, positions, power.ground_power, s_range + 3)
+
+        for enemy in self.knowledge.known_enemy_units:  # type: Unit
+            if enemy.detect_range > 0:
+                influence.add(DETECTION, (enemy.position_tuple,), 1, enemy.detect_range, True)
 
         # influence, radius, points, can it hit air?
         effect_dict: Dict[EffectId, Tuple[float, float, List[Point2], bool]] = dict()
@@ -227,8 +284,29 @@ class PathingManager(ManagerBase):
 
         for effects in effect_dict.values():
             if effects[3]:
-                self.path_finder_air.add_influence(effects[2], effects[0], effects[1])
-            self.path_finder_ground.add_influence(effects[2], effects[0], effects[1])
+                influence.add(SPLASH_AIR, effects[2], effects[0], effects[1])
+            influence.add(SPLASH_GROUND, effects[2], effects[0], effects[1])
+
+        dirty = influence.commit()
+
+        air_region = merge_regions(dirty[AIR], dirty[SPLASH_AIR])
+        if air_region is not None:
+            influence.compose(self._air_base, (AIR, SPLASH_AIR), self._air_grid, air_region)
+            self.path_finder_air.set_map(self._air_grid.tolist())
+            self.path_cache.invalidate(path_cache.AIR_INFLUENCE)
+
+        ground_region = merge_regions(dirty[GROUND], dirty[SPLASH_GROUND])
+        if ground_base_changed:
+            influence.compose(self._ground_base, (GROUND, SPLASH_GROUND), self._ground_grid)
+        elif ground_region is not None:
+            influence.compose(self._ground_base, (GROUND, SPLASH_GROUND), self._ground_grid, ground_region)
+
+        if ground_base_changed or ground_region is not None or walk_influence or self._ground_walk_applied:
+            self.path_finder_ground.set_map(self._ground_grid.tolist())
+            for positions, value in walk_influence:
+                self.path_finder_ground.add_influence_walk(positions, value, 7)
+            self.path_cache.invalidate(path_cache.GROUND_INFLUENCE)
+        self._ground_walk_applied = len(walk_influence) > 0
 
         # batteries: Units = self.cache.own(UnitTypeId.SHIELDBATTERY).filter(lambda u: u.energy > 5)
         # if batteries:
@@ -236,6 +314,10 @@ class PathingManager(ManagerBase):
         #     self.path_finder_air.add_influence(positions, -5, 6)
         #     self.path_finder_ground.add_influence(positions, -5, 6)
 
+    def is_detected(self, position: Point2) -> bool:
+        """Returns True if the position is within detection range of a known enemy detector."""
+        return self.influence.value_at(DETECTION, position) > 0
+
     async def post_update(self):
         if self.debug:
             self.path_finder_ground.plot(self.found_points)
@@ -246,8 +328,32 @@ class PathingManager(ManagerBase):
                 point3 = Point3((point.x, point.y, z))
                 self.client.debug_box2_out(point3, 0.25)
 
+    async def on_end(self, game_result: Result):
+        cache = self.path_cache
+        self.print(f"Path cache hits: {cache.hits} misses: {cache.misses} hit rate: {cache.hit_rate:.2f}")
+
+    def get_path(self, layer: str, start: Point2, target: Point2) -> PathResult:
+        """
+        Returns path and distance from the path finder of the layer, using cached results when the grid hasn't changed.
+
+        :param layer: One of the layers in path_cache
+        """
+        key = self.path_cache.key(layer, start, target)
+        result = self.path_cache.get(key)
+        if result is None:
+            if layer == path_cache.TERRAIN:
+                result = self.path_finder_terrain.find_path(start, target)
+            elif layer == path_cache.GROUND:
+                result = self.path_finder_ground.find_path(start, target)
+            elif layer == path_cache.GROUND_INFLUENCE:
+                result = self.path_finder_ground.find_path_influence(start, target)
+            else:
+                result = self.path_finder_air.find_path_influence(start, target)
+            self.path_cache.put(key, result)
+        return result
+
     def walk_distance(self, start: Point2, target: Point2) -> float:
-        result = self.path_finder_ground.find_path(start, target)
+        result = self.get_path(path_cache.GROUND, start, target)
         path = result[0]
 
         if len(path) < 1:
@@ -255,7 +361,7 @@ class PathingManager(ManagerBase):
         return result[1]
 
     def find_path(self, start: Point2, target: Point2, target_index: int = 20) -> Point2:
-        result = self.path_finder_terrain.find_path(start, target)
+        result = self.get_path(path_cache.TERRAIN, start, target)
         path = result[0]
 
         if len(path) < 1:
@@ -286,7 +392,7 @@ class PathingManager(ManagerBase):
         return Point2((pos[0], pos[1]))
 
     def find_influence_air_path(self, start: Point2, target: Point2) -> Point2:
-        result = self.path_finder_air.find_path_influence(start, target)
+        result = self.get_path(path_cache.AIR_INFLUENCE, start, target)
         path = result[0]
         target_index = 4
 
@@ -303,7 +409,7 @@ class PathingManager(ManagerBase):
         return Point2((target[0], target[1]))
 
     def find_influence_ground_path(self, start: Point2, target: Point2, target_index: int = 5) -> Point2:
-        result = self.path_finder_ground.find_path_influence(start, target)
+        result = self.get_path(path_cache.GROUND_INFLUENCE, start, target)
         path = result[0]
 
         if len(path) < 1:
@@ -1,8 +1,9 @@
-import numpy as np
 from typing import Dict, Union, Optional, List, Iterable
 
 from scipy.spatial.ckdtree import cKDTree
 
+from sharpy.general.spatial_index import SpatialIndex
+from sharpy.general.unit_counts import UnitCounts
 from sharpy.managers.unit_value import race_townhalls
 from sc2.constants import FakeEffectID
 from sc2.game_state import EffectData
@@ -32,10 +33,11 @@ class UnitCacheManager(ManagerBase):
         self.enemy_unit_cache: Dict[UnitTypeId, Units] = {}
         self.own_tree: Optional[cKDTree] = None
         self.enemy_tree: Optional[cKDTree] = None
+        self.own_index: Optional[SpatialIndex] = None
+        self.enemy_index: Optional[SpatialIndex] = None
+        self.counts: Optional[UnitCounts] = None
         self.force_fields: List[EffectData] = []
 
-        self.own_numpy_vectors: List[np.ndarray] = []
-        self.enemy_numpy_vectors: List[np.ndarray] = []
         self.mineral_fields: Dict[Point2, Unit] = {}
         self.mineral_wall: Units = {}
 
@@ -44,6 +46,9 @@ class UnitCacheManager(ManagerBase):
         self.all_own: Units = Units([], self.ai)
         self.empty_units: Units = Units([], self.ai)
         self.mineral_wall: Units = Units([], self.ai)
+        self.own_index = SpatialIndex(self.ai)
+        self.enemy_index = SpatialIndex(self.ai)
+        self.counts = UnitCounts(knowledge)
 
     def by_tag(self, tag: int) -> Optional[Unit]:
         return self.tag_cache.get(tag, None)
@@ -89,26 +94,22 @@ class UnitCacheManager(ManagerBase):
         return self.enemy(enemy_townhall_types)
 
     def own_in_range(self, position: Point2, range: Union[int, float]) -> Units:
-        units = Units([], self.ai)
-        if self.own_tree is None:
-            return units
-
-        for index in self.own_tree.query_ball_point(np.array([position.x, position.y]), range):
-            units.append(self.all_own[index])
-
-        return units
+        return self.own_index.in_range(position, range)
 
     def enemy_in_range(self, position: Point2, range: Union[int, float], only_targetable=True) -> Units:
-        units = Units([], self.ai)
-        if self.enemy_tree is None:
-            return units
+        return self.enemy_index.in_range(position, range, targetable=True if only_targetable else None)
 
-        for index in self.enemy_tree.query_ball_point(np.array([position.x, position.y]), range):
-            units.append(self.knowledge.known_enemy_units[index])
+    def own_in_range_batch(
+        self, positions: List[Point2], ranges: Union[int, float, List[Union[int, float]]]
+    ) -> List[Units]:
+        """Returns own units in range of each position, queried from the spatial index in a single call."""
+        return self.own_index.in_range_batch(positions, ranges)
 
-        if only_targetable:
-            return units.filter(lambda x: x.can_be_attacked or x.is_snapshot)
-        return units
+    def enemy_in_range_batch(
+        self, positions: List[Point2], ranges: Union[int, float, List[Union[int, float]]], only_targetable=True
+    ) -> List[Units]:
+        """Returns enemy units in range of each position, queried from the spatial index in a single call."""
+        return self.enemy_index.in_range_batch(positions, ranges, targetable=True if only_targetable else None)
 
     async def update(self):
         self.update_minerals()
@@ -118,8 +119,6 @@ class UnitCacheManager(ManagerBase):
         self.enemy_unit_cache.clear()
         self.force_fields.clear()
 
-        self.own_numpy_vectors = []
-        self.enemy_numpy_vectors = []
         self.all_own = self.knowledge.all_own
 
         for unit in self.all_own:
@@ -127,7 +126,8 @@ class UnitCacheManager(ManagerBase):
             if units.amount == 0:
                 self.own_unit_cache[unit.type_id] = units
             units.append(unit)
-            self.own_numpy_vectors.append(np.array([unit.position.x, unit.position.y]))
+
+        self.counts.update(self.own_unit_cache)
 
         for unit in self.knowledge.known_enemy_units:
             if unit.is_memory:
@@ -137,21 +137,15 @@ class UnitCacheManager(ManagerBase):
             if units.amount == 0:
                 self.enemy_unit_cache[unit.type_id] = units
             units.append(unit)
-            self.enemy_numpy_vectors.append(np.array([unit.position.x, unit.position.y]))
 
         for unit in self.ai.all_units:
             # Add all non-memory units to unit tag cache
             self.tag_cache[unit.tag] = unit
 
-        if len(self.own_numpy_vectors) > 0:
-            self.own_tree = cKDTree(self.own_numpy_vectors)
-        else:
-            self.own_tree = None
-
-        if len(self.enemy_numpy_vectors) > 0:
-            self.enemy_tree = cKDTree(self.enemy_numpy_vectors)
-        else:
-            self.enemy_tree = None
+        self.own_index.update(self.all_own)
+        self.enemy_index.update(self.knowledge.known_enemy_units)
+        self.own_tree = self.own_index.tree
+        self.enemy_tree = self.enemy_index.tree
 
         for effect in self.ai.state.effects:
             if effect.id == FakeEffectID.get(UnitTypeId.FORCEFIELD.value):
@@ -1,6 +1,9 @@
 import logging
 from typing import Union, Optional, List, Dict, Callable
 
+import numpy as np
+
+from sharpy.general.threat_matrix import ThreatMatrix
 from sharpy.general.unit_feature import UnitFeature
 from sc2 import Race, race_gas, race_townhalls
 from sc2.constants import *
@@ -175,6 +178,8 @@ class UnitValue(ManagerBase):
         super().__init__()
         self.combat_ignore = {UnitTypeId.OVERLORD, UnitTypeId.LARVA} | self.not_really_structure
         self.init_range_dicts()
+        self._threats: Optional[ThreatMatrix] = None
+        self._threats_game_loop = -1
 
         self.unit_data = {
             # Units
@@ -549,6 +554,41 @@ class UnitValue(ManagerBase):
             return func(unit)
         return unit.air_range
 
+    def ground_ranges(self, units: Units) -> np.ndarray:
+        """Returns ground_range of all units as an array, only units with own range rules are handled one by one."""
+        return self._ranges(units, self.ai._game_data.unit_table.ground_range, self._ground_range_dict)
+
+    def air_ranges(self, units: Units) -> np.ndarray:
+        """Returns air_range of all units as an array, only units with own range rules are handled one by one."""
+        return self._ranges(units, self.ai._game_data.unit_table.air_range, self._air_range_dict)
+
+    @staticmethod
+    def _ranges(
+        units: Units, table_ranges: np.ndarray, range_dict: Dict[UnitTypeId, Callable[[Unit], float]]
+    ) -> np.ndarray:
+        type_ids = np.fromiter((unit.type_id.value for unit in units), dtype=np.int64, count=len(units))
+        ranges = table_ranges[type_ids]
+        for i, unit in enumerate(units):
+            func = range_dict.get(unit.type_id, None)
+            if func:
+                ranges[i] = func(unit)
+        return ranges
+
+    def powers(self, unit_types: List[UnitTypeId]) -> np.ndarray:
+        """Returns power_by_type of the unit types with full health as an array."""
+        return np.fromiter(
+            (self.power_by_type(unit_type) for unit_type in unit_types), dtype=float, count=len(unit_types)
+        )
+
+    @property
+    def threats(self) -> ThreatMatrix:
+        """Threat matrix of all own units against known enemy units, calculated on first use each frame."""
+        game_loop = self.ai.state.game_loop
+        if self._threats is None or self._threats_game_loop != game_loop:
+            self._threats = ThreatMatrix(self, self.knowledge.all_own, self.knowledge.known_enemy_units)
+            self._threats_game_loop = game_loop
+        return self._threats
+
     def can_shoot_air(self, unit: Unit) -> bool:
         return self.air_range(unit) > 0
 
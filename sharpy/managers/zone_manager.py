@@ -1,10 +1,12 @@
 import logging
 import sys
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import sc2pathlibp
 from sc2.unit import Unit
 from sharpy import sc2math
+from sharpy.general import path_cache
 from sharpy.general.path import Path
 from sharpy.managers.grids import BuildGrid, GridArea, ZoneArea
 from sharpy.mapping import MapInfo
@@ -35,6 +37,9 @@ class ZoneManager(ManagerBase):
         self.zone_sorted_by = None
         self.found_enemy_start: Optional[Point2] = None
         self.map: MapInfo = None
+        # Walk distances between all zones, calculated once at start. Indexed by _zone_location_index.
+        self.zone_distances: np.ndarray = np.zeros((0, 0))
+        self._zone_location_index: Dict[Point2, int] = {}
 
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
@@ -51,13 +56,48 @@ class ZoneManager(ManagerBase):
             self.zones[exp_loc] = Zone(exp_loc, is_start_location, self.knowledge)
 
         self.expansion_zones = list(self.zones.values())
+        self._init_zone_distances()
 
         self._sort_expansion_zones()
         self._zones_truly_sorted = self.enemy_start_location_found
         self.zone_sorted_by = self.enemy_start_location
 
+    def _init_zone_distances(self):
+        locations = list(self.zones.keys())
+        count = len(locations)
+        self._zone_location_index = {location: index for index, location in enumerate(locations)}
+        location_array = np.array(locations, dtype=np.float64).reshape(-1, 2)
+        cache = self.ai.map_analysis_cache
+        if cache is not None:
+            cached = cache.get("zone_distances")
+            if cached is not None and np.array_equal(cached["locations"], location_array):
+                self.zone_distances = cached["distances"]
+                return
+
+        self.zone_distances = np.zeros((count, count))
+
+        for i in range(0, count):
+            for j in range(i + 1, count):
+                distance = self._calculate_path_distance(locations[i], locations[j])
+                self.zone_distances[i, j] = distance
+                self.zone_distances[j, i] = distance
+
+        if cache is not None:
+            cache.put("zone_distances", locations=location_array, distances=self.zone_distances)
+
+    def zone_distance(self, zone1: Zone, zone2: Zone) -> float:
+        """Walk distance between the centers of two zones."""
+        return self._path_distance(zone1.center_location, zone2.center_location)
+
     def _path_distance(self, start: Point2, end: Point2):
-        path = Path(self.knowledge.pathing_manager.path_finder_terrain.find_path(start, end))
+        start_index = self._zone_location_index.get(start, None)
+        end_index = self._zone_location_index.get(end, None)
+        if start_index is not None and end_index is not None:
+            return self.zone_distances[start_index, end_index]
+        return self._calculate_path_distance(start, end)
+
+    def _calculate_path_distance(self, start: Point2, end: Point2):
+        path = Path(self.knowledge.pathing_manager.get_path(path_cache.TERRAIN, start, end))
         if path.distance > 0:
             return path.distance
         return start.distance_to(end)  # Failsafe
@@ -157,15 +197,20 @@ class ZoneManager(ManagerBase):
 
     def init_zone_pathing(self):
         """ Init zone pathing. This needs to be run after all managers have properly started. """
-        pf: sc2pathlibp.PathFinder = self.knowledge.pathing_manager.path_finder_terrain
         zone_count = len(self.expansion_zones)
-        for i in range(0, zone_count):
-            for j in range(i + 1, zone_count):
-                path_data = pf.find_path(
-                    self.expansion_zones[i].center_location, self.expansion_zones[j].center_location
-                )
-                self.expansion_zones[i].paths[j] = Path(path_data)
-                self.expansion_zones[j].paths[i] = Path(path_data, True)
+        pairs = [(i, j) for i in range(0, zone_count) for j in range(i + 1, zone_count)]
+        paths = self._load_zone_paths()
+        if paths is None:
+            pf: sc2pathlibp.PathFinder = self.knowledge.pathing_manager.path_finder_terrain
+            paths = [
+                pf.find_path(self.expansion_zones[i].center_location, self.expansion_zones[j].center_location)
+                for i, j in pairs
+            ]
+            self._store_zone_paths(paths)
+
+        for (i, j), path_data in zip(pairs, paths):
+            self.expansion_zones[i].paths[j] = Path(path_data)
+            self.expansion_zones[j].paths[i] = Path(path_data, True)
 
         for i in range(1, zone_count - 1):
             # Recalculate improved gather points based on pathing
@@ -256,6 +301,35 @@ class ZoneManager(ManagerBase):
             zone.center_location, own_position
         )
 
+    def _zone_center_array(self) -> np.ndarray:
+        return np.array([zone.center_location for zone in self.expansion_zones], dtype=np.float64).reshape(-1, 2)
+
+    def _load_zone_paths(self) -> Optional[List[Tuple[List[Tuple[int, int]], float]]]:
+        """Returns paths between all expansion zone pairs from the map analysis cache, if the zone order matches."""
+        cache = self.ai.map_analysis_cache
+        cached = cache.get("zone_paths") if cache is not None else None
+        if cached is None or not np.array_equal(cached["locations"], self._zone_center_array()):
+            return None
+
+        points: List[Tuple[int, int]] = [tuple(point) for point in cached["points"].tolist()]
+        offsets: List[int] = cached["offsets"].tolist()
+        return [
+            (points[offsets[index] : offsets[index + 1]], distance)
+            for index, distance in enumerate(cached["distances"].tolist())
+        ]
+
+    def _store_zone_paths(self, paths: List[Tuple[List[Tuple[int, int]], float]]):
+        cache = self.ai.map_analysis_cache
+        if cache is None:
+            return
+        cache.put(
+            "zone_paths",
+            locations=self._zone_center_array(),
+            points=np.array([point for path, _ in paths for point in path], dtype=np.int32).reshape(-1, 2),
+            offsets=np.cumsum([0] + [len(path) for path, _ in paths]),
+            distances=np.array([distance for _, distance in paths], dtype=np.float64),
+        )
+
     # endregion
 
     # region Update
@@ -276,6 +350,13 @@ class ZoneManager(ManagerBase):
             self.zone_sorted_by = self.enemy_start_location
             self._sort_expansion_zones()
 
+    def _zone_circles(self) -> Tuple[List[Point2], List[float]]:
+        """Centers and radiuses of expansion zones in the current zone order, for batched range queries."""
+        return (
+            [zone.center_location for zone in self.expansion_zones],
+            [zone.radius for zone in self.expansion_zones],
+        )
+
     def update_own_units_zones(self):
         # Figure out all the zones the units are set in
         tags_in_zones: Dict[int, List[int]] = {}
@@ -284,8 +365,9 @@ class ZoneManager(ManagerBase):
             # Create empty arrays for easy code later
             tags_in_zones[tag] = []
 
-        for zone in self.expansion_zones:
-            zone.our_units = self.cache.own_in_range(zone.center_location, zone.radius)
+        zone_units = self.cache.own_in_range_batch(*self._zone_circles())
+        for zone, our_units in zip(self.expansion_zones, zone_units):
+            zone.our_units = our_units
             for tag in zone.our_units.tags:
                 # Registering zone here
                 tags_in_zones[tag].append(zone.zone_index)
@@ -323,8 +405,9 @@ class ZoneManager(ManagerBase):
             # Create empty arrays for easy code later
             tags_in_zones[tag] = []
 
-        for zone in self.expansion_zones:
-            zone.known_enemy_units = self.cache.enemy_in_range(zone.center_location, zone.radius)
+        zone_units = self.cache.enemy_in_range_batch(*self._zone_circles())
+        for zone, known_enemy_units in zip(self.expansion_zones, zone_units):
+            zone.known_enemy_units = known_enemy_units
             for tag in zone.known_enemy_units.tags:
                 # Registering zone here
                 tags_in_zones[tag].append(zone.zone_index)
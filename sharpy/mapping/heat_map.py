@@ -1,8 +1,10 @@
 import math
 from typing import List, Optional, Tuple
 
+import numpy as np
+
 import sc2
-from sharpy.general.extended_power import ExtendedPower
+from sharpy.general.step_scheduler import StepPriority
 from sharpy.managers import UnitCacheManager
 from sharpy.tools import IntervalFunc
 from sc2.pixel_map import PixelMap
@@ -12,70 +14,64 @@ from sc2.unit import Unit
 SLOT_SIZE = 5
 
 
-class HeatArea:
-    def __init__(self, ai: sc2.BotAI, knowledge: "Knowledge", x: int, y: int, x2: int, y2: int):
-        self.ai = ai
-        self.knowledge = knowledge
-        self.cache: UnitCacheManager = self.knowledge.unit_cache
-        self.bottom_left_x = x
-        self.bottom_left_y = y
-        self.top_right_x = x2
-        self.top_right_y = y2
-        self.center = Point2(((x + x2) / 2.0, (y + y2) / 2.0))
-        self._x, self._y = self.center.rounded
-        self.zone: Optional["Zone"] = None
-        self.heat: float = 0
-        self.stealth_heat: float = 0
-        self.last_enemy_power = ExtendedPower(knowledge.unit_values)
-
-        d2 = 15
-        for zone in knowledge.expansion_zones:
-            if zone.center_location.distance_to(self.center) < d2:
-                if ai.get_terrain_height(zone.center_location) == ai.get_terrain_height(self.center):
-                    # if zone == self.knowledge.own_main_zone:
-                    #     print("MAIN ZONE")
-                    self.zone = zone
-
-    def update(self, time_change: float):
-        if self.stealth_heat > 0:
-            self.stealth_heat = min(2, max(0, (self.stealth_heat - time_change) * (1 - time_change * 0.5)))
-
-        if self.heat > 0:
-            if self.is_visible():
-                self.heat = max(0, (self.heat - time_change * 0.02) * (1 - time_change * 0.5))
-            else:
-                self.heat = max(0, (self.heat - time_change * 0.01) * (1 - time_change * 0.25))
-
-        self.heat += self.last_enemy_power.power * time_change
-        self.last_enemy_power.clear()
+class HeatMap:
+    """
+    Heat of enemy presence and of cloaked enemies on a grid of slots of slot_size x slot_size cells.
 
-    def is_visible(self) -> bool:
-        # TODO: Check all corners?
-        return self.ai.state.visibility.data_numpy[self._y, self._x] == 2
+    Heat and stealth heat are numpy arrays indexed by [y, x] of the slot. Heat grows with the power of enemy units in
+    the slot and decays faster in slots that are visible, stealth heat grows while cloaked enemy units are close to our
+    ground units. Updates work on whole arrays, so smaller slots only cost more in the size of the arrays.
+    """
 
+    step_priority = StepPriority.Deferrable
+    update_interval = 0
 
-class HeatMap:
-    def __init__(self, ai: sc2.BotAI, knowledge: "Knowledge"):
+    def __init__(self, ai: sc2.BotAI, knowledge: "Knowledge", slot_size: int = SLOT_SIZE):
         self.ai = ai
         self.knowledge = knowledge
         self.cache: UnitCacheManager = self.knowledge.unit_cache
         self.unit_values: "UnitValue" = knowledge.unit_values
         self.updater = IntervalFunc(ai, self.__real_update, 0.5)
+        self.slot_size = slot_size
         grid: PixelMap = knowledge.ai._game_info.placement_grid
         height = grid.height
         width = grid.width
 
-        self.slots_w = int(math.ceil(width / SLOT_SIZE))
-        self.slots_h = int(math.ceil(height / SLOT_SIZE))
-        self.heat_areas: List[HeatArea] = []
-        for y in range(0, self.slots_h):
-            for x in range(0, self.slots_w):
-                x2 = min(x * SLOT_SIZE + SLOT_SIZE, width - 1)
-                y2 = min(y * SLOT_SIZE + SLOT_SIZE, height - 1)
-                self.heat_areas.append(HeatArea(ai, knowledge, x * SLOT_SIZE, y * SLOT_SIZE, x2, y2))
+        self.slots_w = int(math.ceil(width / slot_size))
+        self.slots_h = int(math.ceil(height / slot_size))
+        self.heat = np.zeros((self.slots_h, self.slots_w), dtype=float)
+        self.stealth_heat = np.zeros((self.slots_h, self.slots_w), dtype=float)
+
+        # Slots on the top and right edge end at the last cell of the map
+        left = np.arange(self.slots_w) * slot_size
+        bottom = np.arange(self.slots_h) * slot_size
+        center_x = (left + np.minimum(left + slot_size, width - 1)) / 2.0
+        center_y = (bottom + np.minimum(bottom + slot_size, height - 1)) / 2.0
+        # Slot centers as (slots_h, slots_w, 2) array
+        self.centers = np.stack(np.meshgrid(center_x, center_y), axis=2)
+
+        # Number of map cells in each slot, for visibility fractions
+        self._padded_shape = (self.slots_h * slot_size, self.slots_w * slot_size)
+        self._cell_counts = self._slot_sums(np.ones((height, width), dtype=float))
+        self._init_zones()
         self.last_update = 0
         self.last_quick_update = 0
 
+    def _init_zones(self):
+        """Finds the expansion zone of each slot, -1 for slots without one."""
+        self.zones: List["Zone"] = list(self.knowledge.expansion_zones)
+        self.zone_index = np.full((self.slots_h, self.slots_w), -1, dtype=np.int32)
+
+        d2 = 15
+        for index, zone in enumerate(self.zones):
+            location = zone.center_location
+            height = self.ai.get_terrain_height(location)
+            distances = np.sqrt(((self.centers - np.array(location)) ** 2).sum(axis=2))
+            for y, x in zip(*np.nonzero(distances < d2)):
+                if self.ai.get_terrain_height(Point2(self.centers[y, x].tolist())) == height:
+                    # The last zone close enough wins
+                    self.zone_index[y, x] = index
+
     def update(self):
         self.__stealth_update()
         self.updater.execute()
@@ -83,51 +79,69 @@ class HeatMap:
     def __stealth_update(self):
         time_change = self.ai.time - self.last_quick_update
 
-        for unit in self.knowledge.known_enemy_units:  # type: Unit
-            if unit.is_cloaked:
-                own_close = self.cache.own_in_range(unit.position, 12).not_flying
-                area = self.get_zone(unit.position)
-                if own_close:
-                    # Only add to stealth heat if we have a ground unit or building nearby
-                    # Stealthed units cannot attack air
-                    area.stealth_heat += 1 * time_change
-
-    def get_zone(self, position: Point2) -> HeatArea:
-        x_int = min(self.slots_w, max(0, math.floor(position.x / SLOT_SIZE)))
-        y_int = min(self.slots_h, max(0, math.floor(position.y / SLOT_SIZE)))
-        return self.heat_areas[x_int + y_int * self.slots_w]
+        cloaked_units: List[Unit] = [unit for unit in self.knowledge.known_enemy_units if unit.is_cloaked]
+        if not cloaked_units:
+            return
+
+        positions = [unit.position for unit in cloaked_units]
+        # Only add to stealth heat if we have a ground unit or building nearby
+        # Stealthed units cannot attack air
+        own_close_list = self.cache.own_index.in_range_batch(positions, 12, flying=False)
+        close_positions = [position for position, own_close in zip(positions, own_close_list) if own_close]
+        if close_positions:
+            y, x = self._slot_indices(close_positions)
+            np.add.at(self.stealth_heat, (y, x), time_change)
+
+    def _slot_indices(self, positions: List[Point2]) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns y and x indices of the slots of the positions."""
+        points = np.array(positions, dtype=float).reshape((-1, 2))
+        x = np.clip(np.floor(points[:, 0] / self.slot_size).astype(np.int64), 0, self.slots_w - 1)
+        y = np.clip(np.floor(points[:, 1] / self.slot_size).astype(np.int64), 0, self.slots_h - 1)
+        return y, x
+
+    def _slot_sums(self, cells: np.ndarray) -> np.ndarray:
+        """Sums a map sized array indexed by [y, x] over the cells of each slot."""
+        padded = np.zeros(self._padded_shape, dtype=float)
+        padded[: cells.shape[0], : cells.shape[1]] = cells
+        size = self.slot_size
+        return padded.reshape((self.slots_h, size, self.slots_w, size)).sum(axis=(1, 3))
+
+    def visible_fraction(self) -> np.ndarray:
+        """Fraction of the cells of each slot that are currently visible."""
+        visible = self._slot_sums(self.ai.state.visibility.data_numpy == 2)
+        return visible / np.maximum(self._cell_counts, 1)
 
     def __real_update(self):
         time_change = self.ai.time - self.last_update
         self.last_update = self.ai.time
 
-        for unit in self.knowledge.known_enemy_units_mobile:
-            area = self.get_zone(unit.position)
-            area.last_enemy_power.add_unit(unit)
+        stealth = self.stealth_heat
+        stealth[:] = np.minimum(2, np.maximum(0, (stealth - time_change) * (1 - time_change * 0.5)))
+
+        visible = self.visible_fraction()
+        visible_heat = (self.heat - time_change * 0.02) * (1 - time_change * 0.5)
+        hidden_heat = (self.heat - time_change * 0.01) * (1 - time_change * 0.25)
+        self.heat[:] = np.maximum(0, visible * visible_heat + (1 - visible) * hidden_heat)
 
-        for zone in self.heat_areas:
-            zone.update(time_change)
+        enemies = self.knowledge.known_enemy_units_mobile
+        if enemies:
+            y, x = self._slot_indices([unit.position for unit in enemies])
+            powers = np.fromiter((self.unit_values.power(unit) for unit in enemies), dtype=float, count=len(enemies))
+            np.add.at(self.heat, (y, x), powers * time_change)
 
     def get_stealth_hotspot(self) -> Optional[Tuple[Point2, float]]:
-        top_heat_position: Point2 = None
-        top_value = 0
-        for heat_area in self.heat_areas:
-            if heat_area.stealth_heat > top_value:
-                top_heat_position = heat_area.center
-                top_value = heat_area.stealth_heat
-
-        if top_heat_position is None:
+        y, x = np.unravel_index(np.argmax(self.stealth_heat), self.stealth_heat.shape)
+        top_value = float(self.stealth_heat[y, x])
+        if top_value <= 0:
             return None
 
-        return top_heat_position, top_value
+        return Point2(self.centers[y, x].tolist()), top_value
 
     def get_zones_hotspot(self, zones: List["Zone"]) -> Optional[Point2]:
-        top_heat_area = None
-        top_value = 0
-        for heat_area in self.heat_areas:
-            value = heat_area.heat
-            if heat_area.zone in zones and value > 0 and (top_heat_area is None or value > top_value):
-                top_value = value
-                top_heat_area = heat_area
-
-        return top_heat_area
+        zone_indices = [index for index, zone in enumerate(self.zones) if zone in zones]
+        mask = np.isin(self.zone_index, zone_indices) & (self.heat > 0)
+        if not mask.any():
+            return None
+
+        y, x = np.unravel_index(np.argmax(np.where(mask, self.heat, -np.inf)), self.heat.shape)
+        return Point2(self.centers[y, x].tolist())
@@ -0,0 +1,180 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from sc2.position import Point2
+
+from .heat_map import HeatMap
+
+
+def create_heat_map(width=20, height=20, zones=(), slot_size=5) -> HeatMap:
+    ai = mock.Mock()
+    ai.time = 0
+    ai.get_terrain_height = lambda position: 10
+    ai.state.visibility.data_numpy = np.zeros((height, width), dtype=np.int32)
+
+    knowledge = mock.Mock()
+    knowledge.ai = ai
+    knowledge.ai._game_info.placement_grid = SimpleNamespace(width=width, height=height)
+    knowledge.expansion_zones = list(zones)
+    knowledge.known_enemy_units = []
+    knowledge.known_enemy_units_mobile = []
+    knowledge.unit_values.power = lambda unit: unit.power
+    return HeatMap(ai, knowledge, slot_size)
+
+
+def create_enemy(position, power=1, is_cloaked=False):
+    return SimpleNamespace(position=Point2(position), power=power, is_cloaked=is_cloaked)
+
+
+def real_update(heat_map: HeatMap, time: float):
+    heat_map.ai.time = time
+    heat_map._HeatMap__real_update()
+
+
+class TestHeatMapDecay:
+    def test_decay_without_visibility(self):
+        heat_map = create_heat_map()
+        heat_map.heat[0, 0] = 1
+
+        real_update(heat_map, 1)
+
+        assert heat_map.heat[0, 0] == pytest.approx((1 - 0.01) * (1 - 0.25))
+
+    def test_decay_with_full_visibility(self):
+        heat_map = create_heat_map()
+        heat_map.ai.state.visibility.data_numpy[:] = 2
+        heat_map.heat[0, 0] = 1
+
+        real_update(heat_map, 1)
+
+        assert heat_map.heat[0, 0] == pytest.approx((1 - 0.02) * (1 - 0.5))
+
+    def test_decay_with_partial_visibility(self):
+        heat_map = create_heat_map()
+        # Two columns of the five in the slot are visible, explored cells count as not visible
+        heat_map.ai.state.visibility.data_numpy[0:5, 0:2] = 2
+        heat_map.ai.state.visibility.data_numpy[0:5, 2:5] = 1
+        heat_map.heat[0, 0] = 1
+
+        real_update(heat_map, 1)
+
+        visible = 0.4 * (1 - 0.02) * (1 - 0.5)
+        hidden = 0.6 * (1 - 0.01) * (1 - 0.25)
+        assert heat_map.heat[0, 0] == pytest.approx(visible + hidden)
+
+    def test_heat_does_not_go_below_zero(self):
+        heat_map = create_heat_map()
+        heat_map.heat[0, 0] = 0.001
+
+        real_update(heat_map, 1)
+
+        assert heat_map.heat[0, 0] == 0
+
+    def test_enemy_power_is_added_to_its_slot(self):
+        heat_map = create_heat_map()
+        heat_map.knowledge.known_enemy_units_mobile = [
+            create_enemy((12, 7), power=2),
+            create_enemy((13, 8), power=1),
+        ]
+
+        real_update(heat_map, 0.5)
+
+        assert heat_map.heat[1, 2] == pytest.approx(3 * 0.5)
+        assert heat_map.heat.sum() == pytest.approx(3 * 0.5)
+
+    def test_positions_outside_the_map_are_clamped_to_edge_slots(self):
+        heat_map = create_heat_map()
+        heat_map.knowledge.known_enemy_units_mobile = [
+            create_enemy((25, 3)),
+            create_enemy((-1, 30)),
+        ]
+
+        real_update(heat_map, 1)
+
+        assert heat_map.heat[0, 3] == pytest.approx(1)
+        assert heat_map.heat[3, 0] == pytest.approx(1)
+
+
+class TestHeatMapHotspots:
+    def test_stealth_hotspot(self):
+        heat_map = create_heat_map()
+        heat_map.knowledge.known_enemy_units = [
+            create_enemy((12, 7), is_cloaked=True),
+            create_enemy((2, 2), is_cloaked=True),
+            create_enemy((17, 17)),
+        ]
+        # Only the first cloaked unit is close to our ground units
+        heat_map.cache.own_index.in_range_batch.return_value = [True, False]
+        assert heat_map.get_stealth_hotspot() is None
+
+        # Stealth heat is added on every update, before the decay is due again
+        heat_map.update()
+        heat_map.ai.time = 0.25
+        heat_map.update()
+
+        assert heat_map.get_stealth_hotspot() == (Point2((12.5, 7.5)), pytest.approx(0.25))
+        assert heat_map.stealth_heat.sum() == pytest.approx(0.25)
+
+    def test_stealth_heat_decays(self):
+        heat_map = create_heat_map()
+        heat_map.stealth_heat[1, 2] = 1
+        heat_map.stealth_heat[0, 0] = 5
+
+        real_update(heat_map, 0.5)
+
+        assert heat_map.stealth_heat[1, 2] == pytest.approx((1 - 0.5) * (1 - 0.25))
+        # Stealth heat is capped at 2
+        assert heat_map.stealth_heat[0, 0] == 2
+
+    def test_zones_hotspot(self):
+        own_zone = SimpleNamespace(center_location=Point2((10, 10)))
+        enemy_zone = SimpleNamespace(center_location=Point2((50, 50)))
+        heat_map = create_heat_map(60, 60, [own_zone, enemy_zone])
+        heat_map.heat[2, 2] = 1
+        heat_map.heat[1, 2] = 2
+        heat_map.heat[10, 10] = 5
+
+        hotspot = heat_map.get_zones_hotspot([own_zone])
+
+        assert isinstance(hotspot, Point2)
+        assert hotspot == Point2((12.5, 7.5))
+        assert heat_map.get_zones_hotspot([enemy_zone]) == Point2((52.5, 52.5))
+        assert heat_map.get_zones_hotspot([]) is None
+
+    def test_zones_hotspot_without_heat(self):
+        zone = SimpleNamespace(center_location=Point2((10, 10)))
+        heat_map = create_heat_map(zones=[zone])
+
+        assert heat_map.get_zones_hotspot([zone]) is None
+
+
+class TestHeatMapSlotSize:
+    def test_non_default_slot_size(self):
+        heat_map = create_heat_map(width=20, height=18, slot_size=4)
+
+        assert heat_map.heat.shape == (5, 5)
+        # Slots on the top and right edge end at the last cell of the map
+        assert heat_map.centers[0, 0].tolist() == [2, 2]
+        assert heat_map.centers[4, 4].tolist() == [17.5, 16.5]
+        assert heat_map._cell_counts[4, 4] == 8
+        assert heat_map._cell_counts[0, 0] == 16
+
+    def test_non_default_slot_size_update(self):
+        heat_map = create_heat_map(width=20, height=18, slot_size=4)
+        # Half of the cells of the top right slot are visible
+        heat_map.ai.state.visibility.data_numpy[16:18, 16:18] = 2
+        heat_map.heat[4, 4] = 1
+        heat_map.knowledge.known_enemy_units_mobile = [create_enemy((19.5, 17.5))]
+
+        real_update(heat_map, 1)
+
+        visible = 0.5 * (1 - 0.02) * (1 - 0.5)
+        hidden = 0.5 * (1 - 0.01) * (1 - 0.25)
+        assert heat_map.heat[4, 4] == pytest.approx(visible + hidden + 1)
+
+        y, x = heat_map._slot_indices([Point2((19.9, 17.9)), Point2((3.9, 4))])
+        assert y.tolist() == [4, 1]
+        assert x.tolist() == [4, 0]
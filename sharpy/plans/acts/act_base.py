@@ -5,16 +5,19 @@ from typing import List, Optional
 import sc2
 from sc2.ids.buff_id import BuffId
 from sharpy.general.component import Component
+from sharpy.general.signal_tracker import Signal
+from sharpy.general.step_scheduler import StepPriority
 from sharpy.managers import UnitValue
 from sharpy.managers import UnitCacheManager, PathingManager, GroupCombatManager, UnitRoleManager
 
 from sc2 import AbilityId, Race, UnitTypeId
 from sc2.client import Client
 from sc2.position import Point2
-from sc2.unit import Unit, UnitOrder
+from sc2.unit import Unit
 from sc2.unit_command import UnitCommand
 from sc2.units import Units
 from sc2.constants import EQUIVALENTS_FOR_TECH_PROGRESS
+from sc2.order_index import creation_ability_id
 from sharpy.managers.roles import UnitTask
 
 build_commands = {
@@ -66,6 +69,10 @@ build_commands = {
 
 
 class ActBase(Component, ABC):
+    # Scheduling of execute when run by a parent act, see StepScheduler
+    step_priority: StepPriority = StepPriority.Critical
+    update_interval: float = 0
+
     async def debug_draw(self):
         if self.debug:
             await self.debug_actions()
@@ -91,6 +98,48 @@ class ActBase(Component, ABC):
         Return False if you want to block execution and not continue to the next act."""
         pass
 
+    def signals(self) -> Optional[List[Signal]]:
+        """
+        Signals that the result of execute depends on, see SignalTracker.
+        Only acts without side effects can declare signals, None means that the act must be executed every time.
+        """
+        return None
+
+    async def execute_act(self, act: "ActBase") -> bool:
+        """
+        Executes a child act, measuring its time when step profiling is enabled.
+        Acts that are not critical can be skipped by the step scheduler, the result of their last execution is used then.
+        Acts whose signals have not changed since their last execution are skipped when requirement tracking is enabled.
+        """
+        tracker = self.knowledge.signal_tracker
+        if tracker.enabled:
+            result = tracker.last_result(act)
+            if result is None:
+                result = await self._execute_scheduled(act)
+                tracker.set_result(act, result)
+            return result
+        return await self._execute_scheduled(act)
+
+    async def _execute_scheduled(self, act: "ActBase") -> bool:
+        if act.step_priority != StepPriority.Critical or act.update_interval > 0:
+            scheduler = self.knowledge.scheduler
+            if not scheduler.should_run(act):
+                return scheduler.last_result(act)
+            result = await self._execute_profiled(act)
+            scheduler.set_result(act, result)
+            return result
+        return await self._execute_profiled(act)
+
+    async def _execute_profiled(self, act: "ActBase") -> bool:
+        profiler = self.knowledge.profiler
+        if not profiler.enabled:
+            return await act.execute()
+        profiler.begin(type(act).__name__)
+        try:
+            return await act.execute()
+        finally:
+            profiler.end()
+
     def pending_build(self, unit_type: UnitTypeId) -> float:
         """ Only counts buildings that are commanded to be built, not ready builds are not included"""
         return self.get_count(unit_type) - self.get_count(unit_type, include_pending=False)
@@ -99,14 +148,10 @@ class ActBase(Component, ABC):
         """Returns positions of buildings of the specified type that have either been ordered to be built by a worker
         or are currently being built."""
         positions: List[Point2] = list()
-        creation_ability: AbilityId = self.ai._game_data.units[unit_type.value].creation_ability
+        ability_id = creation_ability_id(self.ai._game_data, unit_type.value)
 
         # Workers ordered to build
-        for worker in self.ai.workers:  # type: Unit
-            for order in worker.orders:  # type: UnitOrder
-                if order.ability.id == creation_ability.id:
-                    p2: Point2 = Point2.from_proto(order.target)
-                    positions.append(p2)
+        positions.extend(self.ai.order_index.worker_target_positions(ability_id))
 
         # Already building structures
         # Avoid counting structures twice for Terran SCVs.
@@ -119,7 +164,7 @@ class ActBase(Component, ABC):
         return positions
 
     def unit_pending_count(self, unit_type: UnitTypeId) -> float:
-        return self.ai.already_pending(unit_type)
+        return self.cache.counts.pending(unit_type)
 
     def building_progress(self, pre_type: UnitTypeId):
         percentage = 0
@@ -129,10 +174,11 @@ class ActBase(Component, ABC):
         else:
             types = pre_type
 
-        for unit in self.cache.own(types):
-            if unit.is_ready:
+        counts = self.cache.counts
+        for unit_type in [types] if isinstance(types, UnitTypeId) else types:
+            if counts.ready(unit_type):
                 return 0
-            percentage = max(percentage, unit.build_progress)
+            percentage = max(percentage, counts.progress(unit_type))
 
         if percentage == 0:
             return 1000
@@ -153,36 +199,11 @@ class ActBase(Component, ABC):
         self, unit_type: UnitTypeId, include_pending=True, include_killed=False, include_not_ready: bool = True
     ) -> int:
         """Calculates how many buildings there are already, including pending structures."""
-        count = 0
-
-        type_count = self.cache.own(unit_type)
-
-        if include_not_ready and include_pending:
-            count += self.unit_pending_count(unit_type)
-            count += type_count.ready.amount
-        elif include_not_ready and not include_pending:
-            count += type_count.amount
-        elif not include_not_ready and include_pending:
-            count += self.unit_pending_count(unit_type)
-            count += type_count.amount - type_count.not_ready.amount
-        else:
-            # Only and only ready
-            count += type_count.ready.amount
-
-        count = self.related_count(count, unit_type)
-
-        if include_killed:
-            count += self.knowledge.lost_units_manager.own_lost_type(unit_type, real_type=False)
-            related = EQUIVALENTS_FOR_TECH_PROGRESS.get(unit_type, None)
-            if related:
-                for related_type in related:
-                    count += self.knowledge.lost_units_manager.own_lost_type(related_type, real_type=False)
-
-        return count
+        return self.cache.counts.count(unit_type, include_pending, include_killed, include_not_ready)
 
     def related_count(self, count, unit_type):
         if unit_type in EQUIVALENTS_FOR_TECH_PROGRESS:
-            count += self.cache.own(EQUIVALENTS_FOR_TECH_PROGRESS[unit_type]).amount
+            count += self.cache.counts.amount(EQUIVALENTS_FOR_TECH_PROGRESS[unit_type])
         return count
 
     def get_worker_builder(self, position: Point2, priority_tag: int) -> Optional[Unit]:
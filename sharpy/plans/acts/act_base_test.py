@@ -0,0 +1,47 @@
+import pytest
+from unittest import mock
+
+from sc2 import UnitTypeId
+from sharpy.general.step_scheduler import StepPriority, StepScheduler
+from sharpy.plans import Step
+
+from .act_unit import ActUnit
+
+
+def mock_knowledge() -> mock.Mock:
+    knowledge_mock = mock.Mock()
+    knowledge_mock.get_boolean_setting = lambda x: False
+    knowledge_mock.profiler.enabled = False
+    knowledge_mock.signal_tracker.enabled = False
+    return knowledge_mock
+
+
+def scheduler_over_budget() -> StepScheduler:
+    ai = mock.Mock()
+    ai.time = 10
+    ai.time_budget_available = 0
+    ai._last_step_step_time = 1
+    scheduler = StepScheduler(ai)
+    scheduler.begin_step()
+    return scheduler
+
+
+class TestActBaseScheduling:
+    def test_build_priority_is_not_step_priority(self):
+        act = ActUnit(UnitTypeId.MARINE, UnitTypeId.BARRACKS, 10, priority=True)
+
+        assert act.priority
+        assert act.step_priority == StepPriority.Critical
+        assert scheduler_over_budget().should_run(act)
+
+    @pytest.mark.asyncio
+    async def test_critical_act_is_executed_without_scheduler(self):
+        knowledge = mock_knowledge()
+        parent = Step(None, None)
+        await parent.start(knowledge)
+        act = ActUnit(UnitTypeId.MARINE, UnitTypeId.BARRACKS, 10, priority=True)
+        act.execute = mock.AsyncMock(return_value=False)
+
+        assert not await parent.execute_act(act)
+        act.execute.assert_awaited_once()
+        knowledge.scheduler.should_run.assert_not_called()
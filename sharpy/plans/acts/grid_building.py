@@ -56,7 +56,7 @@ class GridBuilding(ActBuilding):
             return True  # Step is done
 
         if (
-            count + (self.pending_build(self.unit_type) - self.cache.own(self.unit_type).not_ready.amount)
+            count + (self.pending_build(self.unit_type) - self.cache.counts.not_ready(self.unit_type))
             >= self.to_count
         ):
             if self.builder_tag is not None:
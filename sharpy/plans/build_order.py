@@ -1,9 +1,10 @@
-from typing import List, Union, Callable, Tuple
+from typing import List, Optional, Union, Callable, Tuple
 
 import sc2
 from sc2 import UnitTypeId
 from sc2.ids.upgrade_id import UpgradeId
 
+from sharpy.general.signal_tracker import Signal, merge_signals
 from sharpy.plans.acts import Tech, ActUnit, ActBase, merge_to_act
 from sharpy.plans.acts.grid_building import GridBuilding
 from sharpy.plans.build_step import Step
@@ -280,6 +281,12 @@ class BuildOrder(ActBase):
             ),
         ]
 
+    def signals(self) -> Optional[List[Signal]]:
+        if type(self).execute is not BuildOrder.execute:
+            # Subclasses can do more than execute the orders
+            return None
+        return merge_signals(self.orders)
+
     async def start(self, knowledge: "Knowledge"):
         await super().start(knowledge)
         for order in self.orders:
@@ -288,7 +295,7 @@ class BuildOrder(ActBase):
     async def execute(self) -> bool:
         result = True
         for order in self.orders:
-            if not await order.execute():
+            if not await self.execute_act(order):
                 result = False
 
         return result
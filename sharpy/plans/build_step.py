@@ -1,6 +1,7 @@
-from typing import Optional, Callable, Union
+from typing import List, Optional, Callable, Union
 
 # Singular step of action
+from sharpy.general.signal_tracker import Signal, merge_signals
 from sharpy.plans.acts import merge_to_act
 from sharpy.plans.require import merge_to_require
 from sharpy.plans.require.require_base import RequireBase
@@ -41,6 +42,7 @@ class Step(ActBase):
             await self.skip_until.debug_draw()
 
     async def start(self, knowledge: "Knowledge"):
+        await super().start(knowledge)
         if self.requirement is not None:
             await self.start_component(self.requirement, knowledge)
         if self.action is not None:
@@ -50,15 +52,19 @@ class Step(ActBase):
         if self.skip_until is not None:
             await self.start_component(self.skip_until, knowledge)
 
+    def signals(self) -> Optional[List[Signal]]:
+        return merge_signals([self.requirement, self.action, self.skip, self.skip_until])
+
     async def execute(self) -> bool:
-        if self.skip is not None and self.skip.check():
+        tracker = self.knowledge.signal_tracker
+        if self.skip is not None and tracker.check(self.skip):
             return True
-        if self.skip_until is not None and not self.skip_until.check():
+        if self.skip_until is not None and not tracker.check(self.skip_until):
             return True
-        if self.requirement is not None and not self.requirement.check():
+        if self.requirement is not None and not tracker.check(self.requirement):
             return False
 
         if self.action is None:
             return True
 
-        return await self.action.execute()
+        return await self.execute_act(self.action)
@@ -0,0 +1,47 @@
+import pytest
+from unittest import mock
+
+from sharpy.general.signal_tracker import SignalTracker
+from sharpy.plans.acts import ActBase
+
+from .build_step import Step
+
+
+class CountingAct(ActBase):
+    def __init__(self):
+        super().__init__()
+        self.executed = 0
+
+    async def execute(self) -> bool:
+        self.executed += 1
+        return True
+
+
+def mock_knowledge() -> mock.Mock:
+    knowledge_mock = mock.Mock()
+    knowledge_mock.get_boolean_setting = lambda x: False
+    knowledge_mock.profiler.enabled = False
+    knowledge_mock.signal_tracker = SignalTracker(knowledge_mock)
+    return knowledge_mock
+
+
+class TestStep:
+    @pytest.mark.asyncio
+    async def test_start_and_execute_action(self):
+        knowledge = mock_knowledge()
+        act = CountingAct()
+        step = Step(None, act)
+        await step.start(knowledge)
+
+        assert step.knowledge is knowledge
+        assert await step.execute()
+        assert act.executed == 1
+
+    @pytest.mark.asyncio
+    async def test_action_is_not_executed_without_requirement(self):
+        act = CountingAct()
+        step = Step(lambda knowledge: False, act)
+        await step.start(mock_knowledge())
+
+        assert not await step.execute()
+        assert act.executed == 0
@@ -1,5 +1,6 @@
 import warnings
-from typing import List, Callable, Union
+from typing import List, Callable, Optional, Union
+from sharpy.general.signal_tracker import Signal, merge_signals
 from sharpy.plans.require.methods import merge_to_require
 from sharpy.plans.require import RequireBase
 from typing import TYPE_CHECKING
@@ -47,6 +48,9 @@ class All(RequireBase):
 
         return True
 
+    def signals(self) -> Optional[List[Signal]]:
+        return merge_signals(self.conditions)
+
 
 class RequiredAll(All):
     def __init__(
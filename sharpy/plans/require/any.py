@@ -1,6 +1,7 @@
 import warnings
-from typing import List, Callable, Union
+from typing import List, Callable, Optional, Union
 
+from sharpy.general.signal_tracker import Signal, merge_signals
 from sharpy.plans.require.methods import merge_to_require
 from sharpy.plans.require import RequireBase
 from typing import TYPE_CHECKING
@@ -48,6 +49,9 @@ class Any(RequireBase):
 
         return False
 
+    def signals(self) -> Optional[List[Signal]]:
+        return merge_signals(self.conditions)
+
 
 class RequiredAny(Any):
     def __init__(
@@ -1,7 +1,10 @@
 import warnings
+from typing import List, Optional
+
 
 from sc2 import UnitTypeId
 
+from sharpy.general.signal_tracker import Signal, SignalKind
 from sharpy.plans.require.require_base import RequireBase
 
 
@@ -28,6 +31,9 @@ class EnemyUnitExists(RequireBase):
 
         return False
 
+    def signals(self) -> Optional[List[Signal]]:
+        return [(SignalKind.EnemyUnits, self.unit_type)]
+
 
 class RequiredEnemyUnitExists(EnemyUnitExists):
     def __init__(self, unit_type: UnitTypeId, count: int = 1):
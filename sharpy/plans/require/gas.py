@@ -1,7 +1,10 @@
 import warnings
+from typing import List, Optional
+
 
 import sc2
 
+from sharpy.general.signal_tracker import Signal, SignalKind
 from sharpy.plans.require.require_base import RequireBase
 
 
@@ -19,6 +22,9 @@ class Gas(RequireBase):
             return True
         return False
 
+    def signals(self) -> Optional[List[Signal]]:
+        return [(SignalKind.Gas, None)]
+
 
 class RequiredGas(Gas):
     def __init__(self, vespene_requirement: int):
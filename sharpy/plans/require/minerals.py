@@ -1,4 +1,7 @@
 import warnings
+from typing import List, Optional
+
+from sharpy.general.signal_tracker import Signal, SignalKind
 from sharpy.plans.require.require_base import RequireBase
 
 
@@ -16,6 +19,9 @@ class Minerals(RequireBase):
             return True
         return False
 
+    def signals(self) -> Optional[List[Signal]]:
+        return [(SignalKind.Minerals, None)]
+
 
 class RequiredMinerals(Minerals):
     def __init__(self, mineral_requirement: int):
@@ -1,5 +1,8 @@
 import enum
 import warnings
+from typing import List, Optional
+
+from sharpy.general.signal_tracker import Signal, SignalKind
 
 from sharpy.plans.require.require_base import RequireBase
 
@@ -25,6 +28,9 @@ class Supply(RequireBase):
 
         return self.ai.supply_workers >= self.supply_amount
 
+    def signals(self) -> Optional[List[Signal]]:
+        return [(SignalKind.Supply, None)]
+
 
 class RequiredSupply(Supply):
     def __init__(self, supply_amount: int, supply_type: SupplyType = SupplyType.All):
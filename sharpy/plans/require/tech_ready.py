@@ -1,4 +1,7 @@
 import warnings
+from typing import List, Optional
+
+from sharpy.general.signal_tracker import Signal, SignalKind
 
 from sc2.ids.upgrade_id import UpgradeId
 
@@ -23,6 +26,9 @@ class TechReady(RequireBase):
             return True
         return False
 
+    def signals(self) -> Optional[List[Signal]]:
+        return [(SignalKind.Upgrade, self.name)]
+
 
 class RequiredTechReady(TechReady):
     def __init__(self, upgrade: UpgradeId, percentage: float = 1):
@@ -1,4 +1,7 @@
 import warnings
+from typing import List, Optional
+
+from sharpy.general.signal_tracker import Signal, SignalKind
 
 from sharpy.plans.require.require_base import RequireBase
 
@@ -15,6 +18,9 @@ class Time(RequireBase):
             return True
         return False
 
+    def signals(self) -> Optional[List[Signal]]:
+        return [(SignalKind.TimePassed, self.time_in_seconds)]
+
 
 class RequiredTime(Time):
     def __init__(self, time_in_seconds: float):
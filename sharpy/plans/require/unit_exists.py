@@ -1,7 +1,9 @@
 import warnings
+from typing import List, Optional
 
 import sc2
 from sc2 import UnitTypeId
+from sharpy.general.signal_tracker import Signal, SignalKind, unit_type_signals
 
 from sharpy.plans.require.require_base import RequireBase
 
@@ -33,6 +35,14 @@ class UnitExists(RequireBase):
         count = self.get_count(self.unit_type, self.include_pending, self.include_killed, self.include_not_ready)
         return count >= self.count
 
+    def signals(self) -> Optional[List[Signal]]:
+        signals = unit_type_signals(SignalKind.Units, self.unit_type)
+        if self.include_pending:
+            signals.append((SignalKind.Pending, self.unit_type))
+        if self.include_killed:
+            signals.extend(unit_type_signals(SignalKind.Killed, self.unit_type))
+        return signals
+
 
 class RequiredUnitExists(UnitExists):
     def __init__(
@@ -1,5 +1,8 @@
 import warnings
+from typing import List, Optional
+
 from sc2 import UnitTypeId
+from sharpy.general.signal_tracker import Signal, SignalKind, unit_type_signals
 from sharpy.plans.require.require_base import RequireBase
 
 
@@ -15,14 +18,12 @@ class UnitReady(RequireBase):
 
     def check(self) -> bool:
         count = self.get_count(self.unit_type, False, include_not_ready=False)
-        build_progress = 0
-
-        for unit in self.cache.own(self.unit_type).not_ready:
-            build_progress = max(build_progress, unit.build_progress)
-
-        count += build_progress
+        count += self.cache.counts.progress(self.unit_type)
         return count >= self.count
 
+    def signals(self) -> Optional[List[Signal]]:
+        return unit_type_signals(SignalKind.Units, self.unit_type)
+
 
 class RequiredUnitReady(UnitReady):
     def __init__(self, unit_type: UnitTypeId, count: float = 1):
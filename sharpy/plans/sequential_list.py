@@ -1,5 +1,6 @@
-from typing import List, Union, Callable
+from typing import List, Optional, Union, Callable
 
+from sharpy.general.signal_tracker import Signal, merge_signals
 from sharpy.plans.build_step import Step
 from sharpy.plans.acts import ActBase
 
@@ -22,9 +23,15 @@ class SequentialList(SubActs):
 
         super().__init__(orders, *argv)
 
+    def signals(self) -> Optional[List[Signal]]:
+        if type(self).execute is not SequentialList.execute:
+            # Subclasses can do more than execute the orders
+            return None
+        return merge_signals(self.orders)
+
     async def execute(self) -> bool:
         for order in self.orders:
-            result = await order.execute()
+            result = await self.execute_act(order)
             if not result:
                 return result
 
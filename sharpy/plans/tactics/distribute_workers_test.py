@@ -7,9 +7,11 @@ import numpy
 import pytest
 from unittest import mock
 
+from s2clientprotocol import data_pb2
 from sc2 import UnitTypeId, Race, BotAI, AbilityId
 from sc2.constants import ALL_GAS, mineral_ids, IS_STRUCTURE, IS_MINE
 from sc2.distances import DistanceCalculation
+from sc2.game_data import UnitTypeTable
 from sc2.ids.upgrade_id import UpgradeId
 from sc2.pixel_map import PixelMap
 from sc2.position import Point2
@@ -75,6 +77,13 @@ def mock_ai() -> BotAI:
         ai._game_data.units[typedata.value] = mock.Mock()
         ai._game_data.units[typedata.value].attributes = {IS_STRUCTURE}
 
+    ai._game_data.unit_table = UnitTypeTable(
+        data_pb2.UnitTypeData(
+            unit_id=unit_id, attributes=[IS_STRUCTURE] if UnitTypeId(unit_id) in BUILDING_IDS else []
+        )
+        for unit_id in ai._game_data.units
+    )
+
     ai._game_data.units[UnitTypeId.ASSIMILATOR.value].has_vespene = True
     ai._game_data.units[UnitTypeId.ASSIMILATORRICH.value].has_vespene = True
 
@@ -102,6 +111,10 @@ async def mock_knowledge(ai) -> Knowledge:
         [p1, p2],
         math.hypot(p1[0] - p2[0], p1[1] - p2[1]),
     )
+    knowledge.pathing_manager.get_path = lambda layer, p1, p2: (
+        [p1, p2],
+        math.hypot(p1[0] - p2[0], p1[1] - p2[1]),
+    )
 
     knowledge._all_own = ai.all_own_units
 
@@ -0,0 +1,106 @@
+import os
+from collections import deque
+from time import perf_counter_ns
+from typing import Deque, Dict, List, Tuple
+
+import numpy as np
+
+PROFILE_FOLDER = "data"
+
+
+class StepProfiler:
+    """
+    Measures wall time of managers, acts and micro steps within a bot step.
+
+    Timed sections are nested, a section started while another one is running is recorded as its child.
+    Paths are separated with ";" so totals can be written in the collapsed stack format used by flamegraph tools.
+    Enable with profile = yes in the general section of config.ini.
+    """
+
+    def __init__(self, window: int = 500):
+        """
+        :param window: Amount of latest steps that are used for the percentiles
+        """
+        self.enabled = False
+        self.window = window
+        self.steps = 0
+        # Milliseconds spent in each path per step, for the latest steps in which the path was run
+        self.samples: Dict[str, Deque[float]] = {}
+        # Nanoseconds spent in each path during the whole game
+        self.totals: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        self._stack: List[Tuple[str, int]] = []
+        self._step_totals: Dict[str, int] = {}
+
+    def begin(self, name: str):
+        if self._stack:
+            path = self._stack[-1][0] + ";" + name
+        else:
+            path = name
+        self._stack.append((path, perf_counter_ns()))
+
+    def end(self):
+        path, start = self._stack.pop()
+        self._step_totals[path] = self._step_totals.get(path, 0) + perf_counter_ns() - start
+        self.calls[path] = self.calls.get(path, 0) + 1
+
+    def end_step(self):
+        """Moves the times of the current step to the rolling samples."""
+        for path, elapsed in self._step_totals.items():
+            samples = self.samples.get(path, None)
+            if samples is None:
+                samples = deque(maxlen=self.window)
+                self.samples[path] = samples
+            samples.append(elapsed / 1000000)
+            self.totals[path] = self.totals.get(path, 0) + elapsed
+        self._step_totals.clear()
+        self._stack.clear()
+        self.steps += 1
+
+    def percentile(self, path: str, percent: float) -> float:
+        """Returns the percentile of step time in milliseconds for the path over the latest steps."""
+        samples = self.samples.get(path, None)
+        if not samples:
+            return 0
+        return float(np.percentile(samples, percent))
+
+    def report(self) -> List[str]:
+        """Returns report lines of all timed paths, the most expensive first."""
+        lines = [
+            f"{'path':<80} {'total ms':>10} {'calls':>8} {'avg ms':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        ]
+        for path, total in sorted(self.totals.items(), key=lambda item: item[1], reverse=True):
+            samples = np.array(self.samples[path])
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            total_ms = total / 1000000
+            lines.append(
+                f"{path:<80} {total_ms:>10.1f} {self.calls.get(path, 0):>8} {total_ms / max(1, self.steps):>8.3f} "
+                f"{p50:>8.3f} {p95:>8.3f} {p99:>8.3f} {samples.max():>8.3f}"
+            )
+        return lines
+
+    def collapsed_stacks(self) -> List[str]:
+        """Returns self time of each path in microseconds in the collapsed stack format."""
+        self_times = dict(self.totals)
+        for path, total in self.totals.items():
+            separator = path.rfind(";")
+            if separator >= 0:
+                parent = path[:separator]
+                if parent in self_times:
+                    self_times[parent] -= total
+        return [f"{path} {max(0, self_time) // 1000}" for path, self_time in self_times.items()]
+
+    def write(self, file_name: str):
+        """Writes the report to file_name.txt and the flamegraph input to file_name.folded in the profile folder."""
+        if not os.path.exists(PROFILE_FOLDER):
+            os.makedirs(PROFILE_FOLDER)
+
+        base_name = os.path.join(PROFILE_FOLDER, file_name)
+        with open(base_name + ".txt", "w") as handle:
+            handle.write(f"steps: {self.steps}\n")
+            handle.write("\n".join(self.report()))
+            handle.write("\n")
+
+        with open(base_name + ".folded", "w") as handle:
+            handle.write("\n".join(self.collapsed_stacks()))
+            handle.write("\n")